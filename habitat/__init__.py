@@ -10,7 +10,7 @@ from habitat.core.benchmark import Benchmark
 from habitat.core.challenge import Challenge
 from habitat.core.dataset import Dataset
 from habitat.core.embodied_task import EmbodiedTask, Measure, Measurements
-from habitat.core.env import Env, RLEnv
+from habitat.core.env import ActionRepeatRLEnv, Env, RLEnv
 from habitat.core.logging import logger
 from habitat.core.registry import registry  # noqa: F401
 from habitat.core.simulator import Sensor, SensorSuite, SensorTypes, Simulator
@@ -19,6 +19,7 @@ from habitat.datasets import make_dataset
 from habitat.version import VERSION as __version__  # noqa: F401
 
 __all__ = [
+    "ActionRepeatRLEnv",
     "Agent",
     "Benchmark",
     "Challenge",
@@ -39,6 +39,10 @@ _C.ENVIRONMENT.ITERATOR_OPTIONS.NUM_EPISODE_SAMPLE = -1
 _C.ENVIRONMENT.ITERATOR_OPTIONS.MAX_SCENE_REPEAT_EPISODES = -1
 _C.ENVIRONMENT.ITERATOR_OPTIONS.MAX_SCENE_REPEAT_STEPS = int(1e4)
 _C.ENVIRONMENT.ITERATOR_OPTIONS.STEP_REPETITION_RANGE = 0.2
+# Read the files of the scene of the next episode in a background thread
+# while the current episode runs, so that they are in the OS page cache when
+# the scene is loaded
+_C.ENVIRONMENT.PREFETCH_NEXT_SCENE = False
 # -----------------------------------------------------------------------------
 # TASK
 # -----------------------------------------------------------------------------
@@ -50,6 +54,10 @@ _C.TASK.TYPE = "Nav-v0"
 _C.TASK.SUCCESS_DISTANCE = 0.2
 _C.TASK.SENSORS = []
 _C.TASK.MEASUREMENTS = []
+# Names of entries of MEASUREMENTS that are only updated on demand, i.e. at
+# the end of the episode or when another measure or the reward reads them.
+# Only for measures whose value only depends on the current step
+_C.TASK.LAZY_MEASUREMENTS = []
 _C.TASK.GOAL_SENSOR_UUID = "pointgoal"
 _C.TASK.POSSIBLE_ACTIONS = ["STOP", "MOVE_FORWARD", "TURN_LEFT", "TURN_RIGHT"]
 # -----------------------------------------------------------------------------
@@ -168,6 +176,21 @@ _C.TASK.TOP_DOWN_MAP.DRAW_VIEW_POINTS = True
 _C.TASK.TOP_DOWN_MAP.DRAW_GOAL_POSITIONS = True
 # Axes aligned bounding boxes
 _C.TASK.TOP_DOWN_MAP.DRAW_GOAL_AABBS = True
+# Number of top-down maps, one per scene, floor height and resolution, that
+# are kept in memory instead of being recomputed on every reset.  0 to
+# disable caching
+_C.TASK.TOP_DOWN_MAP.MAP_CACHE_SIZE = 0
+# Floor heights (in meters) in the same bucket share the same cached map, the
+# one rasterized at the first of those heights
+_C.TASK.TOP_DOWN_MAP.MAP_CACHE_HEIGHT_BUCKET = 0.1
+# Directory the top-down maps are also saved to and loaded from, so they are
+# shared between environments and runs.  Not saved to disk if empty
+_C.TASK.TOP_DOWN_MAP.MAP_CACHE_DIR = ""
+# Only send the full map on the first step of an episode and then only what
+# changed (the new trajectory segment and the newly revealed fog of war
+# cells).  The full maps are rebuilt with maps.TopDownMapReconstructor,
+# which needs the output of every step
+_C.TASK.TOP_DOWN_MAP.EMIT_DELTAS = False
 # -----------------------------------------------------------------------------
 # COLLISIONS MEASUREMENT
 # -----------------------------------------------------------------------------
@@ -228,6 +251,14 @@ _C.SIMULATOR.SEED = _C.SEED
 _C.SIMULATOR.TURN_ANGLE = 10  # angle to rotate left or right in degrees
 _C.SIMULATOR.TILT_ANGLE = 15  # angle to tilt the camera up or down in degrees
 _C.SIMULATOR.DEFAULT_AGENT_ID = 0
+# Number of recently used scenes whose assets stay loaded in habitat_sim when
+# the simulator switches to another scene, 1 releases them on every switch.
+# habitat_sim can only release all the scenes at once, so they all are
+# released when a new scene does not fit
+_C.SIMULATOR.SCENE_CACHE_SIZE = 1
+# Memory the kept scenes may use, estimated from the size of their files.
+# 0 for no budget
+_C.SIMULATOR.SCENE_CACHE_MEMORY_BUDGET_MB = 0
 # -----------------------------------------------------------------------------
 # SIMULATOR SENSORS
 # -----------------------------------------------------------------------------
@@ -236,6 +267,11 @@ SIMULATOR_SENSOR.HEIGHT = 480
 SIMULATOR_SENSOR.WIDTH = 640
 SIMULATOR_SENSOR.POSITION = [0, 1.25, 0]
 SIMULATOR_SENSOR.ORIENTATION = [0.0, 0.0, 0.0]  # Euler's angles
+# Only render the sensor on steps while rendering on demand sensors is
+# requested (see Simulator.set_render_on_demand_sensors), e.g. for sensors
+# that are only used for videos.  Its last rendered observation is returned
+# otherwise
+SIMULATOR_SENSOR.RENDER_ON_DEMAND = False
 
 # -----------------------------------------------------------------------------
 # CAMERA SENSOR
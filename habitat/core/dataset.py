@@ -12,7 +12,7 @@ import copy
 import json
 import os
 import random
-from itertools import groupby
+from itertools import chain, groupby
 from typing import (
     Any,
     Callable,
@@ -418,6 +418,7 @@ class EpisodeIterator(Iterator[T]):
         self._prev_scene_id: Optional[str] = None
 
         self._iterator = iter(self.episodes)
+        self._peeked_episode: Optional[T] = None
 
         self.step_repetition_range = step_repetition_range
         self._set_shuffle_intervals()
@@ -432,7 +433,10 @@ class EpisodeIterator(Iterator[T]):
         """
         self._forced_scene_switch_if()
 
-        next_episode = next(self._iterator, None)
+        next_episode = self._peeked_episode
+        self._peeked_episode = None
+        if next_episode is None:
+            next_episode = next(self._iterator, None)
         if next_episode is None:
             if not self.cycle:
                 raise StopIteration
@@ -454,10 +458,40 @@ class EpisodeIterator(Iterator[T]):
         self._prev_scene_id = next_episode.scene_id
         return next_episode
 
+    def peek(self) -> Optional[T]:
+        r"""Returns the episode that the next call to :py:`next()` returns,
+        without advancing the iterator, or :py:`None` at the end of the
+        episodes. The episode can differ if a scene switch is forced (see
+        :p:`max_scene_repeat_steps`) by the steps taken in between.
+        """
+        if self._peeked_episode is None:
+            next_episode = next(self._iterator, None)
+            if next_episode is None:
+                if not self.cycle:
+                    return None
+
+                # Start the next cycle now, as the next call would do
+                self._iterator = iter(self.episodes)
+                if self.shuffle:
+                    self._shuffle()
+                next_episode = next(self._iterator)
+            self._peeked_episode = next_episode
+
+        return self._peeked_episode
+
+    def _unpeek(self) -> None:
+        r"""Internal method that puts the peeked episode back in front of
+        the remaining episodes.
+        """
+        if self._peeked_episode is not None:
+            self._iterator = chain([self._peeked_episode], self._iterator)
+            self._peeked_episode = None
+
     def _forced_scene_switch(self) -> None:
         r"""Internal method to switch the scene. Moves remaining episodes
         from current scene to the end and switch to next scene episodes.
         """
+        self._unpeek()
         grouped_episodes = [
             list(g)
             for k, g in groupby(self._iterator, key=lambda x: x.scene_id)
@@ -474,6 +508,7 @@ class EpisodeIterator(Iterator[T]):
         If self.group_by_scene is true, then shuffle groups of scenes.
         """
         assert self.shuffle
+        self._unpeek()
         episodes = list(self._iterator)
 
         random.shuffle(episodes)
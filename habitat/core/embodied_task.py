@@ -8,7 +8,7 @@ r"""Implements tasks and measurements needed for training and benchmarking of
 """
 
 from collections import OrderedDict
-from typing import Any, Dict, Iterable, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import numpy as np
 
@@ -87,13 +87,18 @@ class Measure:
     This can be used for tracking statistics when running experiments. The
     user of this class needs to implement the :ref:`reset_metric()` and
     :ref:`update_metric()` method and the user is also required to set the
-    :ref:`uuid <Measure.uuid>` and :ref:`_metric` attributes.
+    :ref:`uuid <Measure.uuid>` and :ref:`_metric` attributes. A measure
+    that reads the metrics of other measures lists their uuids in
+    :ref:`get_dependencies()`.
 
     .. (uuid is a builtin Python module, so just :ref:`uuid` would link there)
     """
 
     _metric: Any
     uuid: str
+    # Arguments of the last update_metric call of a lazy measure that was
+    # not applied yet, see Measurements
+    _pending_update: Optional[Tuple[Tuple, Dict[str, Any]]] = None
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         self.uuid = self._get_uuid(*args, **kwargs)
@@ -114,62 +119,212 @@ class Measure:
         """
         raise NotImplementedError
 
+    def get_dependencies(self) -> List[str]:
+        r"""..
+
+        :return: the uuids of the measures whose metrics are read by this
+            measure. Those are always reset and updated before it.
+        """
+        return []
+
     def get_metric(self):
         r"""..
 
         :return: the current metric for :ref:`Measure`.
         """
+        if self._pending_update is not None:
+            args, kwargs = self._pending_update
+            self._pending_update = None
+            self.update_metric(*args, **kwargs)
         return self._metric
 
 
 class Metrics(dict):
-    r"""Dictionary containing measurements."""
+    r"""Dictionary containing measurements.
+
+    The metrics of the measures in :p:`deferred` are only computed when
+    they are read: :py:`metrics[key]` and :py:`metrics.get(key)` compute
+    only that metric, and listing or iterating over the dictionary computes
+    all of them. Membership tests do not compute anything, and pickling
+    (i.e. sending the info from an environment worker) only includes the
+    metrics that were computed.
+    """
 
-    def __init__(self, measures: Dict[str, Measure]) -> None:
+    def __init__(
+        self,
+        measures: Dict[str, Measure],
+        deferred: Iterable[str] = (),
+    ) -> None:
         """Constructor
 
         :param measures: list of :ref:`Measure` whose metrics are fetched and
             packaged.
+        :param deferred: uuids of the measures whose metrics are only
+            fetched on lookup.
         """
+        deferred = set(deferred)
+        self._deferred_measures = {
+            uuid: measures[uuid] for uuid in deferred if uuid in measures
+        }
         data = [
-            (uuid, measure.get_metric()) for uuid, measure in measures.items()
+            (uuid, measure.get_metric())
+            for uuid, measure in measures.items()
+            if uuid not in deferred
         ]
         super().__init__(data)
 
+    def __missing__(self, key: str) -> Any:
+        if key not in self._deferred_measures:
+            raise KeyError(key)
+        self[key] = self._deferred_measures.pop(key).get_metric()
+        return self[key]
+
+    def _fetch_deferred(self) -> None:
+        for key in list(self._deferred_measures.keys()):
+            self.__missing__(key)
+
+    def __contains__(self, key: object) -> bool:
+        return super().__contains__(key) or key in self._deferred_measures
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def __iter__(self):
+        self._fetch_deferred()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        return super().__len__() + len(self._deferred_measures)
+
+    def keys(self):
+        self._fetch_deferred()
+        return super().keys()
+
+    def values(self):
+        self._fetch_deferred()
+        return super().values()
+
+    def items(self):
+        self._fetch_deferred()
+        return super().items()
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        self._fetch_deferred()
+        return super().__repr__()
+
+    def __reduce__(self):
+        # Sent to other processes as a plain dictionary of the computed
+        # metrics only, the deferred measures are left out so that they
+        # are not computed on every step
+        return dict, (dict(super().items()),)
+
 
 class Measurements:
     r"""Represents a set of Measures, with each :ref:`Measure` being
     identified through a unique id.
+
+    The measures are kept in the order they are given in, except that each
+    measure is moved after the measures it depends on (see
+    :ref:`Measure.get_dependencies()`).
+
+    The updates of lazy measures are deferred to the first time their
+    metric is read, from another measure or from :ref:`get_metrics()`, and
+    are skipped when their metric is not read before the next step. Only
+    measures whose metric only depends on the current state of the episode
+    (e.g. the distance to the goal or success) can be lazy.
     """
 
     measures: Dict[str, Measure]
 
-    def __init__(self, measures: Iterable[Measure]) -> None:
+    def __init__(
+        self, measures: Iterable[Measure], lazy_measures: Iterable[str] = ()
+    ) -> None:
         """Constructor
 
         :param measures: list containing :ref:`Measure`, uuid of each
             :ref:`Measure` must be unique.
+        :param lazy_measures: uuids of the measures that are only updated
+            on demand.
         """
-        self.measures = OrderedDict()
+        measures_by_uuid: Dict[str, Measure] = OrderedDict()
         for measure in measures:
             assert (
-                measure.uuid not in self.measures
+                measure.uuid not in measures_by_uuid
             ), "'{}' is duplicated measure uuid".format(measure.uuid)
-            self.measures[measure.uuid] = measure
+            measures_by_uuid[measure.uuid] = measure
+
+        self.measures = self._sort_by_dependencies(measures_by_uuid)
+        self._lazy_uuids = set(lazy_measures)
+        for uuid in self._lazy_uuids:
+            assert (
+                uuid in self.measures
+            ), f"Lazy measure '{uuid}' is not in the measures list."
+
+    @staticmethod
+    def _sort_by_dependencies(
+        measures: Dict[str, Measure]
+    ) -> Dict[str, Measure]:
+        dependencies = {
+            uuid: [
+                dep for dep in measure.get_dependencies() if dep in measures
+            ]
+            for uuid, measure in measures.items()
+        }
+        sorted_measures: Dict[str, Measure] = OrderedDict()
+        while len(sorted_measures) < len(measures):
+            # Add the first measure, in the given order, whose dependencies
+            # were all added
+            uuid = next(
+                (
+                    uuid
+                    for uuid in measures
+                    if uuid not in sorted_measures
+                    and all(
+                        dep in sorted_measures for dep in dependencies[uuid]
+                    )
+                ),
+                None,
+            )
+            assert (
+                uuid is not None
+            ), "Measures have circular dependencies: {}".format(
+                [uuid for uuid in measures if uuid not in sorted_measures]
+            )
+            sorted_measures[uuid] = measures[uuid]
+
+        return sorted_measures
 
     def reset_measures(self, *args: Any, **kwargs: Any) -> None:
         for measure in self.measures.values():
+            measure._pending_update = None
             measure.reset_metric(*args, **kwargs)
 
     def update_measures(self, *args: Any, **kwargs: Any) -> None:
-        for measure in self.measures.values():
-            measure.update_metric(*args, **kwargs)
+        for uuid, measure in self.measures.items():
+            if uuid in self._lazy_uuids:
+                measure._pending_update = (args, kwargs)
+            else:
+                measure.update_metric(*args, **kwargs)
 
-    def get_metrics(self) -> Metrics:
+    def get_metrics(self, compute_lazy: bool = True) -> Metrics:
         r"""Collects measurement from all :ref:`Measure`\ s and returns it
         packaged inside :ref:`Metrics`.
+
+        :param compute_lazy: whether to compute the metrics of the lazy
+            measures that were not updated yet. Otherwise those are only
+            computed when they are read from the returned :ref:`Metrics`.
         """
-        return Metrics(self.measures)
+        deferred = ()
+        if not compute_lazy:
+            deferred = [
+                uuid
+                for uuid in self._lazy_uuids
+                if self.measures[uuid]._pending_update is not None
+            ]
+        return Metrics(self.measures, deferred)
 
     def _get_measure_index(self, measure_name):
         return list(self.measures.keys()).index(measure_name)
@@ -232,12 +387,20 @@ class EmbodiedTask:
         self._sim = sim
         self._dataset = dataset
 
+        measures = self._init_entities(
+            entity_names=config.MEASUREMENTS,
+            register_func=registry.get_measure,
+            entities_config=config,
+        )
+        for name in config.LAZY_MEASUREMENTS:
+            assert (
+                name in measures
+            ), f"Lazy measure '{name}' is not in the measures list."
         self.measurements = Measurements(
-            self._init_entities(
-                entity_names=config.MEASUREMENTS,
-                register_func=registry.get_measure,
-                entities_config=config,
-            ).values()
+            measures.values(),
+            lazy_measures=[
+                measures[name].uuid for name in config.LAZY_MEASUREMENTS
+            ],
         )
 
         self.sensor_suite = SensorSuite(
@@ -17,6 +17,7 @@ from habitat.config import Config
 from habitat.core.dataset import Dataset, Episode, EpisodeIterator
 from habitat.core.embodied_task import EmbodiedTask, Metrics
 from habitat.core.simulator import Observations, Simulator
+from habitat.core.utils import ScenePrefetcher
 from habitat.datasets import make_dataset
 from habitat.sims import make_sim
 from habitat.tasks import make_task
@@ -128,6 +129,9 @@ class Env:
         self._elapsed_steps = 0
         self._episode_start_time: Optional[float] = None
         self._episode_over = False
+        self._scene_prefetcher: Optional[ScenePrefetcher] = None
+        if self._config.ENVIRONMENT.PREFETCH_NEXT_SCENE:
+            self._scene_prefetcher = ScenePrefetcher()
 
     def _setup_episode_iterator(self):
         assert self._dataset is not None
@@ -209,7 +213,11 @@ class Env:
         return time.time() - self._episode_start_time
 
     def get_metrics(self) -> Metrics:
-        return self._task.measurements.get_metrics()
+        # Lazy measures are only computed at the end of the episode or when
+        # they are read from the metrics
+        return self._task.measurements.get_metrics(
+            compute_lazy=self._episode_over
+        )
 
     def _past_limit(self) -> bool:
         return (
@@ -251,6 +259,7 @@ class Env:
 
         assert self._current_episode is not None, "Reset requires an episode"
         self.reconfigure(self._config)
+        self._prefetch_next_scene()
 
         observations = self.task.reset(episode=self.current_episode)
         self._task.measurements.reset_measures(
@@ -261,6 +270,19 @@ class Env:
 
         return observations
 
+    def _prefetch_next_scene(self) -> None:
+        if self._scene_prefetcher is None or not isinstance(
+            self._episode_iterator, EpisodeIterator
+        ):
+            return
+
+        next_episode = self._episode_iterator.peek()
+        if (
+            next_episode is not None
+            and next_episode.scene_id != self.current_episode.scene_id
+        ):
+            self._scene_prefetcher.prefetch(next_episode.scene_id)
+
     def _update_step_stats(self) -> None:
         self._elapsed_steps += 1
         self._episode_over = not self._task.is_episode_active
@@ -338,10 +360,19 @@ class Env:
 
         self._sim.reconfigure(self._config.SIMULATOR)
 
+    def set_render_on_demand_sensors(self, enabled: bool) -> None:
+        r"""Sets whether the sensors configured with :py:`RENDER_ON_DEMAND`
+        are rendered on :ref:`step`, e.g. only for episodes that are recorded
+        to a video (see :ref:`Simulator.set_render_on_demand_sensors`).
+        """
+        self._sim.set_render_on_demand_sensors(enabled)
+
     def render(self, mode="rgb") -> np.ndarray:
         return self._sim.render(mode)
 
     def close(self) -> None:
+        if self._scene_prefetcher is not None:
+            self._scene_prefetcher.close()
         self._sim.close()
 
     def __enter__(self):
@@ -453,6 +484,9 @@ class RLEnv(gym.Env):
     def seed(self, seed: Optional[int] = None) -> None:
         self._env.seed(seed)
 
+    def set_render_on_demand_sensors(self, enabled: bool) -> None:
+        self._env.set_render_on_demand_sensors(enabled)
+
     def render(self, mode: str = "rgb") -> np.ndarray:
         return self._env.render(mode)
 
@@ -464,3 +498,56 @@ class RLEnv(gym.Env):
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
+
+
+class ActionRepeatRLEnv(gym.Wrapper):
+    r"""Wrapper over :ref:`RLEnv` that repeats every action for
+    :p:`num_repeats` steps of the wrapped environment.
+
+    The rewards of the repeated steps are summed and the repetition stops
+    as soon as one of them is done. The sensors are only rendered on the
+    last repeated step, intermediate steps only advance the simulation
+    (see :ref:`Simulator.set_render_enabled`). The info of the last step is
+    returned. Note that the episode step limits still count the steps of
+    the wrapped environment.
+    """
+
+    env: RLEnv
+
+    def __init__(self, env: RLEnv, num_repeats: int) -> None:
+        assert num_repeats >= 1, "num_repeats must be at least 1"
+        super().__init__(env)
+        self.num_repeats = num_repeats
+
+    @property
+    def habitat_env(self) -> Env:
+        return self.env.habitat_env
+
+    @property
+    def episodes(self) -> List[Episode]:
+        return self.env.episodes
+
+    @episodes.setter
+    def episodes(self, episodes: List[Episode]) -> None:
+        self.env.episodes = episodes
+
+    @property
+    def current_episode(self) -> Episode:
+        return self.env.current_episode
+
+    def step(self, *args, **kwargs) -> Tuple[Observations, Any, bool, dict]:
+        sim = self.env.habitat_env.sim
+        total_reward = 0.0
+        try:
+            for i in range(self.num_repeats):
+                sim.set_render_enabled(i == self.num_repeats - 1)
+                observations, reward, done, info = self.env.step(
+                    *args, **kwargs
+                )
+                total_reward += reward
+                if done:
+                    break
+        finally:
+            sim.set_render_enabled(True)
+
+        return observations, total_reward, done, info
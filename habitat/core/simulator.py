@@ -258,6 +258,26 @@ class Simulator:
         """
         raise NotImplementedError
 
+    def set_render_enabled(self, enabled: bool) -> None:
+        r"""Enables or disables rendering the sensors in :ref:`step`. While
+        rendering is disabled, :ref:`step` only advances the simulation and
+        returns the observations of the last rendered step. Simulators that
+        cannot skip rendering ignore this.
+
+        :param enabled: whether :ref:`step` renders the sensors.
+        """
+        pass
+
+    def set_render_on_demand_sensors(self, enabled: bool) -> None:
+        r"""Sets whether :ref:`step` renders the sensors that are configured
+        with :py:`RENDER_ON_DEMAND`. While disabled, the observations of
+        those sensors are the ones of the last step they were rendered on.
+        Simulators that cannot skip rendering ignore this.
+
+        :param enabled: whether :ref:`step` renders the on demand sensors.
+        """
+        pass
+
     def seed(self, seed: int) -> None:
         raise NotImplementedError
 
@@ -292,6 +312,16 @@ class Simulator:
         """
         raise NotImplementedError
 
+    def get_cached_agent_state(self, agent_id: int = 0) -> AgentState:
+        r"""Same as :ref:`get_agent_state`, but simulators can fetch the
+        state only once per step and share it between all its users, so it
+        must not be modified.
+
+        :param agent_id: id of agent.
+        :return: state of agent corresponding to :p:`agent_id`.
+        """
+        return self.get_agent_state(agent_id)
+
     def get_observations_at(
         self,
         position: List[float],
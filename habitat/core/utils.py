@@ -5,8 +5,12 @@
 # LICENSE file in the root directory of this source tree.
 
 import cmath
+import glob
 import json
 import math
+import os
+import queue
+import threading
 from typing import Any, Dict, List, Optional
 
 import attr
@@ -114,6 +118,76 @@ def center_crop(obs, new_shape):
     return obs
 
 
+def get_scene_files(scene_id: str) -> List[str]:
+    r"""Returns the files of a scene, i.e. the scene file and the files next
+    to it with the same name, like its navmesh, semantic mesh and
+    annotations. Empty if :p:`scene_id` is not a file.
+    """
+    if not os.path.isfile(scene_id):
+        return []
+    stem = glob.escape(os.path.splitext(scene_id)[0])
+    paths = {scene_id}
+    for pattern in [stem + ".*", stem + "_*"]:
+        paths.update(glob.glob(pattern))
+    return sorted(paths)
+
+
+class ScenePrefetcher:
+    r"""Reads the files of scenes in a background thread, so that they are
+    in the OS page cache when the simulator loads the scene. This hides the
+    disk latency of scene switches, e.g. on network filesystems.
+
+    :param chunk_size: Size in bytes of the reads.
+    """
+
+    def __init__(self, chunk_size: int = 4 * 1024 * 1024) -> None:
+        self.chunk_size = chunk_size
+        self.num_prefetched_files = 0
+        self._last_scene_id: Optional[str] = None
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def prefetch(self, scene_id: str) -> None:
+        r"""Reads the files of :p:`scene_id` in the background, unless they
+        were the last requested.
+        """
+        if self._closed or scene_id == self._last_scene_id:
+            return
+        self._last_scene_id = scene_id
+        self._queue.put(scene_id)
+
+    def _read_file(self, path: str) -> None:
+        with open(path, "rb", buffering=0) as f:
+            while not self._closed and f.read(self.chunk_size):
+                pass
+
+    def _run(self) -> None:
+        while True:
+            scene_id = self._queue.get()
+            if scene_id is None:
+                return
+            for path in get_scene_files(scene_id):
+                try:
+                    self._read_file(path)
+                except OSError:
+                    continue
+                self.num_prefetched_files += 1
+            self._queue.task_done()
+
+    def join(self) -> None:
+        r"""Waits for the requested scenes to be read."""
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+
 class DatasetFloatJSONEncoder(json.JSONEncoder):
     r"""JSON Encoder that sets a float precision for a space saving purpose and
     encodes ndarray and quaternion. The encoder is compatible with JSON
@@ -33,6 +33,7 @@ import habitat
 from habitat.config import Config
 from habitat.core.env import Env, RLEnv
 from habitat.core.logging import logger
+from habitat.core.simulator import Observations
 from habitat.core.utils import tile_images
 from habitat.utils import profiling_wrapper
 from habitat.utils.pickle5_multiprocessing import ConnectionWrapper
@@ -64,6 +65,10 @@ ACTION_SPACE_NAME = "action_space"
 OBSERVATION_SPACE_NAME = "observation_space"
 
 
+def _identity(x):
+    return x
+
+
 def _make_env_fn(
     config: Config, dataset: Optional[habitat.Dataset] = None, rank: int = 0
 ) -> Env:
@@ -134,6 +139,8 @@ class VectorEnv:
     _workers: List[Union[mp.Process, Thread]]
     _num_envs: int
     _auto_reset_done: bool
+    _per_step_info_keys: Optional[Tuple[str, ...]]
+    _obs_transform: Optional[Callable[[Observations], Observations]]
     _mp_ctx: BaseContext
     _connection_read_fns: List[_ReadWrapper]
     _connection_write_fns: List[_WriteWrapper]
@@ -145,6 +152,8 @@ class VectorEnv:
         auto_reset_done: bool = True,
         multiprocessing_start_method: str = "forkserver",
         workers_ignore_signals: bool = False,
+        per_step_info_keys: Optional[Sequence[str]] = None,
+        obs_transform: Optional[Callable[[Observations], Observations]] = None,
     ) -> None:
         """..
 
@@ -162,6 +171,17 @@ class VectorEnv:
             used, the subproccess  must be started before any other GPU usage.
         :param workers_ignore_signals: Whether or not workers will ignore SIGINT and SIGTERM
             and instead will only exit when :ref:`close` is called
+        :param per_step_info_keys: If not :py:`None`, the info returned by
+            :ref:`env.RLEnv` environments only contains these keys on steps
+            where the episode does not end, and the full info is only sent
+            when it does. This avoids sending heavy measures (i.e.
+            :py:`top_down_map`) between processes on every step when they are
+            only needed at the end of the episode.
+        :param obs_transform: If not :py:`None`, a (picklable) function that
+            the workers apply to the observations of their environment
+            before sending them, i.e. to downscale images so that less data
+            is sent between processes. :ref:`observation_spaces` are the
+            observation spaces of the environments, before the transform.
         """
         self._is_closed = True
 
@@ -175,6 +195,12 @@ class VectorEnv:
             "multiprocessing_start_method must be one of {}. Got '{}'"
         ).format(self._valid_start_methods, multiprocessing_start_method)
         self._auto_reset_done = auto_reset_done
+        self._per_step_info_keys = (
+            tuple(per_step_info_keys)
+            if per_step_info_keys is not None
+            else None
+        )
+        self._obs_transform = obs_transform
         self._mp_ctx = mp.get_context(multiprocessing_start_method)
         self._workers = []
         (
@@ -221,8 +247,12 @@ class VectorEnv:
         mask_signals: bool = False,
         child_pipe: Optional[Connection] = None,
         parent_pipe: Optional[Connection] = None,
+        per_step_info_keys: Optional[Tuple[str, ...]] = None,
+        obs_transform: Optional[Callable[[Observations], Observations]] = None,
     ) -> None:
         r"""process worker for creating and interacting with the environment."""
+        if obs_transform is None:
+            obs_transform = _identity
         if mask_signals:
             signal.signal(signal.SIGINT, signal.SIG_IGN)
             signal.signal(signal.SIGTERM, signal.SIG_IGN)
@@ -243,6 +273,15 @@ class VectorEnv:
                         observations, reward, done, info = env.step(**data)
                         if auto_reset_done and done:
                             observations = env.reset()
+                        observations = obs_transform(observations)
+                        # The full info is only needed once the episode
+                        # is over, so only send the per-step keys otherwise
+                        if per_step_info_keys is not None and not done:
+                            info = {
+                                k: info[k]
+                                for k in per_step_info_keys
+                                if k in info
+                            }
                         with profiling_wrapper.RangeContext(
                             "worker write after step"
                         ):
@@ -254,13 +293,13 @@ class VectorEnv:
                         observations = env.step(**data)
                         if auto_reset_done and env.episode_over:
                             observations = env.reset()
-                        connection_write_fn(observations)
+                        connection_write_fn(obs_transform(observations))
                     else:
                         raise NotImplementedError
 
                 elif command == RESET_COMMAND:
                     observations = env.reset()
-                    connection_write_fn(observations)
+                    connection_write_fn(obs_transform(observations))
 
                 elif command == RENDER_COMMAND:
                     connection_write_fn(env.render(*data[0], **data[1]))
@@ -323,6 +362,10 @@ class VectorEnv:
                     worker_conn,
                     parent_conn,
                 ),
+                kwargs=dict(
+                    per_step_info_keys=self._per_step_info_keys,
+                    obs_transform=self._obs_transform,
+                ),
             )
             self._workers.append(cast(mp.Process, ps))
             ps.daemon = True
@@ -545,6 +588,24 @@ class VectorEnv:
             results.append(read_fn())
         return results
 
+    def set_render_on_demand_sensors(
+        self, enabled: bool, index: Optional[int] = None
+    ) -> None:
+        r"""Sets whether the sensors configured with :py:`RENDER_ON_DEMAND`
+        are rendered on step (see :ref:`env.Env.set_render_on_demand_sensors`).
+
+        :param enabled: whether the on demand sensors are rendered.
+        :param index: which env to set it on, all envs if :py:`None`.
+        """
+        function_args = {"enabled": enabled}
+        if index is not None:
+            self.call_at(index, "set_render_on_demand_sensors", function_args)
+        else:
+            self.call(
+                ["set_render_on_demand_sensors"] * self.num_envs,
+                [function_args] * self.num_envs,
+            )
+
     def render(
         self, mode: str = "human", *args, **kwargs
     ) -> Union[np.ndarray, None]:
@@ -631,6 +692,10 @@ class ThreadedVectorEnv(VectorEnv):
                     env_args,
                     self._auto_reset_done,
                 ),
+                kwargs=dict(
+                    per_step_info_keys=self._per_step_info_keys,
+                    obs_transform=self._obs_transform,
+                ),
             )
             self._workers.append(thread)
             thread.daemon = True
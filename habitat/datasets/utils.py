@@ -8,16 +8,20 @@
  taken from Pythia.
 """
 import json
+import multiprocessing
 import os
 import re
 import typing
-from collections import Counter
-from typing import Iterable, List, Union
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
 
 from numpy import float64
 
+from habitat.config import Config
+from habitat.core.dataset import Episode
 from habitat.core.logging import logger
 from habitat.core.simulator import ShortestPathPoint
+from habitat.sims import make_sim
 from habitat.sims.habitat_simulator.actions import HabitatSimActions
 from habitat.utils.geometry_utils import quaternion_to_list
 
@@ -179,17 +183,15 @@ class VocabFromText(VocabDict):
         super(VocabFromText, self).__init__(word_list=extras + token_list)
 
 
-def get_action_shortest_path(
+def _follow_shortest_path(
     sim: "HabitatSim",
+    follower: "ShortestPathFollower",
     source_position: List[float],
     source_rotation: List[Union[int, float64]],
     goal_position: List[float],
-    success_distance: float = 0.05,
-    max_episode_steps: int = 500,
+    max_episode_steps: int,
 ) -> List[ShortestPathPoint]:
-    sim.reset()
     sim.set_agent_state(source_position, source_rotation)
-    follower = ShortestPathFollower(sim, success_distance, False)
 
     shortest_path = []
     step_count = 0
@@ -214,6 +216,140 @@ def get_action_shortest_path(
     return shortest_path
 
 
+def get_action_shortest_path(
+    sim: "HabitatSim",
+    source_position: List[float],
+    source_rotation: List[Union[int, float64]],
+    goal_position: List[float],
+    success_distance: float = 0.05,
+    max_episode_steps: int = 500,
+) -> List[ShortestPathPoint]:
+    sim.reset()
+    follower = ShortestPathFollower(sim, success_distance, False)
+    return _follow_shortest_path(
+        sim,
+        follower,
+        source_position,
+        source_rotation,
+        goal_position,
+        max_episode_steps,
+    )
+
+
+def get_action_shortest_paths(
+    sim: "HabitatSim",
+    source_positions: Sequence[List[float]],
+    source_rotations: Sequence[List[Union[int, float64]]],
+    goal_positions: Sequence[List[float]],
+    success_distance: float = 0.05,
+    max_episode_steps: int = 500,
+) -> List[List[ShortestPathPoint]]:
+    r"""Batched version of :ref:`get_action_shortest_path` for episodes in
+    the scene loaded in :p:`sim`. The greedy follower is only built once and
+    the sensors are not rendered while following the paths.
+    """
+    sim.reset()
+    follower = ShortestPathFollower(sim, success_distance, False)
+    sim.set_render_enabled(False)
+    try:
+        return [
+            _follow_shortest_path(
+                sim,
+                follower,
+                source_position,
+                source_rotation,
+                goal_position,
+                max_episode_steps,
+            )
+            for source_position, source_rotation, goal_position in zip(
+                source_positions, source_rotations, goal_positions
+            )
+        ]
+    finally:
+        sim.set_render_enabled(True)
+
+
+def _get_scene_action_shortest_paths(
+    args: Tuple[Config, str, List[int], List[Episode], float, int]
+) -> Tuple[List[int], List[List[ShortestPathPoint]]]:
+    (
+        sim_config,
+        scene_id,
+        indices,
+        episodes,
+        success_distance,
+        max_episode_steps,
+    ) = args
+    sim_config = sim_config.clone()
+    sim_config.defrost()
+    sim_config.SCENE = scene_id
+    # Only the pathfinder is needed to follow the paths
+    agent_name = sim_config.AGENTS[sim_config.DEFAULT_AGENT_ID]
+    getattr(sim_config, agent_name).SENSORS = []
+    sim_config.freeze()
+
+    with make_sim(sim_config.TYPE, config=sim_config) as sim:
+        paths = get_action_shortest_paths(
+            sim,
+            [episode.start_position for episode in episodes],
+            [episode.start_rotation for episode in episodes],
+            [episode.goals[0].position for episode in episodes],
+            success_distance=success_distance,
+            max_episode_steps=max_episode_steps,
+        )
+    return indices, paths
+
+
+def generate_action_shortest_paths(
+    sim_config: Config,
+    episodes: Sequence[Episode],
+    num_processes: int = 8,
+    success_distance: float = 0.05,
+    max_episode_steps: int = 500,
+    multiprocessing_start_method: str = "forkserver",
+) -> List[List[ShortestPathPoint]]:
+    r"""Computes the shortest path to the first goal of each of the
+    :p:`episodes`, with one process per scene at a time.
+
+    :param sim_config: config of the simulator, its scene is replaced by
+        the scene of the episodes.
+    :param episodes: the episodes, with goals, to compute the paths of.
+    :param num_processes: number of scenes processed in parallel.
+    :param multiprocessing_start_method: the multiprocessing method used to
+        start the processes (see :ref:`vector_env.VectorEnv`).
+    :return: the shortest path of each episode, in the order of
+        :p:`episodes`.
+    """
+    if len(episodes) == 0:
+        return []
+
+    scene_indices: Dict[str, List[int]] = defaultdict(list)
+    for i, episode in enumerate(episodes):
+        scene_indices[episode.scene_id].append(i)
+
+    tasks = [
+        (
+            sim_config,
+            scene_id,
+            indices,
+            [episodes[i] for i in indices],
+            success_distance,
+            max_episode_steps,
+        )
+        for scene_id, indices in scene_indices.items()
+    ]
+    paths: List[List[ShortestPathPoint]] = [[] for _ in episodes]
+    mp_ctx = multiprocessing.get_context(multiprocessing_start_method)
+    with mp_ctx.Pool(min(num_processes, len(tasks))) as pool:
+        for indices, scene_paths in pool.imap_unordered(
+            _get_scene_action_shortest_paths, tasks
+        ):
+            for i, path in zip(indices, scene_paths):
+                paths[i] = path
+
+    return paths
+
+
 def check_and_gen_physics_config():
     if os.path.exists(DEFAULT_PHYSICS_CONFIG_PATH):
         return
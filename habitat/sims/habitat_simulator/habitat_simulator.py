@@ -4,11 +4,15 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import os
+import time
+from collections import OrderedDict
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
     Dict,
+    Iterable,
     List,
     Optional,
     Sequence,
@@ -42,6 +46,7 @@ from habitat.core.simulator import (
     VisualObservation,
 )
 from habitat.core.spaces import Space
+from habitat.core.utils import get_scene_files
 
 
 def overwrite_config(
@@ -88,7 +93,7 @@ def overwrite_config(
 class HabitatSimSensor:
     sim_sensor_type: habitat_sim.SensorType
     _get_default_spec = Callable[..., habitat_sim.sensor.SensorSpec]
-    _config_ignore_keys = {"height", "type", "width"}
+    _config_ignore_keys = {"height", "render_on_demand", "type", "width"}
 
 
 @registry.register_sensor
@@ -242,6 +247,91 @@ def check_sim_obs(obs: Optional[ndarray], sensor: Sensor) -> None:
     )
 
 
+class SceneCache:
+    r"""Bookkeeping of the scenes whose assets habitat_sim keeps loaded
+    across :ref:`HabitatSim.reconfigure`, so that switching back to one of
+    them does not load its assets from disk again.
+
+    habitat_sim can only release the assets of all the loaded scenes at
+    once, by closing the simulator. So when a new scene does not fit in the
+    cache, all the other scenes are evicted.
+
+    :param max_size: The number of scenes kept loaded, 1 releases the
+        assets on every scene change.
+    :param memory_budget: The memory, in bytes, that the kept scenes may
+        use, estimated from the size of their files. 0 for no budget.
+    """
+
+    def __init__(self, max_size: int = 1, memory_budget: int = 0) -> None:
+        self.max_size = max_size
+        self.memory_budget = memory_budget
+        self._scenes: "OrderedDict[str, int]" = OrderedDict()
+        self.num_hits = 0
+        self.num_misses = 0
+        self.num_evictions = 0
+        self.hit_load_time = 0.0
+        self.miss_load_time = 0.0
+
+    @staticmethod
+    def estimate_scene_size(scene_id: str) -> int:
+        r"""The size of the files of the scene (see
+        :ref:`get_scene_files`).
+        """
+        return sum(os.path.getsize(path) for path in get_scene_files(scene_id))
+
+    @property
+    def memory_usage(self) -> int:
+        return sum(self._scenes.values())
+
+    def __contains__(self, scene_id: str) -> bool:
+        return scene_id in self._scenes
+
+    def add(self, scene_id: str) -> bool:
+        r"""Records that :p:`scene_id` is loaded next.
+
+        :return: Whether the loaded scenes must be released before loading
+            it.
+        """
+        if scene_id in self._scenes:
+            self.num_hits += 1
+            self._scenes.move_to_end(scene_id)
+            return False
+
+        self.num_misses += 1
+        size = self.estimate_scene_size(scene_id)
+        evict = len(self._scenes) > 0 and (
+            len(self._scenes) >= self.max_size
+            or (
+                self.memory_budget > 0
+                and self.memory_usage + size > self.memory_budget
+            )
+        )
+        if evict:
+            self.num_evictions += 1
+            self._scenes.clear()
+        self._scenes[scene_id] = size
+        return evict
+
+    def record_load_time(self, load_time: float, is_hit: bool) -> None:
+        r"""Records the time it took to load a scene that was (if
+        :p:`is_hit`) or was not in the cache.
+        """
+        if is_hit:
+            self.hit_load_time += load_time
+        else:
+            self.miss_load_time += load_time
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "num_hits": self.num_hits,
+            "num_misses": self.num_misses,
+            "num_evictions": self.num_evictions,
+            "hit_load_time": self.hit_load_time,
+            "miss_load_time": self.miss_load_time,
+            "memory_usage": self.memory_usage,
+        }
+
+
 @registry.register_simulator(name="Sim-v0")
 class HabitatSim(habitat_sim.Simulator, Simulator):
     r"""Simulator wrapper over habitat-sim
@@ -269,6 +359,12 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
         self._sensor_suite = SensorSuite(sim_sensors)
         self.sim_config = self.create_sim_config(self._sensor_suite)
         self._current_scene = self.sim_config.sim_cfg.scene_id
+        memory_budget_mb = config.SCENE_CACHE_MEMORY_BUDGET_MB
+        self.scene_cache = SceneCache(
+            max_size=config.SCENE_CACHE_SIZE,
+            memory_budget=int(memory_budget_mb * 1024 * 1024),
+        )
+        self.scene_cache.add(self._current_scene)
         super().__init__(self.sim_config)
         # load additional object paths specified by the dataset
         # TODO: Should this be moved elsewhere?
@@ -279,6 +375,15 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
             len(self.sim_config.agents[0].action_space)
         )
         self._prev_sim_obs: Optional[Observations] = None
+        self._render_enabled = True
+        self._on_demand_sensor_uuids = {
+            uuid
+            for uuid, sensor in self._sensor_suite.sensors.items()
+            if sensor.config.get("RENDER_ON_DEMAND", False)
+        }
+        self._render_on_demand_sensors = False
+        # The agent states fetched since the agents last moved
+        self._agent_state_cache: Dict[int, habitat_sim.AgentState] = {}
 
     def create_sim_config(
         self, _sensor_suite: SensorSuite
@@ -377,6 +482,7 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
         return is_updated
 
     def reset(self) -> Observations:
+        self._agent_state_cache.clear()
         sim_obs = super().reset()
         if self._update_agents_state():
             sim_obs = self.get_sensor_observations()
@@ -384,12 +490,78 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
         self._prev_sim_obs = sim_obs
         return self._sensor_suite.get_observations(sim_obs)
 
-    def step(self, action: Union[str, int]) -> Observations:
-        sim_obs = super().step(action)
+    def set_render_enabled(self, enabled: bool) -> None:
+        self._render_enabled = enabled
+
+    def set_render_on_demand_sensors(self, enabled: bool) -> None:
+        self._render_on_demand_sensors = enabled
+
+    def _skipped_sensor_uuids(self) -> Set[str]:
+        r"""The sensors that are not rendered on :ref:`step`, those are the
+        sensors with :py:`RENDER_ON_DEMAND` unless they were requested with
+        :ref:`set_render_on_demand_sensors`.
+        """
+        if self._render_on_demand_sensors:
+            return set()
+        return self._on_demand_sensor_uuids
+
+    def _get_step_sensor_observations(
+        self, uuids: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        r"""Renders the sensors in :p:`uuids`, by default all the sensors
+        that are not skipped. The observations of the sensors that are not
+        rendered are the ones of the last step they were rendered on.
+        """
+        if uuids is None:
+            skipped = self._skipped_sensor_uuids()
+            if not skipped:
+                return self.get_sensor_observations()
+            uuids = [
+                uuid
+                for uuid in self._sensor_suite.sensors
+                if uuid not in skipped
+            ]
+
+        if self._prev_sim_obs is None:
+            return self.get_sensor_observations()
+        # get_sensor_observations renders all the sensors of the agent, the
+        # selected sensors are rendered one by one through the sensor
+        # objects of the default agent
+        sim_sensors = self._sensors
+        for uuid in uuids:
+            sim_sensors[uuid].draw_observation()
+
+        sim_obs = dict(self._prev_sim_obs)
+        for uuid in uuids:
+            sim_obs[uuid] = sim_sensors[uuid].get_observation()
+        return sim_obs
+
+    def step(
+        self, action: Union[str, int], dt: float = 1.0 / 60.0
+    ) -> Observations:
+        self._agent_state_cache.clear()
+        if self._render_enabled and not self._skipped_sensor_uuids():
+            sim_obs = super().step(action, dt=dt)
+        else:
+            collided = self._act_without_render(action, dt)
+            if self._render_enabled:
+                sim_obs = self._get_step_sensor_observations()
+            else:
+                # The observations of the last rendered step are reused
+                sim_obs = dict(self._prev_sim_obs)
+            sim_obs["collided"] = collided
         self._prev_sim_obs = sim_obs
         observations = self._sensor_suite.get_observations(sim_obs)
         return observations
 
+    def _act_without_render(self, action: Union[str, int], dt: float) -> bool:
+        # Same as habitat_sim.Simulator.step(action, dt) but without
+        # rendering the sensors, this must be kept in sync with it.
+        # Returns whether the agent collided
+        collided = self.get_agent(self._default_agent_id).act(action)
+        self.step_physics(dt)
+        return collided
+
     def render(self, mode: str = "rgb") -> Any:
         r"""
         Args:
@@ -412,14 +584,22 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
         return output
 
     def reconfigure(self, habitat_config: Config) -> None:
-        # TODO(maksymets): Switch to Habitat-Sim more efficient caching
         is_same_scene = habitat_config.SCENE == self._current_scene
+        self._agent_state_cache.clear()
         self.habitat_config = habitat_config
         self.sim_config = self.create_sim_config(self._sensor_suite)
         if not is_same_scene:
             self._current_scene = habitat_config.SCENE
-            self.close()
+            t_start = time.perf_counter()
+            is_hit = self._current_scene in self.scene_cache
+            # habitat_sim keeps the assets of the previous scenes loaded
+            # until it is closed
+            if self.scene_cache.add(self._current_scene):
+                self.close()
             super().reconfigure(self.sim_config)
+            self.scene_cache.record_load_time(
+                time.perf_counter() - t_start, is_hit
+            )
 
         self._update_agents_state()
 
@@ -533,6 +713,15 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
     def get_agent_state(self, agent_id: int = 0) -> habitat_sim.AgentState:
         return self.get_agent(agent_id).get_state()
 
+    def get_cached_agent_state(
+        self, agent_id: int = 0
+    ) -> habitat_sim.AgentState:
+        state = self._agent_state_cache.get(agent_id, None)
+        if state is None:
+            state = self.get_agent_state(agent_id)
+            self._agent_state_cache[agent_id] = state
+        return state
+
     def set_agent_state(
         self,
         position: List[float],
@@ -558,6 +747,7 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
             original pose and returns false.
         """
         agent = self.get_agent(agent_id)
+        self._agent_state_cache.clear()
         new_state = self.get_agent_state(agent_id)
         new_state.position = position
         new_state.rotation = rotation
@@ -6,6 +6,7 @@
 
 # TODO, lots of typing errors in here
 
+import math
 from typing import Any, List, Optional, Tuple
 
 import attr
@@ -181,10 +182,12 @@ class PointGoalSensor(Sensor):
 
         if self._goal_format == "POLAR":
             if self._dimensionality == 2:
-                rho, phi = cartesian_to_polar(
-                    -direction_vector_agent[2], direction_vector_agent[0]
+                # Same as cartesian_to_polar, math is faster on scalars
+                x = float(-direction_vector_agent[2])
+                y = float(direction_vector_agent[0])
+                return np.array(
+                    [math.hypot(x, y), -math.atan2(y, x)], dtype=np.float32
                 )
-                return np.array([rho, -phi], dtype=np.float32)
             else:
                 _, phi = cartesian_to_polar(
                     -direction_vector_agent[2], direction_vector_agent[0]
@@ -328,7 +331,7 @@ class IntegratedPointGoalGPSAndCompassSensor(PointGoalSensor):
     def get_observation(
         self, observations, episode, *args: Any, **kwargs: Any
     ):
-        agent_state = self._sim.get_agent_state()
+        agent_state = self._sim.get_cached_agent_state()
         agent_position = agent_state.position
         rotation_world_agent = agent_state.rotation
         goal_position = np.array(episode.goals[0].position, dtype=np.float32)
@@ -365,17 +368,16 @@ class HeadingSensor(Sensor):
         return spaces.Box(low=-np.pi, high=np.pi, shape=(1,), dtype=np.float)
 
     def _quat_to_xy_heading(self, quat):
-        direction_vector = np.array([0, 0, -1])
-
-        heading_vector = quaternion_rotate_vector(quat, direction_vector)
-
-        phi = cartesian_to_polar(-heading_vector[2], heading_vector[0])[1]
+        # Polar angle of the forward vector [0, 0, -1] rotated by quat,
+        # computed from the coefficients of quat
+        w, x, y, z = quat.w, quat.x, quat.y, quat.z
+        phi = math.atan2(-2 * (x * z + w * y), w * w - x * x - y * y + z * z)
         return np.array([phi], dtype=np.float32)
 
     def get_observation(
         self, observations, episode, *args: Any, **kwargs: Any
     ):
-        agent_state = self._sim.get_agent_state()
+        agent_state = self._sim.get_cached_agent_state()
         rotation_world_agent = agent_state.rotation
 
         return self._quat_to_xy_heading(rotation_world_agent.inverse())
@@ -394,7 +396,7 @@ class EpisodicCompassSensor(HeadingSensor):
     def get_observation(
         self, observations, episode, *args: Any, **kwargs: Any
     ):
-        agent_state = self._sim.get_agent_state()
+        agent_state = self._sim.get_cached_agent_state()
         rotation_world_agent = agent_state.rotation
         rotation_world_start = quaternion_from_coeff(episode.start_rotation)
 
@@ -443,7 +445,7 @@ class EpisodicGPSSensor(Sensor):
     def get_observation(
         self, observations, episode, *args: Any, **kwargs: Any
     ):
-        agent_state = self._sim.get_agent_state()
+        agent_state = self._sim.get_cached_agent_state()
 
         origin = np.array(episode.start_position, dtype=np.float32)
         rotation_world_start = quaternion_from_coeff(episode.start_rotation)
@@ -495,7 +497,7 @@ class ProximitySensor(Sensor):
     def get_observation(
         self, observations, *args: Any, episode, **kwargs: Any
     ):
-        current_position = self._sim.get_agent_state().position
+        current_position = self._sim.get_cached_agent_state().position
 
         return np.array(
             [
@@ -527,9 +529,12 @@ class Success(Measure):
     def _get_uuid(self, *args: Any, **kwargs: Any) -> str:
         return self.cls_uuid
 
+    def get_dependencies(self) -> List[str]:
+        return [DistanceToGoal.cls_uuid]
+
     def reset_metric(self, episode, task, *args: Any, **kwargs: Any):
         task.measurements.check_measure_dependencies(
-            self.uuid, [DistanceToGoal.cls_uuid]
+            self.uuid, self.get_dependencies()
         )
         self.update_metric(episode=episode, task=task, *args, **kwargs)  # type: ignore
 
@@ -576,12 +581,15 @@ class SPL(Measure):
     def _get_uuid(self, *args: Any, **kwargs: Any) -> str:
         return "spl"
 
+    def get_dependencies(self) -> List[str]:
+        return [DistanceToGoal.cls_uuid, Success.cls_uuid]
+
     def reset_metric(self, episode, task, *args: Any, **kwargs: Any):
         task.measurements.check_measure_dependencies(
-            self.uuid, [DistanceToGoal.cls_uuid, Success.cls_uuid]
+            self.uuid, self.get_dependencies()
         )
 
-        self._previous_position = self._sim.get_agent_state().position
+        self._previous_position = self._sim.get_cached_agent_state().position
         self._agent_episode_distance = 0.0
         self._start_end_episode_distance = task.measurements.measures[
             DistanceToGoal.cls_uuid
@@ -598,7 +606,7 @@ class SPL(Measure):
     ):
         ep_success = task.measurements.measures[Success.cls_uuid].get_metric()
 
-        current_position = self._sim.get_agent_state().position
+        current_position = self._sim.get_cached_agent_state().position
         self._agent_episode_distance += self._euclidean_distance(
             current_position, self._previous_position
         )
@@ -624,12 +632,15 @@ class SoftSPL(SPL):
     def _get_uuid(self, *args: Any, **kwargs: Any) -> str:
         return "softspl"
 
+    def get_dependencies(self) -> List[str]:
+        return [DistanceToGoal.cls_uuid]
+
     def reset_metric(self, episode, task, *args: Any, **kwargs: Any):
         task.measurements.check_measure_dependencies(
-            self.uuid, [DistanceToGoal.cls_uuid]
+            self.uuid, self.get_dependencies()
         )
 
-        self._previous_position = self._sim.get_agent_state().position
+        self._previous_position = self._sim.get_cached_agent_state().position
         self._agent_episode_distance = 0.0
         self._start_end_episode_distance = task.measurements.measures[
             DistanceToGoal.cls_uuid
@@ -637,7 +648,7 @@ class SoftSPL(SPL):
         self.update_metric(episode=episode, task=task, *args, **kwargs)  # type: ignore
 
     def update_metric(self, episode, task, *args: Any, **kwargs: Any):
-        current_position = self._sim.get_agent_state().position
+        current_position = self._sim.get_cached_agent_state().position
         distance_to_target = task.measurements.measures[
             DistanceToGoal.cls_uuid
         ].get_metric()
@@ -700,7 +711,10 @@ class TopDownMap(Measure):
         self._ind_y_min: Optional[int] = None
         self._ind_y_max: Optional[int] = None
         self._previous_xy_location: Optional[Tuple[int, int]] = None
+        self._drawn_line: Optional[Tuple] = None
         self._top_down_map: Optional[np.ndarray] = None
+        self._map_bounds: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._map_bounds_scene: Optional[str] = None
         self._shortest_path_points: Optional[List[Tuple[int, int]]] = None
         self.line_thickness = int(
             np.round(self._map_resolution * 2 / MAP_THICKNESS_SCALAR)
@@ -708,17 +722,32 @@ class TopDownMap(Measure):
         self.point_padding = 2 * int(
             np.ceil(self._map_resolution / MAP_THICKNESS_SCALAR)
         )
+        self._map_cache: Optional[maps.TopDownMapCache] = None
+        if config.MAP_CACHE_SIZE > 0 or config.MAP_CACHE_DIR:
+            self._map_cache = maps.TopDownMapCache(
+                max_size=config.MAP_CACHE_SIZE,
+                height_bucket_size=config.MAP_CACHE_HEIGHT_BUCKET,
+                cache_dir=config.MAP_CACHE_DIR or None,
+            )
         super().__init__()
 
     def _get_uuid(self, *args: Any, **kwargs: Any) -> str:
         return "top_down_map"
 
     def get_original_map(self):
-        top_down_map = maps.get_topdown_map_from_sim(
-            self._sim,
-            map_resolution=self._map_resolution,
-            draw_border=self._config.DRAW_BORDER,
-        )
+        if self._map_cache is not None:
+            top_down_map = self._map_cache.get(
+                self._sim,
+                self._sim.habitat_config.SCENE,
+                map_resolution=self._map_resolution,
+                draw_border=self._config.DRAW_BORDER,
+            )
+        else:
+            top_down_map = maps.get_topdown_map_from_sim(
+                self._sim,
+                map_resolution=self._map_resolution,
+                draw_border=self._config.DRAW_BORDER,
+            )
 
         if self._config.FOG_OF_WAR.DRAW:
             self._fog_of_war_mask = np.zeros_like(top_down_map)
@@ -732,8 +761,11 @@ class TopDownMap(Measure):
             position[2],
             position[0],
             self._top_down_map.shape[0:2],
-            sim=self._sim,
+            bounds=self._map_bounds,
         )
+        self._draw_grid_point(t_x, t_y, point_type)
+
+    def _draw_grid_point(self, t_x, t_y, point_type):
         self._top_down_map[
             t_x - self.point_padding : t_x + self.point_padding + 1,
             t_y - self.point_padding : t_y + self.point_padding + 1,
@@ -741,18 +773,28 @@ class TopDownMap(Measure):
 
     def _draw_goals_view_points(self, episode):
         if self._config.DRAW_VIEW_POINTS:
+            view_points = []
             for goal in episode.goals:
                 if self._is_on_same_floor(goal.position[1]):
                     try:
                         if goal.view_points is not None:
-                            for view_point in goal.view_points:
-                                self._draw_point(
-                                    view_point.agent_state.position,
-                                    maps.MAP_VIEW_POINT_INDICATOR,
-                                )
+                            view_points.extend(
+                                view_point.agent_state.position
+                                for view_point in goal.view_points
+                            )
                     except AttributeError:
                         pass
 
+            if len(view_points) == 0:
+                return
+            grid_points = maps.to_grid_batch(
+                np.array(view_points),
+                self._top_down_map.shape[0:2],
+                bounds=self._map_bounds,
+            )
+            for t_x, t_y in grid_points:
+                self._draw_grid_point(t_x, t_y, maps.MAP_VIEW_POINT_INDICATOR)
+
     def _draw_goals_positions(self, episode):
         if self._config.DRAW_GOAL_POSITIONS:
 
@@ -799,7 +841,7 @@ class TopDownMap(Measure):
                             p[2],
                             p[0],
                             self._top_down_map.shape[0:2],
-                            sim=self._sim,
+                            bounds=self._map_bounds,
                         )
                         for p in corners
                     ]
@@ -823,10 +865,12 @@ class TopDownMap(Measure):
                 )
             )
             self._shortest_path_points = [
-                maps.to_grid(
-                    p[2], p[0], self._top_down_map.shape[0:2], sim=self._sim
-                )
-                for p in _shortest_path_points
+                tuple(p)
+                for p in maps.to_grid_batch(
+                    np.array(_shortest_path_points),
+                    self._top_down_map.shape[0:2],
+                    bounds=self._map_bounds,
+                ).tolist()
             ]
             maps.draw_path(
                 self._top_down_map,
@@ -845,13 +889,18 @@ class TopDownMap(Measure):
     def reset_metric(self, episode, *args: Any, **kwargs: Any):
         self._step_count = 0
         self._metric = None
+        # The navmesh bounds only change with the scene
+        scene = self._sim.habitat_config.SCENE
+        if scene != self._map_bounds_scene:
+            self._map_bounds = maps.get_bounds(sim=self._sim)
+            self._map_bounds_scene = scene
         self._top_down_map = self.get_original_map()
-        agent_position = self._sim.get_agent_state().position
+        agent_position = self._sim.get_cached_agent_state().position
         a_x, a_y = maps.to_grid(
             agent_position[2],
             agent_position[0],
             self._top_down_map.shape[0:2],
-            sim=self._sim,
+            bounds=self._map_bounds,
         )
         self._previous_xy_location = (a_y, a_x)
 
@@ -871,19 +920,36 @@ class TopDownMap(Measure):
 
     def update_metric(self, episode, action, *args: Any, **kwargs: Any):
         self._step_count += 1
+        prev_fog_of_war_mask = self._fog_of_war_mask
         house_map, map_agent_x, map_agent_y = self.update_map(
-            self._sim.get_agent_state().position
+            self._sim.get_cached_agent_state().position
         )
 
-        self._metric = {
-            "map": house_map,
-            "fog_of_war_mask": self._fog_of_war_mask,
-            "agent_map_coord": (map_agent_x, map_agent_y),
-            "agent_angle": self.get_polar_angle(),
-        }
+        if not self._config.EMIT_DELTAS or self._step_count == 1:
+            self._metric = {
+                "map": house_map,
+                "fog_of_war_mask": self._fog_of_war_mask,
+            }
+        else:
+            # Only what changed since the last step is sent, the map is
+            # rebuilt with maps.TopDownMapReconstructor
+            revealed_fog_indices = None
+            if self._fog_of_war_mask is not None:
+                revealed_fog_indices = np.flatnonzero(
+                    self._fog_of_war_mask > prev_fog_of_war_mask
+                )
+            self._metric = {
+                "map_line": self._drawn_line,
+                "revealed_fog_indices": revealed_fog_indices,
+            }
+
+        if self._config.EMIT_DELTAS:
+            self._metric["step"] = self._step_count
+        self._metric["agent_map_coord"] = (map_agent_x, map_agent_y)
+        self._metric["agent_angle"] = self.get_polar_angle()
 
     def get_polar_angle(self):
-        agent_state = self._sim.get_agent_state()
+        agent_state = self._sim.get_cached_agent_state()
         # quaternion is in x, y, z, w format
         ref_rotation = agent_state.rotation
 
@@ -900,8 +966,9 @@ class TopDownMap(Measure):
             agent_position[2],
             agent_position[0],
             self._top_down_map.shape[0:2],
-            sim=self._sim,
+            bounds=self._map_bounds,
         )
+        self._drawn_line = None
         # Don't draw over the source point
         if self._top_down_map[a_x, a_y] != maps.MAP_SOURCE_POINT_INDICATOR:
             color = 10 + min(
@@ -916,6 +983,12 @@ class TopDownMap(Measure):
                 color,
                 thickness=thickness,
             )
+            self._drawn_line = (
+                self._previous_xy_location,
+                (a_y, a_x),
+                color,
+                thickness,
+            )
 
         self.update_fog_of_war_mask(np.array([a_x, a_y]))
 
@@ -972,7 +1045,7 @@ class DistanceToGoal(Measure):
     def update_metric(
         self, episode: NavigationEpisode, *args: Any, **kwargs: Any
     ):
-        current_position = self._sim.get_agent_state().position
+        current_position = self._sim.get_cached_agent_state().position
 
         if self._previous_position is None or not np.allclose(
             self._previous_position, current_position, atol=1e-4
@@ -25,7 +25,7 @@ class TargetPointGoalGPSAndCompassSensor(PointGoalSensor):
         super().__init__(*args, task=task, **kwargs)
 
     def get_observation(self, observations, episode, *args, **kwargs):
-        agent_state = self._sim.get_agent_state()
+        agent_state = self._sim.get_cached_agent_state()
         agent_position = agent_state.position
         rotation_world_agent = agent_state.rotation
 
@@ -573,12 +573,12 @@ class ForceTerminate(Measure):
     def _get_uuid(*args, **kwargs):
         return ForceTerminate.cls_uuid
 
+    def get_dependencies(self):
+        return [RobotForce.cls_uuid]
+
     def reset_metric(self, *args, episode, task, observations, **kwargs):
         task.measurements.check_measure_dependencies(
-            self.uuid,
-            [
-                RobotForce.cls_uuid,
-            ],
+            self.uuid, self.get_dependencies()
         )
 
         self.update_metric(
@@ -611,13 +611,12 @@ class RearrangeReward(Measure):
 
         super().__init__(*args, sim=sim, config=config, task=task, **kwargs)
 
+    def get_dependencies(self):
+        return [RobotForce.cls_uuid, ForceTerminate.cls_uuid]
+
     def reset_metric(self, *args, episode, task, observations, **kwargs):
         task.measurements.check_measure_dependencies(
-            self.uuid,
-            [
-                RobotForce.cls_uuid,
-                ForceTerminate.cls_uuid,
-            ],
+            self.uuid, self.get_dependencies()
         )
 
         self.update_metric(
@@ -421,6 +421,7 @@ class RearrangeSim(HabitatSim):
           TODO: This should probably be True by default, but I am not sure the effect
           it will have.
         """
+        self._agent_state_cache.clear()
         rom = self.get_rigid_object_manager()
         if state["robot_T"] is not None:
             self.robot.sim_obj.transformation = state["robot_T"]
@@ -452,6 +453,7 @@ class RearrangeSim(HabitatSim):
                 self.grasp_mgr.desnap(True)
 
     def step(self, action: Union[str, int]) -> Observations:
+        self._agent_state_cache.clear()
         rom = self.get_rigid_object_manager()
 
         self._update_markers()
@@ -475,7 +477,20 @@ class RearrangeSim(HabitatSim):
         self.viz_ids = defaultdict(lambda: None)
         self.grasp_mgr.update()
 
-        if self._concur_render:
+        # The debug camera is rendered separately after the debug
+        # visualizations are added
+        render_debug = (
+            self._render_enabled
+            and "robot_third_rgb" in self._sensor_suite.sensors
+            and "robot_third_rgb" not in self._skipped_sensor_uuids()
+        )
+
+        if not self._render_enabled:
+            for _ in range(self.ac_freq_ratio):
+                self.internal_step(-1)
+            # The observations of the last rendered step are reused
+            obs = self._sensor_suite.get_observations(self._prev_sim_obs)
+        elif self._concur_render and not self._skipped_sensor_uuids():
             self._prev_sim_obs = self.start_async_render()
 
             for _ in range(self.ac_freq_ratio):
@@ -488,11 +503,19 @@ class RearrangeSim(HabitatSim):
             for _ in range(self.ac_freq_ratio):
                 self.internal_step(-1)
             # self.internal_step(0.008 * self.ac_freq_ratio)
-            self._prev_sim_obs = self.get_sensor_observations()
+            uuids = None
+            if render_debug:
+                uuids = [
+                    uuid
+                    for uuid in self._sensor_suite.sensors
+                    if uuid != "robot_third_rgb"
+                    and uuid not in self._skipped_sensor_uuids()
+                ]
+            self._prev_sim_obs = self._get_step_sensor_observations(uuids)
             obs = self._sensor_suite.get_observations(self._prev_sim_obs)
 
         # TODO: Make debug cameras more flexible
-        if "robot_third_rgb" in obs:
+        if render_debug:
             self._should_render_debug = True
             self._try_acquire_context()
             for k, pos in add_back_viz_objs.items():
@@ -507,7 +530,10 @@ class RearrangeSim(HabitatSim):
                     True, rom.get_object_by_handle(obj_handle).object_id
                 )
 
-            debug_obs = self.get_sensor_observations()
+            debug_obs = self._get_step_sensor_observations(["robot_third_rgb"])
+            self._prev_sim_obs["robot_third_rgb"] = debug_obs[
+                "robot_third_rgb"
+            ]
             obs["robot_third_rgb"] = debug_obs["robot_third_rgb"][:, :, :3]
 
         if self.habitat_config.HABITAT_SIM_V0.get(
@@ -31,14 +31,16 @@ class RearrangePickReward(RearrangeReward):
     def _get_uuid(*args, **kwargs):
         return RearrangePickReward.cls_uuid
 
+    def get_dependencies(self):
+        return [
+            EndEffectorToObjectDistance.cls_uuid,
+            RobotForce.cls_uuid,
+            ForceTerminate.cls_uuid,
+        ]
+
     def reset_metric(self, *args, episode, task, observations, **kwargs):
         task.measurements.check_measure_dependencies(
-            self.uuid,
-            [
-                EndEffectorToObjectDistance.cls_uuid,
-                RobotForce.cls_uuid,
-                ForceTerminate.cls_uuid,
-            ],
+            self.uuid, self.get_dependencies()
         )
         self.cur_dist = -1.0
         self._prev_picked = self._sim.grasp_mgr.snap_idx is not None
@@ -146,9 +148,12 @@ class RearrangePickSuccess(Measure):
     def _get_uuid(*args, **kwargs):
         return RearrangePickSuccess.cls_uuid
 
+    def get_dependencies(self):
+        return [EndEffectorToObjectDistance.cls_uuid]
+
     def reset_metric(self, *args, episode, task, observations, **kwargs):
         task.measurements.check_measure_dependencies(
-            self.uuid, [EndEffectorToObjectDistance.cls_uuid]
+            self.uuid, self.get_dependencies()
         )
         self._prev_ee_pos = observations["ee_pos"]
         self.update_metric(
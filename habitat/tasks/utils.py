@@ -37,7 +37,8 @@ def quaternion_to_rotation(q_r, q_i, q_j, q_k):
 
 
 def cartesian_to_polar(x, y):
-    rho = np.sqrt(x ** 2 + y ** 2)
+    r"""Works on scalars as well as on arrays of coordinates."""
+    rho = np.hypot(x, y)
     phi = np.arctan2(y, x)
     return rho, phi
 
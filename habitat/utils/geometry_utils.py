@@ -49,10 +49,7 @@ def quaternion_to_list(q: np.quaternion):
 
 def quaternion_from_coeff(coeffs: np.ndarray) -> np.quaternion:
     r"""Creates a quaternions from coeffs in [x, y, z, w] format"""
-    quat = np.quaternion(0, 0, 0, 0)
-    quat.real = coeffs[3]
-    quat.imag = coeffs[0:3]
-    return quat
+    return np.quaternion(coeffs[3], coeffs[0], coeffs[1], coeffs[2])
 
 
 def quaternion_rotate_vector(quat: np.quaternion, v: np.array) -> np.array:
@@ -68,6 +65,48 @@ def quaternion_rotate_vector(quat: np.quaternion, v: np.array) -> np.array:
     return (quat * vq * quat.inverse()).imag
 
 
+def quaternions_from_coeffs(coeffs: np.ndarray) -> np.ndarray:
+    r"""Creates an array of quaternions from an (..., 4) array of coeffs in
+    [x, y, z, w] format
+    """
+    return quaternion.from_float_array(np.roll(coeffs, 1, axis=-1))
+
+
+def quaternions_to_coeffs(quats: np.ndarray) -> np.ndarray:
+    r"""Returns the (..., 4) array of coeffs in [x, y, z, w] format of an
+    array of quaternions
+    """
+    return np.roll(quaternion.as_float_array(quats), -1, axis=-1)
+
+
+def quaternions_rotate_vectors(
+    coeffs: np.ndarray, vectors: np.ndarray, inverse: bool = False
+) -> np.ndarray:
+    r"""Batched version of :ref:`quaternion_rotate_vector`.
+
+    Args:
+        coeffs: (N, 4) array of the quaternions to rotate by, in
+            [x, y, z, w] format
+        vectors: (N, 3) or (3,) array of the vectors to rotate
+        inverse: Rotate by the inverse of the quaternions instead
+    Returns:
+        np.array: (N, 3) array of the rotated vectors
+    """
+    coeffs = np.asarray(coeffs, dtype=np.float64)
+    vectors = np.asarray(vectors, dtype=np.float64)
+    u = coeffs[..., :3]
+    w = coeffs[..., 3:]
+    if inverse:
+        u = -u
+
+    norm = np.sum(coeffs * coeffs, axis=-1, keepdims=True)
+    rotated = (w * w - np.sum(u * u, axis=-1, keepdims=True)) * vectors
+    rotated += 2 * np.sum(u * vectors, axis=-1, keepdims=True) * u
+    rotated += 2 * w * np.cross(u, vectors)
+    rotated /= norm
+    return rotated
+
+
 def agent_state_target2ref(
     ref_agent_state: Union[List, Tuple], target_agent_state: Union[List, Tuple]
 ) -> Tuple[np.quaternion, np.array]:
@@ -4,6 +4,8 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+from functools import lru_cache
+
 import numba
 import numpy as np
 
@@ -119,6 +121,36 @@ def _draw_loop(
         )
 
 
+@lru_cache(maxsize=8)
+def get_ray_table(max_line_len: float) -> np.ndarray:
+    r"""Returns the cells of the fog-of-war lines in all directions around
+    the origin, with an angle step such that delta_angle * max_line_len = 1
+
+    Returns:
+        A :py:`(num_rays, max_num_cells, 2)` array with the offsets of the
+        cells of each line, in the order they are visited, padded with the
+        last cell of the line
+    """
+    angles = np.arange(0, 2 * np.pi, step=1.0 / max_line_len)
+    origin = np.zeros(2)
+    rays = [
+        np.array(
+            bresenham_supercover_line(
+                origin,
+                max_line_len * np.array([np.cos(angle), np.sin(angle)]),
+            )
+        )
+        for angle in angles
+    ]
+    max_num_cells = max(len(ray) for ray in rays)
+    ray_table = np.empty((len(rays), max_num_cells, 2), dtype=np.int32)
+    for i, ray in enumerate(rays):
+        ray_table[i, : len(ray)] = ray
+        ray_table[i, len(ray) :] = ray[-1]
+
+    return ray_table
+
+
 def reveal_fog_of_war(
     top_down_map: np.ndarray,
     current_fog_of_war_mask: np.ndarray,
@@ -129,8 +161,68 @@ def reveal_fog_of_war(
 ) -> np.ndarray:
     r"""Reveals the fog-of-war at the current location
 
+    This works by drawing lines from the agents current location and
+    stopping once a wall is hit.  The lines are taken from a precomputed
+    table (see :ref:`get_ray_table`) and all of them are walked at once.
+
+    Args:
+        top_down_map: The current top down map.  Used for respecting walls when revealing
+        current_fog_of_war_mask: The current fog-of-war mask to reveal the fog-of-war on
+        current_point: The current location of the agent on the fog_of_war_mask
+        current_angle: The current look direction of the agent on the fog_of_war_mask
+        fov: The feild of view of the agent
+        max_line_len: The maximum length of the lines used to reveal the fog-of-war
+
+    Returns:
+        The updated fog_of_war_mask
+    """
+    ray_table = get_ray_table(float(max_line_len))
+    num_rays = ray_table.shape[0]
+    angle_step = 1.0 / max_line_len
+
+    # The lines of the table within the field of view
+    fov = np.deg2rad(fov)
+    num_fov_rays = len(np.arange(-fov / 2, fov / 2, step=angle_step))
+    first_ray = int(
+        np.ceil(((current_angle - fov / 2) % (2 * np.pi)) / angle_step)
+    )
+    rays = ray_table[(first_ray + np.arange(num_fov_rays)) % num_rays]
+
+    xs = rays[..., 0] + current_point[0]
+    ys = rays[..., 1] + current_point[1]
+    in_bounds = (
+        (xs >= 0)
+        & (xs < top_down_map.shape[0])
+        & (ys >= 0)
+        & (ys < top_down_map.shape[1])
+    )
+    np.clip(xs, 0, top_down_map.shape[0] - 1, out=xs)
+    np.clip(ys, 0, top_down_map.shape[1] - 1, out=ys)
+
+    # A cell is visible if no cell before it on its line is out of the
+    # map or invalid
+    visible = in_bounds & (top_down_map[xs, ys] != maps.MAP_INVALID_POINT)
+    np.logical_and.accumulate(visible, axis=1, out=visible)
+
+    fog_of_war_mask = current_fog_of_war_mask.copy()
+    fog_of_war_mask[xs[visible], ys[visible]] = 1
+
+    return fog_of_war_mask
+
+
+def reveal_fog_of_war_by_lines(
+    top_down_map: np.ndarray,
+    current_fog_of_war_mask: np.ndarray,
+    current_point: np.ndarray,
+    current_angle: float,
+    fov: float = 90,
+    max_line_len: float = 100,
+) -> np.ndarray:
+    r"""Reveals the fog-of-war at the current location
+
     This works by simply drawing lines from the agents current location
-    and stopping once a wall is hit
+    and stopping once a wall is hit, one line at a time.  Same as
+    :ref:`reveal_fog_of_war` without the precomputed lines
 
     Args:
         top_down_map: The current top down map.  Used for respecting walls when revealing
@@ -4,7 +4,9 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import hashlib
 import os
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import imageio
@@ -185,27 +187,46 @@ def pointnav_draw_target_birdseye_view(
     return im_position
 
 
+def get_bounds(
+    sim: Optional["HabitatSim"] = None, pathfinder=None
+) -> Tuple[np.ndarray, np.ndarray]:
+    r"""Return the lower and upper bounds of the navmesh, to be passed to
+    the conversions between real world and gridworld coordinates instead of
+    a simulator or pathfinder so that they are only retrieved once per
+    scene.
+    """
+    if sim is None and pathfinder is None:
+        raise RuntimeError(
+            "Must provide either a simulator or pathfinder instance"
+        )
+
+    if pathfinder is None:
+        pathfinder = sim.pathfinder
+
+    lower_bound, upper_bound = pathfinder.get_bounds()
+    return (
+        np.array(lower_bound, dtype=np.float64),
+        np.array(upper_bound, dtype=np.float64),
+    )
+
+
 def to_grid(
     realworld_x: float,
     realworld_y: float,
     grid_resolution: Tuple[int, int],
     sim: Optional["HabitatSim"] = None,
     pathfinder=None,
+    bounds: Optional[Tuple[np.ndarray, np.ndarray]] = None,
 ) -> Tuple[int, int]:
     r"""Return gridworld index of realworld coordinates assuming top-left corner
     is the origin. The real world coordinates of lower left corner are
     (coordinate_min, coordinate_min) and of top right corner are
     (coordinate_max, coordinate_max)
     """
-    if sim is None and pathfinder is None:
-        raise RuntimeError(
-            "Must provide either a simulator or pathfinder instance"
-        )
-
-    if pathfinder is None:
-        pathfinder = sim.pathfinder
-
-    lower_bound, upper_bound = pathfinder.get_bounds()
+    if bounds is not None:
+        lower_bound, upper_bound = bounds
+    else:
+        lower_bound, upper_bound = get_bounds(sim, pathfinder)
 
     grid_size = (
         abs(upper_bound[2] - lower_bound[2]) / grid_resolution[0],
@@ -222,22 +243,17 @@ def from_grid(
     grid_resolution: Tuple[int, int],
     sim: Optional["HabitatSim"] = None,
     pathfinder=None,
+    bounds: Optional[Tuple[np.ndarray, np.ndarray]] = None,
 ) -> Tuple[float, float]:
     r"""Inverse of _to_grid function. Return real world coordinate from
     gridworld assuming top-left corner is the origin. The real world
     coordinates of lower left corner are (coordinate_min, coordinate_min) and
     of top right corner are (coordinate_max, coordinate_max)
     """
-
-    if sim is None and pathfinder is None:
-        raise RuntimeError(
-            "Must provide either a simulator or pathfinder instance"
-        )
-
-    if pathfinder is None:
-        pathfinder = sim.pathfinder
-
-    lower_bound, upper_bound = pathfinder.get_bounds()
+    if bounds is not None:
+        lower_bound, upper_bound = bounds
+    else:
+        lower_bound, upper_bound = get_bounds(sim, pathfinder)
 
     grid_size = (
         abs(upper_bound[2] - lower_bound[2]) / grid_resolution[0],
@@ -248,6 +264,56 @@ def from_grid(
     return realworld_x, realworld_y
 
 
+def to_grid_batch(
+    points: np.ndarray,
+    grid_resolution: Tuple[int, int],
+    sim: Optional["HabitatSim"] = None,
+    pathfinder=None,
+    bounds: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> np.ndarray:
+    r"""Batched version of :ref:`to_grid`.
+
+    :param points: :py:`(N, 3)` array of real world points.
+    :return: :py:`(N, 2)` array of the gridworld indices of the points.
+    """
+    if bounds is None:
+        bounds = get_bounds(sim, pathfinder)
+    lower_bound, upper_bound = bounds
+
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    # The z and x coordinates of the points are the grid x and y
+    lower_bound = lower_bound[[2, 0]]
+    grid_size = np.abs(upper_bound[[2, 0]] - lower_bound) / np.array(
+        grid_resolution[:2]
+    )
+    return ((points[:, [2, 0]] - lower_bound) / grid_size).astype(np.int64)
+
+
+def from_grid_batch(
+    grid_points: np.ndarray,
+    grid_resolution: Tuple[int, int],
+    sim: Optional["HabitatSim"] = None,
+    pathfinder=None,
+    bounds: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> np.ndarray:
+    r"""Batched version of :ref:`from_grid`.
+
+    :param grid_points: :py:`(N, 2)` array of gridworld indices.
+    :return: :py:`(N, 2)` array of the real world coordinates of the
+        indices, in the same order as the output of :ref:`from_grid`.
+    """
+    if bounds is None:
+        bounds = get_bounds(sim, pathfinder)
+    lower_bound, upper_bound = bounds
+
+    grid_points = np.asarray(grid_points).reshape(-1, 2)
+    lower_bound = lower_bound[[2, 0]]
+    grid_size = np.abs(upper_bound[[2, 0]] - lower_bound) / np.array(
+        grid_resolution[:2]
+    )
+    return lower_bound + grid_points * grid_size
+
+
 def _outline_border(top_down_map):
     left_right_block_nav = (top_down_map[:, :-1] == 1) & (
         top_down_map[:, :-1] != top_down_map[:, 1:]
@@ -346,6 +412,153 @@ def get_topdown_map_from_sim(
     )
 
 
+class TopDownMapCache:
+    r"""Cache of the top-down maps of :py:`get_topdown_map_from_sim`, keyed
+    by the scene, the floor height (in buckets of :p:`height_bucket_size`
+    meters), the map resolution and whether the border is drawn.
+
+    :param max_size: The number of maps kept in memory, the least recently
+        used map is evicted first.
+    :param height_bucket_size: Agent heights in the same bucket share the
+        same map.
+    :param cache_dir: If set, the maps are also saved to and loaded from
+        this directory, so they are shared between processes and runs.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 8,
+        height_bucket_size: float = 0.1,
+        cache_dir: Optional[str] = None,
+    ) -> None:
+        self.max_size = max_size
+        self.height_bucket_size = height_bucket_size
+        self.cache_dir = cache_dir
+        self._maps: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self.num_hits = 0
+        self.num_misses = 0
+
+    def _cache_path(self, key: Tuple) -> str:
+        scene_name = os.path.splitext(os.path.basename(key[0]))[0]
+        key_hash = hashlib.md5(repr(key).encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{scene_name}_{key_hash}.npy")
+
+    def _load_or_compute(
+        self,
+        key: Tuple,
+        sim: "HabitatSim",
+        map_resolution: int,
+        draw_border: bool,
+        agent_id: int,
+    ) -> np.ndarray:
+        path = None
+        if self.cache_dir:
+            path = self._cache_path(key)
+            if os.path.exists(path):
+                return np.load(path)
+
+        top_down_map = get_topdown_map_from_sim(
+            sim,
+            map_resolution=map_resolution,
+            draw_border=draw_border,
+            agent_id=agent_id,
+        )
+
+        if path is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temporary file first so that concurrent readers
+            # never see a partially written map
+            tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+            np.save(tmp_path, top_down_map)
+            os.replace(tmp_path, path)
+
+        return top_down_map
+
+    def get(
+        self,
+        sim: "HabitatSim",
+        scene_id: str,
+        map_resolution: int = 1024,
+        draw_border: bool = True,
+        agent_id: int = 0,
+    ) -> np.ndarray:
+        r"""Returns a copy of the top-down map of :p:`scene_id` at the
+        floor of the agent, computing it only if it is not cached.
+        """
+        height = sim.get_agent(agent_id).state.position[1]
+        key = (
+            scene_id,
+            int(np.floor(height / self.height_bucket_size)),
+            map_resolution,
+            draw_border,
+        )
+
+        top_down_map = self._maps.get(key)
+        if top_down_map is not None:
+            self.num_hits += 1
+            self._maps.move_to_end(key)
+        else:
+            self.num_misses += 1
+            top_down_map = self._load_or_compute(
+                key, sim, map_resolution, draw_border, agent_id
+            )
+            self._maps[key] = top_down_map
+            while len(self._maps) > self.max_size:
+                self._maps.popitem(last=False)
+
+        return top_down_map.copy()
+
+
+class TopDownMapReconstructor:
+    r"""Rebuilds the output of the TopDownMap measure when it only emits
+    the changes of every step (``EMIT_DELTAS``). :ref:`update` must be
+    called with the output of the measure on every step of an episode.
+    """
+
+    def __init__(self) -> None:
+        self._map: Optional[np.ndarray] = None
+        self._fog_of_war_mask: Optional[np.ndarray] = None
+        self._step: Optional[int] = None
+
+    def update(self, topdown_map_info: Dict[str, Any]) -> Dict[str, Any]:
+        r"""Applies the output of one step of the TopDownMap measure and
+        returns the full output, with the map and the fog-of-war mask.
+        """
+        if "map" in topdown_map_info:
+            self._map = np.array(topdown_map_info["map"], copy=True)
+            fog_of_war_mask = topdown_map_info["fog_of_war_mask"]
+            self._fog_of_war_mask = (
+                None
+                if fog_of_war_mask is None
+                else np.array(fog_of_war_mask, copy=True)
+            )
+        else:
+            step = topdown_map_info["step"]
+            if self._step is None or step != self._step + 1:
+                raise RuntimeError(
+                    f"Top-down map of step {step} received after step"
+                    f" {self._step}, the output of every step is needed"
+                    " to rebuild the map"
+                )
+
+            map_line = topdown_map_info["map_line"]
+            if map_line is not None:
+                start, end, color, thickness = map_line
+                cv2.line(self._map, start, end, color, thickness=thickness)
+
+            revealed_fog_indices = topdown_map_info["revealed_fog_indices"]
+            if revealed_fog_indices is not None:
+                self._fog_of_war_mask.flat[revealed_fog_indices] = 1
+
+        self._step = topdown_map_info.get("step")
+        return {
+            "map": self._map,
+            "fog_of_war_mask": self._fog_of_war_mask,
+            "agent_map_coord": topdown_map_info["agent_map_coord"],
+            "agent_angle": topdown_map_info["agent_angle"],
+        }
+
+
 def colorize_topdown_map(
     top_down_map: np.ndarray,
     fog_of_war_mask: Optional[np.ndarray] = None,
@@ -390,15 +603,18 @@ def draw_path(
         path_points: list of points that specify the path to be drawn
         thickness: thickness of the path.
     """
-    for prev_pt, next_pt in zip(path_points[:-1], path_points[1:]):
-        # Swapping x y
-        cv2.line(
-            top_down_map,
-            prev_pt[::-1],
-            next_pt[::-1],
-            color,
-            thickness=thickness,
-        )
+    if len(path_points) < 2:
+        return
+
+    # Swapping x y
+    path_points = np.asarray(path_points, dtype=np.int32)[:, ::-1]
+    cv2.polylines(
+        top_down_map,
+        [np.ascontiguousarray(path_points)],
+        False,
+        color,
+        thickness=thickness,
+    )
 
 
 def colorize_draw_agent_and_fit_to_height(
@@ -218,6 +218,132 @@ class CenterCropper(ObservationTransformer):
         )
 
 
+def _area_interpolation_weights(
+    in_size: int, out_size: int, device: torch.device, dtype: torch.dtype
+) -> torch.Tensor:
+    r"""The (out_size, in_size) matrix that computes area interpolation,
+    i.e. adaptive average pooling, along one dimension.
+    """
+    idxs = torch.arange(out_size, dtype=torch.float64)
+    starts = torch.floor(idxs * in_size / out_size).long()
+    ends = torch.ceil((idxs + 1) * in_size / out_size).long()
+    positions = torch.arange(in_size)
+    weights = (
+        (positions[None] >= starts[:, None])
+        & (positions[None] < ends[:, None])
+    ).to(torch.float64)
+    weights /= (ends - starts).to(torch.float64)[:, None]
+    return weights.to(device=device, dtype=dtype)
+
+
+@baseline_registry.register_obs_transformer()
+class ResizeCenterCrop(ObservationTransformer):
+    r"""Does the same as :ref:`ResizeShortestEdge` followed by
+    :ref:`CenterCropper`, in a single pass.
+
+    Area interpolation is linear, so resizing and then cropping is two
+    matrix products with the rows of the interpolation weights that are
+    kept by the crop, restricted to the input pixels they read.  The
+    weights are cached per input size, device and dtype.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        crop_size: Union[int, Tuple[int, int]],
+        channels_last: bool = True,
+        trans_keys: Tuple[str] = ("rgb", "depth", "semantic"),
+    ):
+        super().__init__()
+        self._resize = ResizeShortestEdge(size, channels_last, trans_keys)
+        self._crop = CenterCropper(crop_size, channels_last, trans_keys)
+        self.channels_last = channels_last
+        self.trans_keys = trans_keys
+        self._weights_cache: Dict[
+            Tuple, Optional[Tuple[slice, torch.Tensor, slice, torch.Tensor]]
+        ] = {}
+
+    def transform_observation_space(self, observation_space: spaces.Dict):
+        return self._crop.transform_observation_space(
+            self._resize.transform_observation_space(observation_space)
+        )
+
+    def _get_weights(
+        self, h: int, w: int, device: torch.device, dtype: torch.dtype
+    ) -> Optional[Tuple[slice, torch.Tensor, slice, torch.Tensor]]:
+        key = (h, w, device, dtype)
+        if key not in self._weights_cache:
+            scale = self._resize._size / min(h, w)
+            new_h, new_w = int(h * scale), int(w * scale)
+            crop_h, crop_w = self._crop._size
+            if crop_h > new_h or crop_w > new_w:
+                # Nothing to gain when the crop is larger than the image
+                self._weights_cache[key] = None
+            else:
+                weights = []
+                for in_size, out_size, crop in (
+                    (h, new_h, crop_h),
+                    (w, new_w, crop_w),
+                ):
+                    start = out_size // 2 - crop // 2
+                    axis_weights = _area_interpolation_weights(
+                        in_size, out_size, device, dtype
+                    )[start : start + crop]
+                    used = torch.nonzero(axis_weights.sum(0)).view(-1)
+                    roi = slice(int(used[0]), int(used[-1]) + 1)
+                    weights += [roi, axis_weights[:, roi].contiguous()]
+
+                self._weights_cache[key] = tuple(weights)
+
+        return self._weights_cache[key]
+
+    def _transform_obs(self, obs: torch.Tensor) -> torch.Tensor:
+        if self._resize._size is None:
+            return self._crop._transform_obs(obs)
+        elif obs.dim() != 4:
+            return self._crop._transform_obs(self._resize._transform_obs(obs))
+
+        h, w = get_image_height_width(obs, channels_last=self.channels_last)
+        weights = self._get_weights(h, w, obs.device, torch.float32)
+        if weights is None:
+            return self._crop._transform_obs(self._resize._transform_obs(obs))
+
+        rows, row_weights, cols, col_weights = weights
+        if self.channels_last:
+            x = obs[:, rows, cols].float()
+            x = torch.einsum("ih,nhwc->niwc", row_weights, x)
+            x = torch.einsum("jw,niwc->nijc", col_weights, x)
+        else:
+            x = obs[:, :, rows, cols].float()
+            x = torch.matmul(torch.matmul(row_weights, x), col_weights.t())
+
+        return x.to(dtype=obs.dtype)
+
+    @torch.no_grad()
+    def forward(
+        self, observations: Dict[str, torch.Tensor]
+    ) -> Dict[str, torch.Tensor]:
+        observations.update(
+            {
+                sensor: self._transform_obs(observations[sensor])
+                for sensor in self.trans_keys
+                if sensor in observations
+            }
+        )
+        return observations
+
+    @classmethod
+    def from_config(cls, config: Config):
+        obs_transforms_config = config.RL.POLICY.OBS_TRANSFORMS
+        return cls(
+            obs_transforms_config.RESIZE_SHORTEST_EDGE.SIZE,
+            (
+                obs_transforms_config.CENTER_CROPPER.HEIGHT,
+                obs_transforms_config.CENTER_CROPPER.WIDTH,
+            ),
+        )
+
+
 class _DepthFrom(Enum):
     Z_VAL = 0
     OPTI_CENTER = 1
@@ -633,10 +759,19 @@ class ProjectionConverter(nn.Module):
             self.output_models, inverse=True
         )
 
-        # grids shape: (output_len, input_len, output_img_h, output_img_w, 2)
+        # grids shape: (input_len, output_len, output_img_h, output_img_w, 2)
         self.grids = self.generate_grid()
-        # _grids_cache shape: (batch_size*output_len*input_len, output_img_h, output_img_w, 2)
-        self._grids_cache = None
+        # face_index_maps shape: (output_len, output_img_h, output_img_w)
+        # The input image each output pixel is sampled from, -1 if none
+        assigned = (self.grids != 2).any(-1)
+        self.face_index_maps = torch.where(
+            assigned.any(0),
+            assigned.long().argmax(0),
+            torch.full_like(assigned[0], -1, dtype=torch.long),
+        )
+        # Grids into the input images stacked along the height, cached per
+        # (input_h, input_w, device, dtype)
+        self._stacked_grids_cache: Dict[Tuple, torch.Tensor] = {}
 
     def _generate_grid_one_output(
         self, output_model: CameraProjection
@@ -665,27 +800,43 @@ class ProjectionConverter(nn.Module):
         multi_output_grids = torch.cat(multi_output_grids, dim=1)
         return multi_output_grids  # input_len, output_len, output_img_h, output_img_w, 2
 
-    def _convert(self, batch: torch.Tensor) -> torch.Tensor:
-        """Takes a batch of images stacked in proper order and converts thems,
-        reduces batch size by input_len."""
-        batch_size, ch, _H, _W = batch.shape
-        out_h, out_w = self.output_models[0].size()
-        if batch_size == 0 or batch_size % self.input_len != 0:
-            raise ValueError(f"Batch size should be {self.input_len}x")
-        output = torch.nn.functional.grid_sample(
-            batch,
-            self._grids_cache,
-            align_corners=True,
-            padding_mode="zeros",
-        )
-        output = output.view(
-            batch_size // self.input_len,
-            self.input_len,
-            ch,
-            out_h,
-            out_w,
-        ).sum(dim=1)
-        return output  # output_len * batch_size, ch, output_model.img_h, output_model.img_w
+    def _get_stacked_grid(
+        self, in_h: int, in_w: int, device: torch.device, dtype: torch.dtype
+    ) -> torch.Tensor:
+        r"""Returns the grid that samples every output pixel from its input
+        image only, when the input images are stacked along the height.
+
+        Sampling inside an image never reads the neighbouring image (with
+        align_corners, the last row has a weight of one), so this is the
+        same as sampling every input image and summing the results.
+        """
+        key = (in_h, in_w, device, dtype)
+        if key not in self._stacked_grids_cache:
+            out_h, out_w = self.output_models[0].size()
+            face_idxs = self.face_index_maps.clamp(min=0)
+            # (output_len, out_h, out_w, 2)
+            grid = torch.gather(
+                self.grids,
+                0,
+                face_idxs[None, ..., None].expand(1, -1, -1, -1, 2),
+            )[0]
+            grid_x = grid[..., 0]
+            # Position in pixels in the stacked images then normalized
+            grid_y = (
+                face_idxs * in_h
+                + (grid[..., 1].clamp(-1, 1) + 1) / 2 * (in_h - 1)
+            ) / (self.input_len * in_h - 1) * 2 - 1
+            grid = torch.stack([grid_x, grid_y], -1)
+            # Values bigger than one will be ignored by grid_sample
+            grid[self.face_index_maps < 0] = 2
+
+            self._stacked_grids_cache[key] = (
+                grid.view(1, self.output_len * out_h, out_w, 2)
+                .to(device=device, dtype=dtype)
+                .contiguous()
+            )
+
+        return self._stacked_grids_cache[key]
 
     def to_converted_tensor(self, batch: torch.Tensor) -> torch.Tensor:
         """Convert tensors based on projection models. If there are two
@@ -704,30 +855,28 @@ class ProjectionConverter(nn.Module):
         # How many sets of input.
         num_input_set = batch_size // self.input_len
 
-        # to(device) is a NOOP after the first call
-        self.grids = self.grids.to(batch.device)
+        grid = self._get_stacked_grid(in_h, in_w, batch.device, batch.dtype)
 
-        # Adjust batch for multiple outputs
-        # batch must be [1st batch * output_len, 2nd batch * output_len, ...]
-        # not that [1st batch, 2nd batch, ...] * output_len
-        multi_out_batch = (
+        # Stack the input images of every set along the height so that each
+        # output pixel is a single sample
+        stacked_batch = (
             batch.view(num_input_set, self.input_len, ch, in_h, in_w)
-            .repeat(1, self.output_len, 1, 1, 1)
-            .view(self.output_len * batch_size, ch, in_h, in_w)
+            .transpose(1, 2)
+            .reshape(num_input_set, ch, self.input_len * in_h, in_w)
+        )
+        output = torch.nn.functional.grid_sample(
+            stacked_batch,
+            grid.expand(num_input_set, -1, -1, -1),
+            align_corners=True,
+            padding_mode="zeros",
         )
 
-        # Cache the repeated grids for subsequent batches
-        if (
-            self._grids_cache is None
-            or self._grids_cache.size()[0] != multi_out_batch.size()[0]
-        ):
-            # batch size is more than one
-            self._grids_cache = self.grids.repeat(
-                num_input_set, 1, 1, 1, 1
-            ).view(batch_size * self.output_len, out_h, out_w, 2)
-        self._grids_cache = self._grids_cache.to(batch.device)
-
-        return self._convert(multi_out_batch)
+        # The outputs are stacked along the height as well
+        return (
+            output.view(num_input_set, ch, self.output_len, out_h, out_w)
+            .transpose(1, 2)
+            .reshape(num_input_set * self.output_len, ch, out_h, out_w)
+        )  # output_len * batch_size, ch, output_model.img_h, output_model.img_w
 
     def calculate_zfactor(
         self, projections: List[CameraProjection], inverse: bool = False
@@ -1203,9 +1352,42 @@ def get_active_obs_transforms(config: Config) -> List[ObservationTransformer]:
             )
             obs_transform = obs_trans_cls.from_config(config)
             active_obs_transforms.append(obs_transform)
+
+        if config.RL.POLICY.OBS_TRANSFORMS.get("FUSE_TRANSFORMS", False):
+            active_obs_transforms = fuse_obs_transforms(active_obs_transforms)
     return active_obs_transforms
 
 
+def fuse_obs_transforms(
+    obs_transforms: Iterable[ObservationTransformer],
+) -> List[ObservationTransformer]:
+    r"""Replaces every :ref:`ResizeShortestEdge` directly followed by a
+    :ref:`CenterCropper` of the same sensors with a :ref:`ResizeCenterCrop`.
+    """
+    fused: List[ObservationTransformer] = []
+    for obs_transform in obs_transforms:
+        if (
+            isinstance(obs_transform, CenterCropper)
+            and len(fused) > 0
+            and type(fused[-1]) is ResizeShortestEdge
+            and fused[-1].channels_last == obs_transform.channels_last
+            and tuple(fused[-1].trans_keys) == tuple(obs_transform.trans_keys)
+        ):
+            resize = fused.pop()
+            fused.append(
+                ResizeCenterCrop(
+                    resize._size,
+                    obs_transform._size,
+                    obs_transform.channels_last,
+                    obs_transform.trans_keys,
+                )
+            )
+        else:
+            fused.append(obs_transform)
+
+    return fused
+
+
 def apply_obs_transforms_batch(
     batch: Dict[str, torch.Tensor],
     obs_transforms: Iterable[ObservationTransformer],
@@ -1215,6 +1397,34 @@ def apply_obs_transforms_batch(
     return batch
 
 
+class SingleObservationTransforms:
+    r"""Applies observation transformers to the observations of a single
+    environment, i.e. in the :ref:`habitat.VectorEnv` workers (see its
+    :p:`obs_transform`) so that the transformed, and typically smaller,
+    observations are what is sent to the trainer.
+
+    The observation space the trainer sees is still given by
+    :ref:`apply_obs_transforms_obs_space`.
+    """
+
+    def __init__(self, obs_transforms: Iterable[ObservationTransformer]):
+        self.obs_transforms = list(obs_transforms)
+
+    @torch.no_grad()
+    def __call__(self, observations: Dict[str, np.ndarray]):
+        # Only arrays can be transformed
+        batch = {
+            k: torch.from_numpy(v).unsqueeze(0)
+            for k, v in observations.items()
+            if isinstance(v, np.ndarray)
+        }
+        batch = apply_obs_transforms_batch(batch, self.obs_transforms)
+        for k, v in batch.items():
+            observations[k] = v[0].numpy()
+
+        return observations
+
+
 def apply_obs_transforms_obs_space(
     obs_space: spaces.Dict, obs_transforms: Iterable[ObservationTransformer]
 ) -> spaces.Dict:
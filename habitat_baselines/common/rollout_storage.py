@@ -5,16 +5,141 @@
 # LICENSE file in the root directory of this source tree.
 
 import warnings
-from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 
 import numpy as np
 import torch
+from gym import spaces
 
 from habitat_baselines.common.tensor_dict import TensorDict
 
+OBSERVATION_CODECS = ("uint8", "float16", "uint16", "dedup")
+
+
+class _ObservationCodec:
+    r"""Stores an observation as a more compact dtype and converts it back
+    to the dtype of its observation space when it is read.
+    """
+
+    def __init__(self, space: spaces.Box, storage_dtype: torch.dtype):
+        self.decoded_dtype = torch.from_numpy(np.zeros((), space.dtype)).dtype
+        self.storage_dtype = storage_dtype
+
+    def encode(self, x: torch.Tensor) -> torch.Tensor:
+        return x.to(dtype=self.storage_dtype)
+
+    def decode(self, x: torch.Tensor) -> torch.Tensor:
+        return x.to(dtype=self.decoded_dtype)
+
+
+class _Uint8Codec(_ObservationCodec):
+    def __init__(self, space: spaces.Box):
+        super().__init__(space, torch.uint8)
+
+    def encode(self, x: torch.Tensor) -> torch.Tensor:
+        return torch.round(x).clamp_(0, 255).to(dtype=torch.uint8)
+
+
+class _Uint16Codec(_ObservationCodec):
+    r"""Quantizes the [low, high] range of the observation space to 2^16
+    levels. The levels are stored as int16 as torch has little support
+    for uint16.
+    """
+
+    def __init__(self, space: spaces.Box):
+        super().__init__(space, torch.int16)
+        self._low = float(np.min(space.low))
+        self._scale = (float(np.max(space.high)) - self._low) / 65535.0
+
+    def encode(self, x: torch.Tensor) -> torch.Tensor:
+        return (
+            torch.round((x - self._low) / self._scale)
+            .clamp_(0, 65535)
+            .sub_(32768)
+            .to(dtype=torch.int16)
+        )
+
+    def decode(self, x: torch.Tensor) -> torch.Tensor:
+        return (
+            x.to(dtype=self.decoded_dtype) + 32768
+        ) * self._scale + self._low
+
+
+def _make_observation_codec(
+    codec: str, space: spaces.Box
+) -> _ObservationCodec:
+    if codec == "uint8":
+        return _Uint8Codec(space)
+    elif codec == "float16":
+        return _ObservationCodec(space, torch.float16)
+    elif codec == "uint16":
+        return _Uint16Codec(space)
+    else:
+        raise ValueError(
+            f"Unknown observation codec '{codec}', "
+            f"valid codecs are {OBSERVATION_CODECS}"
+        )
+
+
+def select_observation_codecs(
+    observation_space: spaces.Dict,
+    compress: bool = True,
+    depth_codec: str = "float16",
+    dedup_keys: Iterable[str] = (),
+) -> Dict[str, str]:
+    r"""Picks the storage codec of the observations for
+    :ref:`RolloutStorage`.
+
+    :param observation_space: The observation space.
+    :param compress: Whether or not to store floating point RGB observations
+        as uint8 and depth observations with :p:`depth_codec`.
+    :param depth_codec: Either "float16" or "uint16". "uint16" quantizes
+        the range of the depth observation space and falls back to
+        "float16" if that range isn't finite.
+    :param dedup_keys: Observations that (typically) stay the same within
+        an episode, e.g. "objectgoal". Every value of these is only stored
+        once until it changes.
+    """
+    if depth_codec not in ("float16", "uint16"):
+        raise ValueError(
+            f"Unknown depth codec '{depth_codec}', "
+            "valid codecs are ('float16', 'uint16')"
+        )
+
+    codecs = {k: "dedup" for k in dedup_keys if k in observation_space.spaces}
+    if not compress:
+        return codecs
+
+    for k, space in observation_space.spaces.items():
+        if (
+            k in codecs
+            or not isinstance(space, spaces.Box)
+            or not np.issubdtype(space.dtype, np.floating)
+        ):
+            continue
+
+        if "rgb" in k:
+            codecs[k] = "uint8"
+        elif "depth" in k:
+            if depth_codec == "uint16" and (
+                np.isfinite(space.low).all() and np.isfinite(space.high).all()
+            ):
+                codecs[k] = "uint16"
+            else:
+                codecs[k] = "float16"
+
+    return codecs
+
 
 class RolloutStorage:
-    r"""Class for storing rollout information for RL trainers."""
+    r"""Class for storing rollout information for RL trainers.
+
+    Observations can be stored with a compact codec (see
+    :ref:`select_observation_codecs`) given by :p:`observation_codecs`,
+    they are decoded when they are read via :ref:`get_step` and
+    :ref:`recurrent_generator`.
+    """
 
     def __init__(
         self,
@@ -27,21 +152,49 @@ class RolloutStorage:
         action_shape: Optional[Tuple[int]] = None,
         is_double_buffered: bool = False,
         discrete_actions: bool = True,
+        observation_codecs: Optional[Dict[str, str]] = None,
     ):
         self.buffers = TensorDict()
         self.buffers["observations"] = TensorDict()
 
+        if observation_codecs is None:
+            observation_codecs = {}
+
+        self._obs_codecs: Dict[str, _ObservationCodec] = {}
+        # Deduplicated observations store, for every step, the index of a
+        # slot in a per environment table of the distinct values
+        self._dedup_values: Dict[str, torch.Tensor] = {}
+        self._dedup_num_slots: Dict[str, torch.Tensor] = {}
         for sensor in observation_space.spaces:
-            self.buffers["observations"][sensor] = torch.from_numpy(
-                np.zeros(
-                    (
-                        numsteps + 1,
-                        num_envs,
-                        *observation_space.spaces[sensor].shape,
-                    ),
-                    dtype=observation_space.spaces[sensor].dtype,
+            space = observation_space.spaces[sensor]
+            codec = observation_codecs.get(sensor, None)
+            if codec == "dedup":
+                self.buffers["observations"][sensor] = torch.zeros(
+                    numsteps + 1, num_envs, dtype=torch.long
+                )
+                self._dedup_values[sensor] = torch.from_numpy(
+                    np.zeros((2, num_envs, *space.shape), dtype=space.dtype)
+                )
+                self._dedup_num_slots[sensor] = torch.zeros(
+                    num_envs, dtype=torch.long
+                )
+            elif codec is not None:
+                self._obs_codecs[sensor] = _make_observation_codec(
+                    codec, space
+                )
+                self.buffers["observations"][sensor] = torch.zeros(
+                    numsteps + 1,
+                    num_envs,
+                    *space.shape,
+                    dtype=self._obs_codecs[sensor].storage_dtype,
+                )
+            else:
+                self.buffers["observations"][sensor] = torch.from_numpy(
+                    np.zeros(
+                        (numsteps + 1, num_envs, *space.shape),
+                        dtype=space.dtype,
+                    )
                 )
-            )
 
         self.buffers["recurrent_hidden_states"] = torch.zeros(
             numsteps + 1,
@@ -100,6 +253,84 @@ class RolloutStorage:
 
     def to(self, device):
         self.buffers.map_in_place(lambda v: v.to(device))
+        for k in self._dedup_values:
+            self._dedup_values[k] = self._dedup_values[k].to(device)
+            self._dedup_num_slots[k] = self._dedup_num_slots[k].to(device)
+
+    def _env_indices(self, env_slice: slice) -> torch.Tensor:
+        return torch.arange(
+            self._num_envs, device=self.buffers["masks"].device
+        )[env_slice]
+
+    def _encode_observations(
+        self, observations, step: int, env_slice: slice
+    ) -> Dict[str, torch.Tensor]:
+        encoded = dict(observations)
+        for k, codec in self._obs_codecs.items():
+            if k in encoded:
+                encoded[k] = codec.encode(torch.as_tensor(encoded[k]))
+
+        for k, values in self._dedup_values.items():
+            if k not in encoded:
+                continue
+
+            new_values = torch.as_tensor(encoded[k], device=values.device)
+            env_idxs = self._env_indices(env_slice)
+            num_slots = self._dedup_num_slots[k]
+            if step == 0:
+                slots = torch.zeros_like(env_idxs)
+                changed = torch.ones_like(env_idxs, dtype=torch.bool)
+                num_slots[env_slice] = 0
+            else:
+                slots = self.buffers["observations"][k][step - 1, env_slice]
+                changed = (
+                    (values[slots, env_idxs] != new_values).flatten(1).any(1)
+                )
+                slots = torch.where(changed, num_slots[env_slice], slots)
+
+            if changed.any():
+                num_needed = int(slots.max()) + 1
+                if num_needed > values.size(0):
+                    values = torch.cat([values, torch.zeros_like(values)], 0)
+                    self._dedup_values[k] = values
+
+                values[slots[changed], env_idxs[changed]] = new_values[
+                    changed
+                ].to(dtype=values.dtype)
+                num_slots[env_slice] += changed
+
+            encoded[k] = slots
+
+        return encoded
+
+    def _decode_observations(
+        self, observations: TensorDict, env_idxs: torch.Tensor
+    ) -> TensorDict:
+        for k, codec in self._obs_codecs.items():
+            observations[k] = codec.decode(observations[k])
+
+        for k, values in self._dedup_values.items():
+            observations[k] = values[observations[k], env_idxs]
+
+        return observations
+
+    def insert_first_observations(self, batch) -> None:
+        r"""Sets the observations of the first step of the rollout."""
+        self.buffers["observations"][0] = self._encode_observations(
+            batch, 0, slice(None)
+        )
+
+    def get_step(
+        self, step: int, env_slice: slice = slice(None)
+    ) -> TensorDict:
+        r"""Returns all the buffers at :p:`step` for the environments in
+        :p:`env_slice`, with the observations decoded.
+        """
+        batch = self.buffers[step, env_slice]
+        batch["observations"] = self._decode_observations(
+            batch["observations"], self._env_indices(env_slice)
+        )
+        return batch
 
     def insert(
         self,
@@ -137,6 +368,13 @@ class RolloutStorage:
             int((buffer_index + 1) * self._num_envs / self._nbuffers),
         )
 
+        if "observations" in next_step:
+            next_step["observations"] = self._encode_observations(
+                next_step["observations"],
+                self.current_rollout_step_idxs[buffer_index] + 1,
+                env_slice,
+            )
+
         if len(next_step) > 0:
             self.buffers.set(
                 (self.current_rollout_step_idxs[buffer_index] + 1, env_slice),
@@ -157,6 +395,13 @@ class RolloutStorage:
     def after_update(self):
         self.buffers[0] = self.buffers[self.current_rollout_step_idx]
 
+        # Only the slots of the first step are still referenced
+        for k, values in self._dedup_values.items():
+            slots = self.buffers["observations"][k][0]
+            values[0] = values[slots, self._env_indices(slice(None))]
+            slots.fill_(0)
+            self._dedup_num_slots[k].fill_(1)
+
         self.current_rollout_step_idxs = [
             0 for _ in self.current_rollout_step_idxs
         ]
@@ -209,6 +454,10 @@ class RolloutStorage:
                 )
             )
         for inds in torch.randperm(num_environments).chunk(num_mini_batch):
+            # Keep the environments of a minibatch in order so the same
+            # set of environments gives the same masks layout, which lets
+            # the RNN state encoder reuse its cached pack info
+            inds, _ = torch.sort(inds)
             batch = self.buffers[0 : self.current_rollout_step_idx, inds]
             batch["advantages"] = advantages[
                 0 : self.current_rollout_step_idx, inds
@@ -216,5 +465,89 @@ class RolloutStorage:
             batch["recurrent_hidden_states"] = batch[
                 "recurrent_hidden_states"
             ][0:1]
+            batch["observations"] = self._decode_observations(
+                batch["observations"], inds.to(device=advantages.device)
+            )
 
             yield batch.map(lambda v: v.flatten(0, 1))
+
+
+def _record_stream(batch: TensorDict, stream) -> None:
+    for v in batch.values():
+        if torch.is_tensor(v):
+            v.record_stream(stream)
+        else:
+            _record_stream(v, stream)
+
+
+def _cuda_prefetch(
+    minibatches: Iterator[TensorDict], device: torch.device
+) -> Iterator[TensorDict]:
+    stream = torch.cuda.Stream(device)
+    # The minibatches read tensors (i.e. the advantages) that were just
+    # computed on the current stream
+    stream.wait_stream(torch.cuda.current_stream(device))
+
+    def _next_batch() -> Optional[TensorDict]:
+        with torch.cuda.stream(stream):
+            batch = next(minibatches, None)
+            if batch is not None:
+                batch = batch.map(
+                    lambda v: (
+                        v.pin_memory() if v.device.type == "cpu" else v
+                    ).to(device=device, non_blocking=True)
+                )
+
+        return batch
+
+    next_batch = _next_batch()
+    while next_batch is not None:
+        current_stream = torch.cuda.current_stream(device)
+        current_stream.wait_stream(stream)
+        # The memory of the minibatch was allocated on the side stream, so
+        # the allocator must know it is used on the current stream
+        _record_stream(next_batch, current_stream)
+
+        batch = next_batch
+        next_batch = _next_batch()
+        yield batch
+
+
+def _threaded_prefetch(
+    minibatches: Iterator[TensorDict], device: torch.device
+) -> Iterator[TensorDict]:
+    def _next_batch() -> Optional[TensorDict]:
+        batch = next(minibatches, None)
+        if batch is not None:
+            batch = batch.map(lambda v: v.to(device=device).contiguous())
+
+        return batch
+
+    # torch releases the GIL in its kernels, so the next minibatch is
+    # gathered while the current one is being used
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(_next_batch)
+        while True:
+            batch = future.result()
+            if batch is None:
+                return
+
+            future = executor.submit(_next_batch)
+            yield batch
+
+
+def prefetch_minibatches(
+    minibatches: Iterator[TensorDict], device: torch.device
+) -> Iterator[TensorDict]:
+    r"""Iterates over :p:`minibatches` (i.e. the output of
+    :ref:`RolloutStorage.recurrent_generator`) while preparing the next
+    minibatch on :p:`device`.
+
+    On CUDA, the next minibatch is gathered and copied (from pinned memory
+    if the storage is on the CPU) on a side stream. Otherwise, it is
+    gathered into contiguous tensors by a background thread.
+    """
+    if device.type == "cuda":
+        return _cuda_prefetch(minibatches, device)
+    else:
+        return _threaded_prefetch(minibatches, device)
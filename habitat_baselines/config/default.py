@@ -29,6 +29,9 @@ _C.TORCH_GPU_ID = 0
 _C.VIDEO_OPTION = ["disk", "tensorboard"]
 _C.TENSORBOARD_DIR = "tb"
 _C.VIDEO_DIR = "video_dir"
+# Number of evaluation environments whose episodes are recorded in videos,
+# all of them if -1
+_C.VIDEO_NUM_ENVS = -1
 _C.TEST_EPISODE_COUNT = -1
 _C.EVAL_CKPT_PATH_DIR = "data/checkpoints"  # path to ckpt or path to ckpts dir
 _C.NUM_ENVIRONMENTS = 16
@@ -53,6 +56,19 @@ _C.VERBOSE = True
 # PyTorch normally behaves, but all configs we provide
 # set it to true and yours likely should too
 _C.FORCE_TORCH_SINGLE_THREADED = False
+# Only send the full info (all the measures) from the environment workers
+# to the trainer when an episode ends.  On every other step, only the
+# measures in PER_STEP_INFO_KEYS are sent.  This avoids pickling heavy
+# measures, like the top_down_map, on every step.
+_C.INFO_ON_EPISODE_END_ONLY = False
+_C.PER_STEP_INFO_KEYS = []
+# Budget (in bytes) of the buffers used to batch observations, which are
+# pinned when training on GPU.  -1 for no limit
+_C.OBS_BATCHING_CACHE_MAX_BYTES = -1
+# Number of simulator steps each action of the agent is repeated for inside
+# the environment workers.  The rewards are summed and only the last step
+# is rendered
+_C.ACTION_REPEAT = 1
 # -----------------------------------------------------------------------------
 # EVAL CONFIG
 # -----------------------------------------------------------------------------
@@ -102,6 +118,12 @@ _C.RL.POLICY.ACTION_DIST.action_activation = "tanh"  # ['tanh', '']
 # -----------------------------------------------------------------------------
 _C.RL.POLICY.OBS_TRANSFORMS = CN()
 _C.RL.POLICY.OBS_TRANSFORMS.ENABLED_TRANSFORMS = tuple()
+# Replace a ResizeShortestEdge directly followed by a CenterCropper with a
+# ResizeCenterCrop that does both in a single pass
+_C.RL.POLICY.OBS_TRANSFORMS.FUSE_TRANSFORMS = False
+# Apply the transforms in the environment workers, before the observations
+# are sent to the trainer, instead of on the batched observations
+_C.RL.POLICY.OBS_TRANSFORMS.APPLY_IN_WORKERS = False
 _C.RL.POLICY.OBS_TRANSFORMS.CENTER_CROPPER = CN()
 _C.RL.POLICY.OBS_TRANSFORMS.CENTER_CROPPER.HEIGHT = 256
 _C.RL.POLICY.OBS_TRANSFORMS.CENTER_CROPPER.WIDTH = 256
@@ -147,6 +169,25 @@ _C.RL.PPO.hidden_size = 512
 # policy inference time during rollout generation
 # Not that this does not change the memory requirements
 _C.RL.PPO.use_double_buffered_sampler = False
+# Run the policy in mixed precision (bfloat16 on CPU, float16 on GPU) when
+# collecting rollouts and during evaluation.  The weights are kept in
+# float32 and the PPO update always runs in full precision.
+_C.RL.PPO.use_autocast_inference = False
+# Run the policy through a TorchScript trace of its inference graph
+# when collecting rollouts and during evaluation.  This removes most of
+# the eager Python overhead, which matters at small batch sizes.
+_C.RL.PPO.use_traced_inference = False
+# Store floating point RGB observations as uint8 and depth observations as
+# depth_storage_codec ("float16" or "uint16", which quantizes the range of
+# the depth sensor) in the rollout storage
+_C.RL.PPO.compress_observation_storage = False
+_C.RL.PPO.depth_storage_codec = "float16"
+# Observations that stay the same for the whole episode, e.g. "objectgoal",
+# are only stored in the rollout storage when they change
+_C.RL.PPO.dedup_observation_keys = []
+# Prepare the next PPO minibatch (on a side CUDA stream or, on CPU, in a
+# background thread) while the current one is being used
+_C.RL.PPO.prefetch_minibatches = False
 # -----------------------------------------------------------------------------
 # DECENTRALIZED DISTRIBUTED PROXIMAL POLICY OPTIMIZATION (DD-PPO)
 # -----------------------------------------------------------------------------
@@ -163,10 +204,16 @@ _C.RL.DDPPO.pretrained = False
 _C.RL.DDPPO.pretrained_encoder = False
 # Whether or not the visual encoder backbone will be trained
 _C.RL.DDPPO.train_encoder = True
+# When the visual encoder is not trained, only store its features in the
+# rollout storage instead of also storing the raw visual observations
+_C.RL.DDPPO.store_visual_features_only = True
 # Whether or not to reset the critic linear layer
 _C.RL.DDPPO.reset_critic = True
 # Forces distributed mode for testing
 _C.RL.DDPPO.force_distributed = False
+# Only update the running mean and variance of the visual inputs on the
+# first PPO minibatch of every update instead of on every minibatch
+_C.RL.DDPPO.update_visual_input_stats_once_per_rollout = False
 # -----------------------------------------------------------------------------
 # ORBSLAM2 BASELINE
 # -----------------------------------------------------------------------------
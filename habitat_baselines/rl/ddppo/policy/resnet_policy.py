@@ -49,6 +49,7 @@ class PointNavResNetPolicy(Policy):
         normalize_visual_inputs: bool = False,
         force_blind_policy: bool = False,
         policy_config: Config = None,
+        update_visual_input_stats_once_per_rollout: bool = False,
         **kwargs
     ):
         if policy_config is not None:
@@ -73,6 +74,9 @@ class PointNavResNetPolicy(Policy):
                 normalize_visual_inputs=normalize_visual_inputs,
                 force_blind_policy=force_blind_policy,
                 discrete_actions=discrete_actions,
+                update_visual_input_stats_once_per_rollout=(
+                    update_visual_input_stats_once_per_rollout
+                ),
             ),
             dim_actions=action_space.n,  # for action distribution
             policy_config=policy_config,
@@ -92,6 +96,9 @@ class PointNavResNetPolicy(Policy):
             normalize_visual_inputs="rgb" in observation_space.spaces,
             force_blind_policy=config.FORCE_BLIND_POLICY,
             policy_config=config.RL.POLICY,
+            update_visual_input_stats_once_per_rollout=(
+                config.RL.DDPPO.update_visual_input_stats_once_per_rollout
+            ),
         )
 
 
@@ -104,6 +111,7 @@ class ResNetEncoder(nn.Module):
         spatial_size: int = 128,
         make_backbone=None,
         normalize_visual_inputs: bool = False,
+        update_input_stats_once_per_rollout: bool = False,
     ):
         super().__init__()
 
@@ -121,7 +129,8 @@ class ResNetEncoder(nn.Module):
 
         if normalize_visual_inputs:
             self.running_mean_and_var: nn.Module = RunningMeanAndVar(
-                self._n_input_depth + self._n_input_rgb
+                self._n_input_depth + self._n_input_rgb,
+                update_once_per_rollout=update_input_stats_once_per_rollout,
             )
         else:
             self.running_mean_and_var = nn.Sequential()
@@ -159,6 +168,18 @@ class ResNetEncoder(nn.Module):
     def is_blind(self):
         return self._n_input_rgb + self._n_input_depth == 0
 
+    @property
+    def visual_keys(self) -> Tuple[str, ...]:
+        r"""The observation keys this encoder reads"""
+        return tuple(
+            k
+            for k, n in (
+                ("rgb", self._n_input_rgb),
+                ("depth", self._n_input_depth),
+            )
+            if n > 0
+        )
+
     def layer_init(self):
         for layer in self.modules():
             if isinstance(layer, (nn.Conv2d, nn.Linear)):
@@ -216,6 +237,7 @@ class PointNavResNetNet(Net):
         normalize_visual_inputs: bool,
         force_blind_policy: bool = False,
         discrete_actions: bool = True,
+        update_visual_input_stats_once_per_rollout: bool = False,
     ):
         super().__init__()
 
@@ -303,6 +325,9 @@ class PointNavResNetNet(Net):
                 ngroups=resnet_baseplanes // 2,
                 make_backbone=getattr(resnet, backbone),
                 normalize_visual_inputs=normalize_visual_inputs,
+                update_input_stats_once_per_rollout=(
+                    update_visual_input_stats_once_per_rollout
+                ),
             )
 
             self.goal_visual_fc = nn.Sequential(
@@ -323,6 +348,9 @@ class PointNavResNetNet(Net):
             ngroups=resnet_baseplanes // 2,
             make_backbone=getattr(resnet, backbone),
             normalize_visual_inputs=normalize_visual_inputs,
+            update_input_stats_once_per_rollout=(
+                update_visual_input_stats_once_per_rollout
+            ),
         )
 
         if not self.visual_encoder.is_blind:
@@ -4,6 +4,8 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+from typing import Optional, Tuple
+
 import torch
 from torch import Tensor
 from torch import distributed as distrib
@@ -11,7 +13,18 @@ from torch import nn as nn
 
 
 class RunningMeanAndVar(nn.Module):
-    def __init__(self, n_channels: int) -> None:
+    r"""Normalizes its input by the running per-channel mean and variance
+    of all the inputs it has seen in training mode.
+
+    :param n_channels: The number of channels of the input.
+    :param update_once_per_rollout: Only update the statistics on the first
+        training forward after the module is put in training mode, i.e.
+        once per rollout instead of once per PPO minibatch.
+    """
+
+    def __init__(
+        self, n_channels: int, update_once_per_rollout: bool = False
+    ) -> None:
         super().__init__()
         self.register_buffer("_mean", torch.zeros(1, n_channels, 1, 1))
         self.register_buffer("_var", torch.zeros(1, n_channels, 1, 1))
@@ -20,58 +33,108 @@ class RunningMeanAndVar(nn.Module):
         self._var: torch.Tensor = self._var
         self._count: torch.Tensor = self._count
 
-    def forward(self, x: Tensor) -> Tensor:
-        if self.training:
-            n = x.size(0)
-            # We will need to do reductions (mean) over the channel dimension,
-            # so moving channels to the first dimension and then flattening
-            # will make those faster.  Further, it makes things more numerically stable
-            # for fp16 since it is done in a single reduction call instead of
-            # multiple
-            x_channels_first = (
-                x.transpose(1, 0).contiguous().view(x.size(1), -1)
-            )
-            new_mean = x_channels_first.mean(-1, keepdim=True)
-            new_count = torch.full_like(self._count, n)
+        self._update_once_per_rollout = update_once_per_rollout
+        self._updated_since_train = False
+        self._norm_params_cache: Optional[Tuple] = None
 
-            if distrib.is_initialized():
-                distrib.all_reduce(new_mean)
-                distrib.all_reduce(new_count)
-                new_mean /= distrib.get_world_size()
+    def train(self, mode: bool = True):
+        self._updated_since_train = False
+        return super().train(mode)
 
-            new_var = (
-                (x_channels_first - new_mean).pow(2).mean(dim=-1, keepdim=True)
-            )
+    @torch.no_grad()
+    def _update_stats(self, x: Tensor) -> None:
+        n = x.size(0)
+        n_channels = x.size(1)
+        # We will need to do reductions (sum) over the channel dimension,
+        # so moving channels to the first dimension and then flattening
+        # will make those faster.  The inputs are shifted by the current
+        # mean so the variance computed from the sum of squares is
+        # numerically stable
+        x_channels_first = (
+            x.transpose(1, 0).contiguous().view(n_channels, -1)
+        ).to(dtype=self._mean.dtype) - self._mean.view(n_channels, 1)
+        elements_per_sample = x_channels_first.size(1) // n
 
-            if distrib.is_initialized():
-                distrib.all_reduce(new_var)
-                new_var /= distrib.get_world_size()
-
-            new_mean = new_mean.view(1, -1, 1, 1)
-            new_var = new_var.view(1, -1, 1, 1)
-
-            m_a = self._var * (self._count)
-            m_b = new_var * (new_count)
-            M2 = (
-                m_a
-                + m_b
-                + (new_mean - self._mean).pow(2)
-                * self._count
-                * new_count
-                / (self._count + new_count)
-            )
+        # Pack (sum, sum of squares, count) so that a single all reduce
+        # is needed when distributed
+        stats = torch.cat(
+            [
+                x_channels_first.sum(-1),
+                x_channels_first.pow(2).sum(-1),
+                torch.full_like(self._count, n).view(1),
+            ]
+        )
+        if distrib.is_initialized():
+            distrib.all_reduce(stats)
 
-            self._var = M2 / (self._count + new_count)
-            self._mean = (self._count * self._mean + new_count * new_mean) / (
-                self._count + new_count
-            )
+        new_count = stats[-1]
+        num_elements = new_count * elements_per_sample
+        shifted_mean = stats[0:n_channels] / num_elements
+        new_var = (
+            stats[n_channels : 2 * n_channels] / num_elements
+            - shifted_mean.pow(2)
+        ).clamp_(min=0.0)
 
-            self._count += new_count
+        new_mean = self._mean + shifted_mean.view(1, -1, 1, 1)
+        new_var = new_var.view(1, -1, 1, 1)
 
-        inv_stdev = torch.rsqrt(
-            torch.max(self._var, torch.full_like(self._var, 1e-2))
+        m_a = self._var * (self._count)
+        m_b = new_var * (new_count)
+        M2 = (
+            m_a
+            + m_b
+            + (new_mean - self._mean).pow(2)
+            * self._count
+            * new_count
+            / (self._count + new_count)
         )
+
+        # Update in-place so that anything holding a reference to the
+        # buffers, i.e. a traced policy, sees the new statistics
+        self._mean.copy_(
+            (self._count * self._mean + new_count * new_mean)
+            / (self._count + new_count)
+        )
+        self._var.copy_(M2 / (self._count + new_count))
+
+        self._count += new_count
+
+    def _get_norm_params(self) -> Tuple[Tensor, Tensor]:
+        # The statistics only change when they are updated, loaded or moved,
+        # so the normalization parameters are cached in between those.
+        # When tracing, they must be computed from the buffers so that
+        # the trace follows the statistics
+        versions = (self._mean._version, self._var._version)
+        cache = self._norm_params_cache
+        if (
+            torch.jit.is_tracing()
+            or cache is None
+            or cache[0] is not self._mean
+            or cache[1] is not self._var
+            or cache[2] != versions
+        ):
+            inv_stdev = torch.rsqrt(
+                torch.max(self._var, torch.full_like(self._var, 1e-2))
+            )
+            cache = (
+                self._mean,
+                self._var,
+                versions,
+                (-self._mean * inv_stdev, inv_stdev),
+            )
+            self._norm_params_cache = cache
+
+        return cache[3]
+
+    def forward(self, x: Tensor) -> Tensor:
+        if self.training and not (
+            self._update_once_per_rollout and self._updated_since_train
+        ):
+            self._update_stats(x)
+            self._updated_since_train = True
+
+        neg_mean_inv_stdev, inv_stdev = self._get_norm_params()
         # This is the same as
         # (x - self._mean) * inv_stdev but is faster since it can
         # make use of addcmul and is more numerically stable in fp16
-        return torch.addcmul(-self._mean * inv_stdev, x, inv_stdev)
+        return torch.addcmul(neg_mean_inv_stdev, x, inv_stdev)
@@ -4,7 +4,8 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
-from typing import Tuple
+from collections import OrderedDict
+from typing import Dict, Tuple
 
 import torch
 import torch.nn as nn
@@ -151,6 +152,81 @@ def _build_pack_info_from_dones(
     )
 
 
+_PackInfo = Tuple[
+    torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor
+]
+
+# The dones of a rollout don't change between PPO epochs, so the pack
+# info for a given set of dones is cached instead of being rebuilt for
+# every minibatch of every epoch
+_PACK_INFO_CACHE_SIZE = 64
+_pack_info_cache: Dict[Tuple, _PackInfo] = OrderedDict()
+
+
+def _build_pack_info_no_boundaries(
+    T: int, N: int, device: torch.device
+) -> _PackInfo:
+    r"""Fast path of :ref:`_build_pack_info_from_dones` when there are no
+    episode boundaries after t=0.  Every sequence then spans all T steps,
+    so the (T * N) input is already in PackedSequence order.
+    """
+    return (
+        torch.arange(T * N, device=device),
+        torch.full((T,), N, dtype=torch.long),
+        torch.arange(N, device=device),
+        torch.arange(N, device=device),
+        torch.ones((N,), dtype=torch.bool, device=device),
+    )
+
+
+def _get_pack_info(
+    dones: torch.Tensor, T: int, device: torch.device
+) -> _PackInfo:
+    r"""Returns the pack info of :ref:`_build_pack_info_from_dones` with its
+    tensors on device (except batch_sizes, which is always on the CPU),
+    reusing a previously built one for the same dones when possible.
+    """
+    dones = dones.detach().to(device="cpu").view(T, -1)
+    N = dones.size(1)
+
+    has_boundaries = bool(dones[1:].any())
+    key = (
+        T,
+        N,
+        device,
+        dones.numpy().tobytes() if has_boundaries else None,
+    )
+
+    pack_info = _pack_info_cache.get(key, None)
+    if pack_info is not None:
+        _pack_info_cache.move_to_end(key)  # type: ignore
+        return pack_info
+
+    if not has_boundaries:
+        pack_info = _build_pack_info_no_boundaries(T, N, device)
+    else:
+        (
+            select_inds,
+            batch_sizes,
+            episode_starts,
+            rnn_state_batch_inds,
+            last_episode_in_batch_mask,
+        ) = _build_pack_info_from_dones(dones, T)
+        pack_info = (
+            select_inds.to(device=device),
+            batch_sizes,
+            episode_starts.to(device=device),
+            rnn_state_batch_inds.to(device=device),
+            last_episode_in_batch_mask.to(device=device),
+        )
+
+    _pack_info_cache[key] = pack_info
+    if len(_pack_info_cache) > _PACK_INFO_CACHE_SIZE:
+        _pack_info_cache.popitem(last=False)  # type: ignore
+
+    return pack_info
+
+
 def build_rnn_inputs(
     x: torch.Tensor, not_dones: torch.Tensor, rnn_states: torch.Tensor
 ) -> Tuple[
@@ -193,12 +269,7 @@ def build_rnn_inputs(
         episode_starts,
         rnn_state_batch_inds,
         last_episode_in_batch_mask,
-    ) = _build_pack_info_from_dones(dones.detach().to(device="cpu"), T)
-
-    select_inds = select_inds.to(device=x.device)
-    episode_starts = episode_starts.to(device=x.device)
-    rnn_state_batch_inds = rnn_state_batch_inds.to(device=x.device)
-    last_episode_in_batch_mask = last_episode_in_batch_mask.to(device=x.device)
+    ) = _get_pack_info(dones, T, x.device)
 
     x_seq = PackedSequence(
         x.index_select(0, select_inds), batch_sizes, None, None
@@ -4,7 +4,12 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
-from habitat_baselines.rl.ppo.policy import Net, PointNavBaselinePolicy, Policy
+from habitat_baselines.rl.ppo.policy import (
+    Net,
+    PointNavBaselinePolicy,
+    Policy,
+    TracedPolicyAct,
+)
 from habitat_baselines.rl.ppo.ppo import PPO
 
-__all__ = ["PPO", "Policy", "Net", "PointNavBaselinePolicy"]
+__all__ = ["PPO", "Policy", "Net", "PointNavBaselinePolicy", "TracedPolicyAct"]
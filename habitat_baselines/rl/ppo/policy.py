@@ -4,6 +4,8 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 import abc
+import warnings
+from typing import Dict, Tuple
 
 import torch
 from gym import spaces
@@ -20,7 +22,12 @@ from habitat_baselines.rl.models.rnn_state_encoder import (
     build_rnn_state_encoder,
 )
 from habitat_baselines.rl.models.simple_cnn import SimpleCNN
-from habitat_baselines.utils.common import CategoricalNet, GaussianNet
+from habitat_baselines.utils.common import (
+    CategoricalNet,
+    CustomFixedCategorical,
+    CustomNormal,
+    GaussianNet,
+)
 
 
 class Policy(nn.Module, metaclass=abc.ABCMeta):
@@ -71,6 +78,13 @@ class Policy(nn.Module, metaclass=abc.ABCMeta):
         distribution = self.action_distribution(features)
         value = self.critic(features)
 
+        action, action_log_probs = self.select_action(
+            distribution, deterministic
+        )
+
+        return value, action, action_log_probs, rnn_hidden_states
+
+    def select_action(self, distribution, deterministic=False):
         if deterministic:
             if self.action_distribution_type == "categorical":
                 action = distribution.mode()
@@ -81,7 +95,7 @@ class Policy(nn.Module, metaclass=abc.ABCMeta):
 
         action_log_probs = distribution.log_probs(action)
 
-        return value, action, action_log_probs, rnn_hidden_states
+        return action, action_log_probs
 
     def get_value(self, observations, rnn_hidden_states, prev_actions, masks):
         features, _ = self.net(
@@ -120,6 +134,116 @@ class CriticHead(nn.Module):
         return self.fc(x)
 
 
+class _PolicyActGraph(nn.Module):
+    r"""The tensor-only part of :ref:`Policy.act`: the net, the critic
+    and the parameters of the action distribution.
+    """
+
+    def __init__(self, policy: Policy):
+        super().__init__()
+        self.policy = policy
+
+    def forward(
+        self,
+        observations: Dict[str, torch.Tensor],
+        rnn_hidden_states,
+        prev_actions,
+        masks,
+    ):
+        features, rnn_hidden_states = self.policy.net(
+            observations, rnn_hidden_states, prev_actions, masks
+        )
+        distribution = self.policy.action_distribution(features)
+        value = self.policy.critic(features)
+
+        if self.policy.action_distribution_type == "categorical":
+            dist_params: Tuple[torch.Tensor, ...] = (distribution.logits,)
+        else:
+            dist_params = (distribution.loc, distribution.scale)
+
+        return (value, rnn_hidden_states) + dist_params
+
+
+class TracedPolicyAct:
+    r"""Runs :ref:`Policy.act` through a TorchScript trace of the policy's
+    inference graph to remove the eager Python overhead of the forward pass.
+
+    The encoders, the RNN, the critic and the action distribution head are
+    traced the first time a batch size, set of observation keys and dtypes,
+    device and autocast state are seen.
+    Selecting the action (mode or sample) is done eagerly with the same
+    distribution classes as the policy, so the outputs match
+    :ref:`Policy.act`.  The trace shares its parameters with the policy, so
+    it stays up to date as the policy is trained.
+
+    The trace captures the policy in eval mode, which is the mode the
+    policy is in when collecting rollouts or evaluating.
+    """
+
+    def __init__(self, policy: Policy):
+        self.policy = policy
+        self._act_graph = _PolicyActGraph(policy)
+        self._traces: Dict[Tuple, torch.jit.ScriptModule] = {}
+
+    @staticmethod
+    def _is_autocast_enabled() -> Tuple[bool, bool]:
+        is_autocast_cpu_enabled = getattr(
+            torch, "is_autocast_cpu_enabled", lambda: False
+        )
+        return torch.is_autocast_enabled(), is_autocast_cpu_enabled()
+
+    def _get_trace(self, observations, rnn_hidden_states, prev_actions, masks):
+        # A trace records the device and dtypes of its inputs and the
+        # casts done by autocast, so those are part of the key
+        key = (
+            tuple(sorted((k, v.dtype) for k, v in observations.items())),
+            masks.size(0),
+            masks.device,
+            rnn_hidden_states.dtype,
+            self._is_autocast_enabled(),
+        )
+        if key not in self._traces:
+            was_training = self.policy.training
+            self.policy.eval()
+            # The branches the tracer warns about only depend on the
+            # shapes and observation keys, which are part of the key
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", torch.jit.TracerWarning)
+                self._traces[key] = torch.jit.trace(
+                    self._act_graph,
+                    (observations, rnn_hidden_states, prev_actions, masks),
+                    check_trace=False,
+                    strict=False,
+                )
+            self.policy.train(was_training)
+
+        return self._traces[key]
+
+    def act(
+        self,
+        observations,
+        rnn_hidden_states,
+        prev_actions,
+        masks,
+        deterministic=False,
+    ):
+        observations = {k: v for k, v in observations.items()}
+        value, rnn_hidden_states, *dist_params = self._get_trace(
+            observations, rnn_hidden_states, prev_actions, masks
+        )(observations, rnn_hidden_states, prev_actions, masks)
+
+        if self.policy.action_distribution_type == "categorical":
+            distribution = CustomFixedCategorical(logits=dist_params[0])
+        else:
+            distribution = CustomNormal(*dist_params)
+
+        action, action_log_probs = self.policy.select_action(
+            distribution, deterministic
+        )
+
+        return value, action, action_log_probs, rnn_hidden_states
+
+
 @baseline_registry.register_policy
 class PointNavBaselinePolicy(Policy):
     def __init__(
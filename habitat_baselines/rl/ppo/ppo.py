@@ -12,7 +12,10 @@ from torch import nn as nn
 from torch import optim as optim
 
 from habitat.utils import profiling_wrapper
-from habitat_baselines.common.rollout_storage import RolloutStorage
+from habitat_baselines.common.rollout_storage import (
+    RolloutStorage,
+    prefetch_minibatches,
+)
 from habitat_baselines.rl.ppo.policy import Policy
 
 EPS_PPO = 1e-5
@@ -32,6 +35,7 @@ class PPO(nn.Module):
         max_grad_norm: Optional[float] = None,
         use_clipped_value_loss: bool = True,
         use_normalized_advantage: bool = True,
+        prefetch_minibatches: bool = False,
     ) -> None:
 
         super().__init__()
@@ -55,6 +59,7 @@ class PPO(nn.Module):
         )
         self.device = next(actor_critic.parameters()).device
         self.use_normalized_advantage = use_normalized_advantage
+        self.prefetch_minibatches = prefetch_minibatches
 
     def forward(self, *x):
         raise NotImplementedError
@@ -81,6 +86,10 @@ class PPO(nn.Module):
             data_generator = rollouts.recurrent_generator(
                 advantages, self.num_mini_batch
             )
+            if self.prefetch_minibatches:
+                data_generator = prefetch_minibatches(
+                    data_generator, self.device
+                )
 
             for batch in data_generator:
                 (
@@ -9,7 +9,7 @@ import os
 import random
 import time
 from collections import defaultdict, deque
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 import numpy as np
 import torch
@@ -20,6 +20,7 @@ from torch.optim.lr_scheduler import LambdaLR
 
 from habitat import Config, VectorEnv, logger
 from habitat.utils import profiling_wrapper
+from habitat.utils.visualizations.maps import TopDownMapReconstructor
 from habitat.utils.visualizations.utils import observations_to_image
 from habitat_baselines.common.base_trainer import BaseRLTrainer
 from habitat_baselines.common.baseline_registry import baseline_registry
@@ -29,7 +30,11 @@ from habitat_baselines.common.obs_transformers import (
     apply_obs_transforms_obs_space,
     get_active_obs_transforms,
 )
-from habitat_baselines.common.rollout_storage import RolloutStorage
+from habitat_baselines.common.rollout_storage import (
+    RolloutStorage,
+    select_observation_codecs,
+)
+from habitat_baselines.common.tensor_dict import TensorDict
 from habitat_baselines.common.tensorboard_utils import TensorboardWriter
 from habitat_baselines.rl.ddppo.algo import DDPPO
 from habitat_baselines.rl.ddppo.ddp_utils import (
@@ -47,12 +52,14 @@ from habitat_baselines.rl.ddppo.policy import (  # noqa: F401.
     PointNavResNetPolicy,
 )
 from habitat_baselines.rl.ppo import PPO
-from habitat_baselines.rl.ppo.policy import Policy
+from habitat_baselines.rl.ppo.policy import Policy, TracedPolicyAct
 from habitat_baselines.utils.common import (
     ObservationBatchingCache,
+    RunningEpisodeStats,
     action_to_velocity_control,
     batch_obs,
     generate_video,
+    inference_autocast,
 )
 from habitat_baselines.utils.env_utils import construct_envs
 
@@ -71,6 +78,7 @@ class PPOTrainer(BaseRLTrainer):
     envs: VectorEnv
     agent: PPO
     actor_critic: Policy
+    _inference_policy: Union[Policy, TracedPolicyAct]
 
     def __init__(self, config=None):
         super().__init__(config)
@@ -86,7 +94,11 @@ class PPOTrainer(BaseRLTrainer):
         # Distributed if the world size would be
         # greater than 1
         self._is_distributed = get_distrib_size()[2] > 1
-        self._obs_batching_cache = ObservationBatchingCache()
+        self._obs_batching_cache = ObservationBatchingCache(
+            max_bytes=self.config.OBS_BATCHING_CACHE_MAX_BYTES
+            if self.config.OBS_BATCHING_CACHE_MAX_BYTES >= 0
+            else None
+        )
 
         self.using_velocity_ctrl = (
             self.config.TASK_CONFIG.TASK.POSSIBLE_ACTIONS
@@ -133,6 +145,9 @@ class PPOTrainer(BaseRLTrainer):
         observation_space = apply_obs_transforms_obs_space(
             observation_space, self.obs_transforms
         )
+        if self.config.RL.POLICY.OBS_TRANSFORMS.APPLY_IN_WORKERS:
+            # The observations are already transformed by the envs
+            self.obs_transforms = []
 
         self.actor_critic = policy.from_config(
             self.config, observation_space, self.policy_action_space
@@ -185,8 +200,26 @@ class PPOTrainer(BaseRLTrainer):
             eps=ppo_cfg.eps,
             max_grad_norm=ppo_cfg.max_grad_norm,
             use_normalized_advantage=ppo_cfg.use_normalized_advantage,
+            prefetch_minibatches=ppo_cfg.prefetch_minibatches,
         )
 
+        if ppo_cfg.use_traced_inference:
+            self._inference_policy = TracedPolicyAct(self.actor_critic)
+        else:
+            self._inference_policy = self.actor_critic
+
+    def _encode_visual_features(self, batch: TensorDict) -> TensorDict:
+        r"""Replaces the observations read by the static visual encoder with
+        the features it computes from them.
+        """
+        with torch.no_grad():
+            batch["visual_features"] = self._encoder(batch)
+
+        for k in self._encoder_keys:
+            batch.pop(k, None)
+
+        return batch
+
     def _init_envs(self, config=None):
         if config is None:
             config = self.config
@@ -283,6 +316,14 @@ class PPOTrainer(BaseRLTrainer):
         obs_space = self.obs_space
         if self._static_encoder:
             self._encoder = self.actor_critic.net.visual_encoder
+            # The features are computed once when the observations are
+            # collected and then reused by every PPO epoch, so the raw
+            # observations the encoder reads don't need to be stored
+            if self.config.RL.DDPPO.store_visual_features_only:
+                self._encoder_keys = set(self._encoder.visual_keys)
+            else:
+                self._encoder_keys = set()
+
             obs_space = spaces.Dict(
                 {
                     "visual_features": spaces.Box(
@@ -291,7 +332,11 @@ class PPOTrainer(BaseRLTrainer):
                         shape=self._encoder.output_shape,
                         dtype=np.float32,
                     ),
-                    **obs_space.spaces,
+                    **{
+                        k: v
+                        for k, v in obs_space.spaces.items()
+                        if k not in self._encoder_keys
+                    },
                 }
             )
 
@@ -307,6 +352,12 @@ class PPOTrainer(BaseRLTrainer):
             is_double_buffered=ppo_cfg.use_double_buffered_sampler,
             action_shape=action_shape,
             discrete_actions=discrete_actions,
+            observation_codecs=select_observation_codecs(
+                obs_space,
+                compress=ppo_cfg.compress_observation_storage,
+                depth_codec=ppo_cfg.depth_storage_codec,
+                dedup_keys=ppo_cfg.dedup_observation_keys,
+            ),
         )
         self.rollouts.to(self.device)
 
@@ -317,16 +368,13 @@ class PPOTrainer(BaseRLTrainer):
         batch = apply_obs_transforms_batch(batch, self.obs_transforms)
 
         if self._static_encoder:
-            with torch.no_grad():
-                batch["visual_features"] = self._encoder(batch)
+            batch = self._encode_visual_features(batch)
 
-        self.rollouts.buffers["observations"][0] = batch
+        self.rollouts.insert_first_observations(batch)
 
         self.current_episode_reward = torch.zeros(self.envs.num_envs, 1)
-        self.running_episode_stats = dict(
-            count=torch.zeros(self.envs.num_envs, 1),
-            reward=torch.zeros(self.envs.num_envs, 1),
-        )
+        self.running_episode_stats = RunningEpisodeStats(self.envs.num_envs)
+        self._running_stats_schema_built = False
         self.window_episode_stats = defaultdict(
             lambda: deque(maxlen=ppo_cfg.reward_window_size)
         )
@@ -422,11 +470,13 @@ class PPOTrainer(BaseRLTrainer):
         t_sample_action = time.time()
 
         # sample actions
-        with torch.no_grad():
-            step_batch = self.rollouts.buffers[
+        with torch.no_grad(), inference_autocast(
+            self.device, self.config.RL.PPO.use_autocast_inference
+        ):
+            step_batch = self.rollouts.get_step(
                 self.rollouts.current_rollout_step_idxs[buffer_index],
                 env_slice,
-            ]
+            )
 
             profiling_wrapper.range_push("compute actions")
             (
@@ -434,7 +484,7 @@ class PPOTrainer(BaseRLTrainer):
                 actions,
                 actions_log_probs,
                 recurrent_hidden_states,
-            ) = self.actor_critic.act(
+            ) = self._inference_policy.act(
                 step_batch["observations"],
                 step_batch["recurrent_hidden_states"],
                 step_batch["prev_actions"],
@@ -464,6 +514,8 @@ class PPOTrainer(BaseRLTrainer):
 
         self.env_time += time.time() - t_step_env
 
+        # NB: Outputs computed with autocast inference are cast back
+        # to the dtypes of the rollout buffers when they are inserted
         self.rollouts.insert(
             next_recurrent_hidden_states=recurrent_hidden_states,
             actions=actions,
@@ -512,27 +564,34 @@ class PPOTrainer(BaseRLTrainer):
         done_masks = torch.logical_not(not_done_masks)
 
         self.current_episode_reward[env_slice] += rewards
-        current_ep_reward = self.current_episode_reward[env_slice]
-        self.running_episode_stats["reward"][env_slice] += current_ep_reward.where(done_masks, current_ep_reward.new_zeros(()))  # type: ignore
-        self.running_episode_stats["count"][env_slice] += done_masks.float()  # type: ignore
-        for k, v_k in self._extract_scalars_from_infos(infos).items():
-            v = torch.tensor(
-                v_k,
-                dtype=torch.float,
-                device=self.current_episode_reward.device,
-            ).unsqueeze(1)
-            if k not in self.running_episode_stats:
-                self.running_episode_stats[k] = torch.zeros_like(
-                    self.running_episode_stats["count"]
-                )
 
-            self.running_episode_stats[k][env_slice] += v.where(done_masks, v.new_zeros(()))  # type: ignore
+        if not self._running_stats_schema_built:
+            # Build the stats schema from the first infos so the buffer
+            # doesn't need to grow as episodes start finishing
+            self.running_episode_stats.add_keys(
+                self._extract_scalars_from_infos(infos).keys()
+            )
+            self._running_stats_schema_built = True
+
+        done_env_idxs = np.flatnonzero(dones)
+        if len(done_env_idxs) > 0:
+            current_ep_reward = self.current_episode_reward[env_slice]
+            self.running_episode_stats.add(
+                env_slice.start + done_env_idxs,
+                [
+                    {
+                        **self._extract_scalars_from_info(infos[i]),
+                        "count": 1.0,
+                        "reward": current_ep_reward[i].item(),
+                    }
+                    for i in done_env_idxs
+                ],
+            )
 
         self.current_episode_reward[env_slice].masked_fill_(done_masks, 0.0)
 
         if self._static_encoder:
-            with torch.no_grad():
-                batch["visual_features"] = self._encoder(batch)
+            batch = self._encode_visual_features(batch)
 
         self.rollouts.insert(
             next_observations=batch,
@@ -557,9 +616,9 @@ class PPOTrainer(BaseRLTrainer):
         ppo_cfg = self.config.RL.PPO
         t_update_model = time.time()
         with torch.no_grad():
-            step_batch = self.rollouts.buffers[
+            step_batch = self.rollouts.get_step(
                 self.rollouts.current_rollout_step_idx
-            ]
+            )
 
             next_value = self.actor_critic.get_value(
                 step_batch["observations"],
@@ -590,10 +649,12 @@ class PPOTrainer(BaseRLTrainer):
     def _coalesce_post_step(
         self, losses: Dict[str, float], count_steps_delta: int
     ) -> Dict[str, float]:
+        # With INFO_ON_EPISODE_END_ONLY, the metrics are only seen once an
+        # episode ends, so each worker may have seen different keys so far
+        if self._is_distributed:
+            self.running_episode_stats.sync_keys(self.device)
         stats_ordering = sorted(self.running_episode_stats.keys())
-        stats = torch.stack(
-            [self.running_episode_stats[k] for k in stats_ordering], 0
-        )
+        stats = self.running_episode_stats.stack(stats_ordering)
 
         stats = self._all_reduce(stats)
 
@@ -736,7 +797,9 @@ class PPOTrainer(BaseRLTrainer):
             count_checkpoints = requeue_stats["count_checkpoints"]
             prev_time = requeue_stats["prev_time"]
 
-            self.running_episode_stats = requeue_stats["running_episode_stats"]
+            self.running_episode_stats.load_dict(
+                requeue_stats["running_episode_stats"]
+            )
             self.window_episode_stats.update(
                 requeue_stats["window_episode_stats"]
             )
@@ -768,7 +831,7 @@ class PPOTrainer(BaseRLTrainer):
                         num_updates_done=self.num_updates_done,
                         _last_checkpoint_percent=self._last_checkpoint_percent,
                         prev_time=(time.time() - self.t_start) + prev_time,
-                        running_episode_stats=self.running_episode_stats,
+                        running_episode_stats=self.running_episode_stats.to_dict(),
                         window_episode_stats=dict(self.window_episode_stats),
                     )
 
@@ -899,12 +962,34 @@ class PPOTrainer(BaseRLTrainer):
             config.defrost()
             config.TASK_CONFIG.TASK.MEASUREMENTS.append("TOP_DOWN_MAP")
             config.TASK_CONFIG.TASK.MEASUREMENTS.append("COLLISIONS")
+            # Video frames are drawn from the info on every step
+            config.PER_STEP_INFO_KEYS = config.PER_STEP_INFO_KEYS + [
+                "top_down_map",
+                "collisions",
+            ]
+            # Only the changes of the top-down map are sent on every step,
+            # unless steps are dropped by the action repeat
+            if config.ACTION_REPEAT == 1:
+                config.TASK_CONFIG.TASK.TOP_DOWN_MAP.EMIT_DELTAS = True
             config.freeze()
 
         if config.VERBOSE:
             logger.info(f"env config: {config}")
 
         self._init_envs(config)
+        # Whether the episodes of each env are recorded in videos
+        num_video_envs = self.config.VIDEO_NUM_ENVS
+        if num_video_envs == -1:
+            num_video_envs = self.envs.num_envs
+        is_video_env = [
+            len(self.config.VIDEO_OPTION) > 0 and i < num_video_envs
+            for i in range(self.envs.num_envs)
+        ]
+        for i, is_video in enumerate(is_video_env):
+            if is_video:
+                # Sensors that are only used for videos are rendered on
+                # demand
+                self.envs.set_render_on_demand_sensors(True, index=i)
 
         if self.using_velocity_ctrl:
             self.policy_action_space = self.envs.action_spaces[0][
@@ -957,6 +1042,9 @@ class PPOTrainer(BaseRLTrainer):
         rgb_frames = [
             [] for _ in range(self.config.NUM_ENVIRONMENTS)
         ]  # type: List[List[np.ndarray]]
+        # Rebuilds the top-down maps of the episodes being recorded from
+        # the per step changes
+        map_reconstructors: Dict[Any, TopDownMapReconstructor] = {}
         if len(self.config.VIDEO_OPTION) > 0:
             os.makedirs(self.config.VIDEO_DIR, exist_ok=True)
 
@@ -981,13 +1069,15 @@ class PPOTrainer(BaseRLTrainer):
         ):
             current_episodes = self.envs.current_episodes()
 
-            with torch.no_grad():
+            with torch.no_grad(), inference_autocast(
+                self.device, ppo_cfg.use_autocast_inference
+            ):
                 (
                     _,
                     actions,
                     _,
                     test_recurrent_hidden_states,
-                ) = self.actor_critic.act(
+                ) = self._inference_policy.act(
                     batch,
                     test_recurrent_hidden_states,
                     prev_actions,
@@ -995,7 +1085,9 @@ class PPOTrainer(BaseRLTrainer):
                     deterministic=False,
                 )
 
-                prev_actions.copy_(actions)  # type: ignore
+            # Keep the recurrent state in full precision between steps
+            test_recurrent_hidden_states = test_recurrent_hidden_states.float()
+            prev_actions.copy_(actions)  # type: ignore
             # NB: Move actions to CPU.  If CUDA tensors are
             # sent in to env.step(), that will create CUDA contexts
             # in the subprocesses.
@@ -1057,8 +1149,15 @@ class PPOTrainer(BaseRLTrainer):
                             current_episodes[i].episode_id,
                         )
                     ] = episode_stats
+                    map_reconstructors.pop(
+                        (
+                            current_episodes[i].scene_id,
+                            current_episodes[i].episode_id,
+                        ),
+                        None,
+                    )
 
-                    if len(self.config.VIDEO_OPTION) > 0:
+                    if is_video_env[i]:
                         generate_video(
                             video_option=self.config.VIDEO_OPTION,
                             video_dir=self.config.VIDEO_DIR,
@@ -1072,14 +1171,34 @@ class PPOTrainer(BaseRLTrainer):
                         rgb_frames[i] = []
 
                 # episode continues
-                elif len(self.config.VIDEO_OPTION) > 0:
+                elif is_video_env[i]:
+                    info = infos[i]
+                    if config.TASK_CONFIG.TASK.TOP_DOWN_MAP.EMIT_DELTAS:
+                        reconstructor = map_reconstructors.setdefault(
+                            (
+                                current_episodes[i].scene_id,
+                                current_episodes[i].episode_id,
+                            ),
+                            TopDownMapReconstructor(),
+                        )
+                        info = {
+                            **info,
+                            "top_down_map": reconstructor.update(
+                                info["top_down_map"]
+                            ),
+                        }
                     # TODO move normalization / channel changing out of the policy and undo it here
                     frame = observations_to_image(
-                        {k: v[i] for k, v in batch.items()}, infos[i]
+                        {k: v[i] for k, v in batch.items()}, info
                     )
                     rgb_frames[i].append(frame)
 
             not_done_masks = not_done_masks.to(device=self.device)
+            is_video_env = [
+                is_video
+                for i, is_video in enumerate(is_video_env)
+                if i not in envs_to_pause
+            ]
             (
                 self.envs,
                 test_recurrent_hidden_states,
@@ -4,16 +4,18 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import contextlib
 import glob
 import numbers
 import os
 import re
 import shutil
 import tarfile
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from io import BytesIO
 from typing import (
     Any,
+    ContextManager,
     DefaultDict,
     Dict,
     Iterable,
@@ -29,6 +31,7 @@ import torch
 from gym.spaces import Box
 from PIL import Image
 from torch import Size, Tensor
+from torch import distributed as distrib
 from torch import nn as nn
 
 from habitat import logger
@@ -145,8 +148,39 @@ def linear_decay(epoch: int, total_num_updates: int) -> float:
 class ObservationBatchingCache:
     r"""Helper for batching observations that maintains a cpu-side tensor
     that is the right size and is pinned to cuda memory
+
+    There is one buffer per sensor.  A buffer that is larger than needed
+    (i.e. when environments are paused during evaluation) is sliced instead
+    of allocating a new one.  When :p:`max_bytes` is set, the least recently
+    used buffers are freed to keep the total size of the buffers under it.
+
+    :property hits: The number of requests that were served by a buffer.
+    :property misses: The number of requests that allocated a buffer.
+    :property num_bytes: The total size of the buffers.
+    :property num_pinned_bytes: The total size of the pinned buffers.
     """
-    _pool: Dict[Any, Union[torch.Tensor, np.ndarray]] = attr.Factory(dict)
+    max_bytes: Optional[int] = None
+    _pool: "OrderedDict[Any, Union[torch.Tensor, np.ndarray]]" = attr.Factory(
+        OrderedDict
+    )
+    hits: int = attr.ib(init=False, default=0)
+    misses: int = attr.ib(init=False, default=0)
+    num_bytes: int = attr.ib(init=False, default=0)
+    num_pinned_bytes: int = attr.ib(init=False, default=0)
+
+    @staticmethod
+    def _nbytes(cache: Union[torch.Tensor, np.ndarray]) -> int:
+        if isinstance(cache, np.ndarray):
+            return cache.nbytes
+        else:
+            return cache.numel() * cache.element_size()
+
+    def _free(self, key) -> None:
+        cache = self._pool.pop(key)
+        nbytes = self._nbytes(cache)
+        self.num_bytes -= nbytes
+        if key[-1]:
+            self.num_pinned_bytes -= nbytes
 
     def get(
         self,
@@ -161,25 +195,33 @@ class ObservationBatchingCache:
         be pinned to cuda memory.  If sensor is a cuda tensor, the batched tensor will also be
         a cuda tensor
         """
+        pin_memory = (
+            device is not None
+            and device.type == "cuda"
+            and sensor.device.type == "cpu"
+        )
         key = (
-            num_obs,
             sensor_name,
             tuple(sensor.size()),
             sensor.type(),
             sensor.device.type,
             sensor.device.index,
+            pin_memory,
         )
-        if key in self._pool:
-            return self._pool[key]
+        cache = self._pool.get(key, None)
+        if cache is not None and len(cache) >= num_obs:
+            self.hits += 1
+            self._pool.move_to_end(key)
+            return cache[:num_obs]
+
+        self.misses += 1
+        if cache is not None:
+            self._free(key)
 
         cache = torch.empty(
             num_obs, *sensor.size(), dtype=sensor.dtype, device=sensor.device
         )
-        if (
-            device is not None
-            and device.type == "cuda"
-            and cache.device.type == "cpu"
-        ):
+        if pin_memory:
             cache = cache.pin_memory()
 
         if cache.device.type == "cpu":
@@ -188,9 +230,187 @@ class ObservationBatchingCache:
             cache = cache.numpy()
 
         self._pool[key] = cache
+        nbytes = self._nbytes(cache)
+        self.num_bytes += nbytes
+        if pin_memory:
+            self.num_pinned_bytes += nbytes
+
+        if self.max_bytes is not None:
+            # Never free the buffer that was just allocated
+            while self.num_bytes > self.max_bytes and len(self._pool) > 1:
+                self._free(next(iter(self._pool)))
+
         return cache
 
 
+class RunningEpisodeStats:
+    r"""Running sums of the scalar statistics of finished episodes, one
+    entry per environment.
+
+    All stats live in a single preallocated ``(num_keys, num_envs, 1)``
+    buffer whose schema (the ordered set of keys) is built from the first
+    info dicts seen and only grows when a new key shows up.  Adding the
+    stats of the episodes that finished on a step is a single NumPy write
+    into that buffer, and nothing is done on steps where no episode ended.
+
+    When distributed, workers can see new keys at different times and
+    :ref:`sync_keys` has to be called before the stats are reduced.
+    """
+
+    def __init__(
+        self, num_envs: int, keys: Iterable[str] = ("count", "reward")
+    ) -> None:
+        self.num_envs = num_envs
+        self._key_to_idx: Dict[str, int] = {}
+        self._schema_cache: Dict[Tuple[str, ...], np.ndarray] = {}
+        self._buffer = torch.zeros(0, num_envs, 1)
+        self._buffer_np = self._buffer.numpy()[..., 0]
+        self._num_synced_keys = 0
+        self.add_keys(keys)
+
+    def add_keys(self, keys: Iterable[str]) -> None:
+        r"""Grows the schema with any keys that are not yet tracked."""
+        new_keys = [k for k in keys if k not in self._key_to_idx]
+        if len(new_keys) == 0:
+            return
+
+        for k in new_keys:
+            self._key_to_idx[k] = len(self._key_to_idx)
+
+        buffer = torch.zeros(len(self._key_to_idx), self.num_envs, 1)
+        buffer[: self._buffer.size(0)] = self._buffer
+        self._buffer = buffer
+        # (num_keys, num_envs) view that shares memory with the tensor
+        self._buffer_np = buffer.numpy()[..., 0]
+
+    def _key_indices(self, keys: Tuple[str, ...]) -> np.ndarray:
+        indices = self._schema_cache.get(keys, None)
+        if indices is None:
+            self.add_keys(keys)
+            indices = np.array(
+                [self._key_to_idx[k] for k in keys], dtype=np.int64
+            )
+            self._schema_cache[keys] = indices
+
+        return indices
+
+    def add(
+        self, env_indices: Iterable[int], stats: List[Dict[str, float]]
+    ) -> None:
+        r"""Adds the stats of the episodes that just finished.
+
+        Args:
+            env_indices: the index of the environment each episode ran in.
+            stats: the scalar stats of each finished episode.
+        """
+        env_indices = np.asarray(env_indices, dtype=np.int64)
+        if env_indices.size == 0:
+            return
+
+        key_indices = [self._key_indices(tuple(s.keys())) for s in stats]
+        values = np.zeros(
+            (len(self._key_to_idx), len(stats)), dtype=np.float32
+        )
+        for j, (s, inds) in enumerate(zip(stats, key_indices)):
+            values[inds, j] = list(s.values())
+
+        self._buffer_np[:, env_indices] += values
+
+    def sync_keys(self, device: Optional[torch.device] = None) -> None:
+        r"""Adds the keys tracked by any of the distributed workers so that
+        all of them have the same keys.  Must be called by all the workers,
+        and is a no-op when not distributed.
+
+        Args:
+            device: the device of the tensors that are communicated, i.e. a
+                CUDA device with the NCCL backend.
+        """
+        if not distrib.is_initialized():
+            return
+
+        # The keys are only exchanged when one of the workers has new keys
+        num_changed = torch.tensor(
+            [float(len(self._key_to_idx) != self._num_synced_keys)],
+            device=device,
+        )
+        distrib.all_reduce(num_changed)
+        if num_changed.item() > 0:
+            encoded_keys = torch.tensor(
+                list("\n".join(self.keys()).encode("utf-8")),
+                dtype=torch.uint8,
+            )
+            max_len = torch.tensor(
+                [float(encoded_keys.numel())], device=device
+            )
+            distrib.all_reduce(max_len, op=distrib.ReduceOp.MAX)
+            padded_keys = torch.zeros(
+                int(max_len.item()), dtype=torch.uint8, device=device
+            )
+            padded_keys[: encoded_keys.numel()] = encoded_keys
+            all_keys = [
+                torch.zeros_like(padded_keys)
+                for _ in range(distrib.get_world_size())
+            ]
+            distrib.all_gather(all_keys, padded_keys)
+
+            worker_keys = set()
+            for keys in all_keys:
+                decoded = bytes(keys.cpu().tolist()).rstrip(b"\0")
+                worker_keys.update(decoded.decode("utf-8").split("\n"))
+            worker_keys.discard("")
+            self.add_keys(sorted(worker_keys))
+
+        self._num_synced_keys = len(self._key_to_idx)
+
+    def keys(self) -> List[str]:
+        return list(self._key_to_idx.keys())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._key_to_idx
+
+    def __getitem__(self, key: str) -> torch.Tensor:
+        return self._buffer[self._key_to_idx[key]]
+
+    def stack(self, keys: List[str]) -> torch.Tensor:
+        r"""Returns a copy of the stats of keys stacked along the first dim"""
+        return self._buffer[[self._key_to_idx[k] for k in keys]]
+
+    def to_dict(self) -> Dict[str, torch.Tensor]:
+        return {k: self[k].clone() for k in self.keys()}
+
+    def load_dict(self, stats: Dict[str, torch.Tensor]) -> None:
+        self.add_keys(stats.keys())
+        for k, v in stats.items():
+            self[k].copy_(v)
+
+
+def inference_autocast(
+    device: torch.device, enabled: bool = True
+) -> ContextManager:
+    r"""Returns a context manager that runs policy inference in mixed
+    precision: bfloat16 on CPU and float16 on CUDA devices.
+
+    The model weights are not touched, so the learner keeps training
+    in float32. Floating point outputs computed under this context can be
+    in reduced precision and should be cast back with :py:`.float()`
+    before they are stored.
+
+    Args:
+        device: The device the policy runs on.
+        enabled: If False, a no-op context manager is returned.
+    """
+    if not enabled:
+        return contextlib.nullcontext()
+
+    if not hasattr(torch, "autocast"):
+        raise RuntimeError(
+            "Mixed precision inference requires torch.autocast (PyTorch 1.10+)"
+        )
+
+    dtype = torch.float16 if device.type == "cuda" else torch.bfloat16
+    return torch.autocast(device_type=device.type, dtype=dtype)
+
+
 @torch.no_grad()
 @profiling_wrapper.RangeContext("batch_obs")
 def batch_obs(
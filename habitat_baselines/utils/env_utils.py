@@ -8,12 +8,23 @@ import random
 from typing import List, Type, Union
 
 import habitat
-from habitat import Config, Env, RLEnv, VectorEnv, make_dataset
+from habitat import (
+    ActionRepeatRLEnv,
+    Config,
+    Env,
+    RLEnv,
+    VectorEnv,
+    make_dataset,
+)
+from habitat_baselines.common.obs_transformers import (
+    SingleObservationTransforms,
+    get_active_obs_transforms,
+)
 
 
 def make_env_fn(
     config: Config, env_class: Union[Type[Env], Type[RLEnv]]
-) -> Union[Env, RLEnv]:
+) -> Union[Env, RLEnv, ActionRepeatRLEnv]:
     r"""Creates an env of type env_class with specified config and rank.
     This is to be passed in as an argument when creating VectorEnv.
 
@@ -23,13 +34,23 @@ def make_env_fn(
         env_class: class type of the env to be created.
 
     Returns:
-        env object created according to specification.
+        env object created according to specification, wrapped in
+        ActionRepeatRLEnv if config.ACTION_REPEAT is greater than 1, which
+        is only supported for RLEnv classes.
     """
+    if config.ACTION_REPEAT > 1 and not issubclass(env_class, RLEnv):
+        raise RuntimeError(
+            f"ACTION_REPEAT is {config.ACTION_REPEAT} but {env_class.__name__}"
+            " is not an RLEnv, actions can only be repeated for RLEnv"
+            " environments"
+        )
     dataset = make_dataset(
         config.TASK_CONFIG.DATASET.TYPE, config=config.TASK_CONFIG.DATASET
     )
     env = env_class(config=config, dataset=dataset)
     env.seed(config.TASK_CONFIG.SEED)
+    if config.ACTION_REPEAT > 1:
+        env = ActionRepeatRLEnv(env, config.ACTION_REPEAT)
     return env
 
 
@@ -103,5 +124,13 @@ def construct_envs(
         make_env_fn=make_env_fn,
         env_fn_args=tuple(zip(configs, env_classes)),
         workers_ignore_signals=workers_ignore_signals,
+        per_step_info_keys=config.PER_STEP_INFO_KEYS
+        if config.INFO_ON_EPISODE_END_ONLY
+        else None,
+        obs_transform=SingleObservationTransforms(
+            get_active_obs_transforms(config)
+        )
+        if config.RL.POLICY.OBS_TRANSFORMS.APPLY_IN_WORKERS
+        else None,
     )
     return envs
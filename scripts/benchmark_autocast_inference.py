@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Facebook, Inc. and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+r"""Benchmarks rollout inference of PointNavResNetPolicy in float32 against
+mixed precision inference (see RL.PPO.use_autocast_inference).
+
+Reports the number of actions per second for each mode and the KL
+divergence between the action distributions computed in float32 and in
+mixed precision on the same (random) inputs.
+
+Example usage:
+    python scripts/benchmark_autocast_inference.py --batch-size 8 --device cpu
+"""
+
+import argparse
+import time
+
+import numpy as np
+import torch
+from gym import spaces
+
+from habitat_baselines.rl.ddppo.policy import PointNavResNetPolicy
+from habitat_baselines.utils.common import inference_autocast
+
+
+def make_inputs(policy, observation_space, batch_size, device):
+    observations = {
+        k: torch.as_tensor(
+            np.stack([space.sample() for _ in range(batch_size)]),
+            device=device,
+        )
+        for k, space in observation_space.spaces.items()
+    }
+    rnn_hidden_states = torch.randn(
+        batch_size,
+        policy.net.num_recurrent_layers,
+        policy.net.output_size,
+        device=device,
+    )
+    prev_actions = torch.randint(4, (batch_size, 1), device=device)
+    masks = torch.ones(batch_size, 1, dtype=torch.bool, device=device)
+    return observations, rnn_hidden_states, prev_actions, masks
+
+
+@torch.no_grad()
+def actions_per_second(policy, inputs, device, autocast, num_iters):
+    batch_size = inputs[1].size(0)
+    with inference_autocast(device, autocast):
+        for _ in range(5):
+            policy.act(*inputs)
+
+        if device.type == "cuda":
+            torch.cuda.synchronize(device)
+        t_start = time.perf_counter()
+        for _ in range(num_iters):
+            policy.act(*inputs)
+        if device.type == "cuda":
+            torch.cuda.synchronize(device)
+
+    return batch_size * num_iters / (time.perf_counter() - t_start)
+
+
+@torch.no_grad()
+def action_kl_divergence(policy, inputs, device):
+    features, _ = policy.net(*inputs)
+    logits = policy.action_distribution(features).logits
+
+    with inference_autocast(device):
+        features, _ = policy.net(*inputs)
+        autocast_logits = policy.action_distribution(features).logits
+
+    return torch.distributions.kl_divergence(
+        torch.distributions.Categorical(logits=logits.float()),
+        torch.distributions.Categorical(logits=autocast_logits.float()),
+    ).mean()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--resolution", type=int, default=256)
+    parser.add_argument("--backbone", type=str, default="resnet18")
+    parser.add_argument("--num-iters", type=int, default=50)
+    args = parser.parse_args()
+
+    device = torch.device(args.device)
+    res = args.resolution
+    observation_space = spaces.Dict(
+        {
+            "rgb": spaces.Box(0, 255, (res, res, 3), dtype=np.uint8),
+            "depth": spaces.Box(0.0, 1.0, (res, res, 1), dtype=np.float32),
+            "pointgoal_with_gps_compass": spaces.Box(
+                -np.inf, np.inf, (2,), dtype=np.float32
+            ),
+        }
+    )
+    policy = PointNavResNetPolicy(
+        observation_space,
+        spaces.Discrete(4),
+        backbone=args.backbone,
+        normalize_visual_inputs=True,
+    ).to(device)
+    policy.eval()
+
+    inputs = make_inputs(policy, observation_space, args.batch_size, device)
+
+    fp32_aps = actions_per_second(
+        policy, inputs, device, False, args.num_iters
+    )
+    autocast_aps = actions_per_second(
+        policy, inputs, device, True, args.num_iters
+    )
+    kl = action_kl_divergence(policy, inputs, device)
+
+    print(f"float32:   {fp32_aps:.1f} actions/s")
+    print(f"autocast:  {autocast_aps:.1f} actions/s")
+    print(f"speedup:   {autocast_aps / fp32_aps:.2f}x")
+    print(f"action KL: {kl.item():.3e}")
+
+
+if __name__ == "__main__":
+    main()
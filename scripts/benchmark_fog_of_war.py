@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Facebook, Inc. and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+r"""Benchmarks revealing the fog-of-war of the TopDownMap measure with the
+precomputed lines (reveal_fog_of_war) against drawing the lines one at a
+time (reveal_fog_of_war_by_lines).
+
+Reports the number of reveals per second of each on a synthetic map of
+rooms and the fraction of cells on which their fog-of-war masks disagree
+(the precomputed lines are at fixed angles).
+
+Example usage:
+    python scripts/benchmark_fog_of_war.py --map-size 1024 --max-line-len 250
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from habitat.utils.visualizations import fog_of_war, maps
+
+
+def make_top_down_map(map_size, room_size, rng):
+    top_down_map = np.full(
+        (map_size, map_size), maps.MAP_VALID_POINT, dtype=np.uint8
+    )
+    # Walls between rooms with a door in each of them
+    for start in range(0, map_size, room_size):
+        top_down_map[start : start + 2] = maps.MAP_INVALID_POINT
+        top_down_map[:, start : start + 2] = maps.MAP_INVALID_POINT
+    for start in range(0, map_size, room_size):
+        for door in rng.randint(0, map_size - room_size // 4, size=2):
+            top_down_map[start : start + 2, door : door + room_size // 4] = 1
+            top_down_map[door : door + room_size // 4, start : start + 2] = 1
+    return top_down_map
+
+
+def reveals_per_second(reveal, top_down_map, poses, args):
+    fog_of_war_mask = np.zeros_like(top_down_map)
+    for point, angle in poses[:3]:
+        reveal(
+            top_down_map,
+            fog_of_war_mask,
+            point,
+            angle,
+            fov=args.fov,
+            max_line_len=args.max_line_len,
+        )
+
+    t_start = time.perf_counter()
+    for point, angle in poses:
+        fog_of_war_mask = reveal(
+            top_down_map,
+            fog_of_war_mask,
+            point,
+            angle,
+            fov=args.fov,
+            max_line_len=args.max_line_len,
+        )
+    return len(poses) / (time.perf_counter() - t_start), fog_of_war_mask
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--map-size", type=int, default=1024)
+    parser.add_argument("--room-size", type=int, default=200)
+    parser.add_argument("--max-line-len", type=float, default=250.0)
+    parser.add_argument("--fov", type=float, default=90)
+    parser.add_argument("--num-steps", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.RandomState(0)
+    top_down_map = make_top_down_map(args.map_size, args.room_size, rng)
+    poses = [
+        (
+            rng.randint(0, args.map_size, size=2),
+            rng.uniform(0, 2 * np.pi),
+        )
+        for _ in range(args.num_steps)
+    ]
+
+    # Don't count building the table of lines
+    t_start = time.perf_counter()
+    fog_of_war.get_ray_table(args.max_line_len)
+    table_time = time.perf_counter() - t_start
+
+    table_rps, table_mask = reveals_per_second(
+        fog_of_war.reveal_fog_of_war, top_down_map, poses, args
+    )
+    lines_rps, lines_mask = reveals_per_second(
+        fog_of_war.reveal_fog_of_war_by_lines, top_down_map, poses, args
+    )
+
+    print(f"ray table:  {table_rps:.1f} reveals/s")
+    print(f"lines:      {lines_rps:.1f} reveals/s")
+    print(f"speedup:    {table_rps / lines_rps:.2f}x")
+    print(f"table time: {table_time:.3f}s")
+    print(f"mismatch:   {np.mean(table_mask != lines_mask):.2e}")
+
+
+if __name__ == "__main__":
+    main()
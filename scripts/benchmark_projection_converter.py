@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Facebook, Inc. and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+r"""Benchmarks the ProjectionConverters used by the CubeMap2Equirect,
+CubeMap2Fisheye and Equirect2CubeMap observation transformers.
+
+Reports the number of converted images per second of the converter, which
+samples every output pixel from its source image only, and of the dense
+conversion that samples every input image for every output pixel and sums
+the results, as well as the largest difference between the two.
+
+Example usage:
+    python scripts/benchmark_projection_converter.py --batch-size 4 --resolution 256
+"""
+
+import argparse
+import time
+
+import torch
+import torch.nn.functional as F
+
+from habitat_baselines.common.obs_transformers import (
+    Cube2Equirect,
+    Cube2Fisheye,
+    Equirect2Cube,
+)
+
+
+def dense_convert(converter, batch):
+    batch_size, ch, in_h, in_w = batch.size()
+    out_h, out_w = converter.output_models[0].size()
+    num_input_set = batch_size // converter.input_len
+    multi_out_batch = (
+        batch.view(num_input_set, converter.input_len, ch, in_h, in_w)
+        .repeat(1, converter.output_len, 1, 1, 1)
+        .view(converter.output_len * batch_size, ch, in_h, in_w)
+    )
+    grids = converter.grids.to(batch.device)
+    grids = grids.repeat(num_input_set, 1, 1, 1, 1).view(
+        batch_size * converter.output_len, out_h, out_w, 2
+    )
+    output = F.grid_sample(
+        multi_out_batch, grids, align_corners=True, padding_mode="zeros"
+    )
+    return output.view(
+        num_input_set * converter.output_len,
+        converter.input_len,
+        ch,
+        out_h,
+        out_w,
+    ).sum(dim=1)
+
+
+@torch.no_grad()
+def images_per_second(convert, batch, device, num_iters):
+    for _ in range(3):
+        output = convert(batch)
+
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+    t_start = time.perf_counter()
+    for _ in range(num_iters):
+        output = convert(batch)
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+
+    return output.size(0) * num_iters / (time.perf_counter() - t_start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--resolution", type=int, default=256)
+    parser.add_argument("--channels", type=int, default=3)
+    parser.add_argument("--num-iters", type=int, default=10)
+    args = parser.parse_args()
+
+    device = torch.device(args.device)
+    res = args.resolution
+    converters = {
+        "cube2equirect": (Cube2Equirect(res, 2 * res), (res, res)),
+        "cube2fisheye": (
+            Cube2Fisheye(
+                res, res, 180, res / 2, res / 2, res / 4, res / 4, 0.2, 0.2
+            ),
+            (res, res),
+        ),
+        "equirect2cube": (Equirect2Cube(res, res), (res, 2 * res)),
+    }
+
+    for name, (converter, (in_h, in_w)) in converters.items():
+        batch = torch.rand(
+            args.batch_size * converter.input_len,
+            args.channels,
+            in_h,
+            in_w,
+            device=device,
+        )
+        converted_ips = images_per_second(
+            converter.to_converted_tensor, batch, device, args.num_iters
+        )
+        dense_ips = images_per_second(
+            lambda b: dense_convert(converter, b),
+            batch,
+            device,
+            args.num_iters,
+        )
+        max_diff = (
+            (
+                converter.to_converted_tensor(batch)
+                - dense_convert(converter, batch)
+            )
+            .abs()
+            .max()
+        )
+
+        print(f"{name}:")
+        print(f"  converter: {converted_ips:.1f} images/s")
+        print(f"  dense:     {dense_ips:.1f} images/s")
+        print(f"  speedup:   {converted_ips / dense_ips:.2f}x")
+        print(f"  max diff:  {max_diff.item():.3e}")
+
+
+if __name__ == "__main__":
+    main()
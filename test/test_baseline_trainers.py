@@ -12,7 +12,9 @@ import random
 from copy import deepcopy
 from glob import glob
 
+import numpy as np
 import pytest
+from gym import spaces
 
 from habitat.core.vector_env import VectorEnv
 
@@ -22,11 +24,24 @@ try:
 
     from habitat_baselines.common.base_trainer import BaseRLTrainer
     from habitat_baselines.common.baseline_registry import baseline_registry
+    from habitat_baselines.common.obs_transformers import (
+        CenterCropper,
+        Cube2Equirect,
+        ResizeCenterCrop,
+        ResizeShortestEdge,
+        SingleObservationTransforms,
+        apply_obs_transforms_batch,
+        apply_obs_transforms_obs_space,
+        fuse_obs_transforms,
+    )
     from habitat_baselines.config.default import get_config
+    from habitat_baselines.rl.ppo.policy import TracedPolicyAct
     from habitat_baselines.run import execute_exp, run_exp
     from habitat_baselines.utils.common import (
         ObservationBatchingCache,
+        RunningEpisodeStats,
         batch_obs,
+        inference_autocast,
     )
 
     baseline_installed = True
@@ -224,6 +239,101 @@ def test_cubemap_stiching(
         raise ValueError(f"Unknown camera name: {camera}")
 
 
+@pytest.mark.skipif(
+    not baseline_installed, reason="baseline sub-module not installed"
+)
+@pytest.mark.parametrize("channels_last", [True, False])
+@pytest.mark.parametrize("dtype", ["float32", "uint8"])
+def test_fused_resize_center_crop(channels_last, dtype):
+    dtype = getattr(torch, dtype)
+    resize = ResizeShortestEdge(64, channels_last=channels_last)
+    crop = CenterCropper((48, 56), channels_last=channels_last)
+    fused = fuse_obs_transforms([resize, crop])
+    assert len(fused) == 1 and isinstance(fused[0], ResizeCenterCrop)
+
+    obs_space = spaces.Dict(
+        {"rgb": spaces.Box(0, 255, (120, 160, 3), dtype=np.uint8)}
+    )
+    assert apply_obs_transforms_obs_space(
+        obs_space, fused
+    ) == apply_obs_transforms_obs_space(obs_space, [resize, crop])
+
+    for shape in [(4, 120, 160), (4, 90, 70)]:
+        if channels_last:
+            shape = shape + (3,)
+        else:
+            shape = shape[:1] + (3,) + shape[1:]
+        rgb = (torch.rand(shape) * 255).to(dtype)
+
+        expected = apply_obs_transforms_batch({"rgb": rgb}, [resize, crop])
+        actual = apply_obs_transforms_batch({"rgb": rgb}, fused)
+        assert actual["rgb"].size() == expected["rgb"].size()
+        assert actual["rgb"].dtype == dtype
+        # Integer outputs are truncated, so rounding errors may change the
+        # result by one
+        assert torch.allclose(
+            actual["rgb"].float(),
+            expected["rgb"].float(),
+            atol=1.0 if dtype == torch.uint8 else 1e-3,
+        )
+
+
+@pytest.mark.skipif(
+    not baseline_installed, reason="baseline sub-module not installed"
+)
+def test_single_observation_transforms():
+    obs_transforms = [ResizeShortestEdge(32), CenterCropper(24)]
+    obs_space = spaces.Dict(
+        {
+            "rgb": spaces.Box(0, 255, (64, 96, 3), dtype=np.uint8),
+            "pointgoal": spaces.Box(-1.0, 1.0, (2,), dtype=np.float32),
+        }
+    )
+    transformed_space = apply_obs_transforms_obs_space(
+        obs_space, obs_transforms
+    )
+
+    observations = [obs_space.sample() for _ in range(2)]
+    expected = apply_obs_transforms_batch(
+        batch_obs(deepcopy(observations)), obs_transforms
+    )
+
+    single_obs_transforms = SingleObservationTransforms(obs_transforms)
+    transformed = [single_obs_transforms(obs) for obs in observations]
+    for k, space in transformed_space.spaces.items():
+        assert transformed[0][k].shape == space.shape
+        assert isinstance(transformed[0][k], np.ndarray)
+        assert torch.equal(
+            torch.stack([torch.as_tensor(obs[k]) for obs in transformed]),
+            expected[k],
+        )
+
+
+@pytest.mark.skipif(
+    not baseline_installed, reason="baseline sub-module not installed"
+)
+def test_projection_converter_face_index_maps():
+    converter = Cube2Equirect(32, 64)
+    num_sets, ch, in_h, in_w = 2, 2, 256, 256
+    batch = torch.rand(num_sets * converter.input_len, ch, in_h, in_w)
+    output = converter(batch)
+    assert output.size() == (num_sets, ch, 32, 64)
+    assert (converter.face_index_maps >= 0).all()
+
+    # Dense reference: every input image is sampled for every output pixel
+    # and the samples are summed
+    grids = converter.grids[:, 0]
+    expected = torch.nn.functional.grid_sample(
+        batch,
+        grids.repeat(num_sets, 1, 1, 1),
+        align_corners=True,
+        padding_mode="zeros",
+    )
+    expected = expected.view(num_sets, converter.input_len, ch, 32, 64).sum(1)
+    assert torch.allclose(output, expected, atol=1e-4)
+    assert len(converter._stacked_grids_cache) == 1
+
+
 @pytest.mark.skipif(
     not baseline_installed, reason="baseline sub-module not installed"
 )
@@ -362,3 +472,192 @@ def test_batch_obs(sensor_device, batched_device):
     ]
 
     _ = batch_obs(sensors, device=batched_device, cache=cache)
+
+
+@pytest.mark.skipif(
+    not baseline_installed, reason="baseline sub-module not installed"
+)
+def test_observation_batching_cache():
+    sensor = torch.zeros(16, 16)
+    nbytes = 4 * sensor.numel() * sensor.element_size()
+    cache = ObservationBatchingCache(max_bytes=2 * nbytes)
+
+    first = cache.get(4, "depth", sensor)
+    assert cache.misses == 1 and cache.num_bytes == nbytes
+
+    # Fewer observations (i.e. paused environments) reuse the buffer
+    smaller = cache.get(2, "depth", sensor)
+    assert smaller.shape == (2, 16, 16)
+    assert np.shares_memory(first, smaller)
+    assert cache.hits == 1 and cache.misses == 1
+
+    cache.get(4, "rgb", sensor)
+    cache.get(4, "depth", sensor)
+    assert cache.num_bytes == 2 * nbytes
+
+    # Over budget, the least recently used buffer is freed
+    cache.get(4, "semantic", sensor)
+    assert cache.num_bytes == 2 * nbytes
+    cache.get(4, "depth", sensor)
+    assert cache.hits == 3
+    cache.get(4, "rgb", sensor)
+    assert cache.misses == 4
+
+    # More observations than the buffer holds replace it
+    cache.get(8, "rgb", sensor)
+    assert cache.misses == 5
+    assert cache.num_bytes == 2 * nbytes
+
+
+@pytest.mark.skipif(
+    not baseline_installed, reason="baseline sub-module not installed"
+)
+def test_running_episode_stats():
+    num_envs = 4
+    stats = RunningEpisodeStats(num_envs)
+    stats.add_keys(["spl", "success"])
+
+    # No episode ended, nothing should change
+    stats.add([], [])
+    assert stats.stack(stats.keys()).sum().item() == 0
+
+    stats.add(
+        [1, 3],
+        [
+            dict(count=1.0, reward=2.0, spl=0.5, success=1.0),
+            dict(count=1.0, reward=1.0, spl=0.25, collisions=3.0),
+        ],
+    )
+    stats.add([3], [dict(count=1.0, reward=1.0, spl=0.25, success=1.0)])
+
+    assert "collisions" in stats
+    assert stats["count"][:, 0].tolist() == [0.0, 1.0, 0.0, 2.0]
+    assert stats["reward"][:, 0].tolist() == [0.0, 2.0, 0.0, 2.0]
+    assert stats["spl"][:, 0].tolist() == [0.0, 0.5, 0.0, 0.5]
+    assert stats["success"][:, 0].tolist() == [0.0, 1.0, 0.0, 1.0]
+    assert stats["collisions"][:, 0].tolist() == [0.0, 0.0, 0.0, 3.0]
+
+    ordering = sorted(stats.keys())
+    stacked = stats.stack(ordering)
+    assert list(stacked.size()) == [len(ordering), num_envs, 1]
+
+    restored = RunningEpisodeStats(num_envs)
+    restored.load_dict(stats.to_dict())
+    assert torch.equal(restored.stack(ordering), stacked)
+
+
+@pytest.mark.skipif(
+    not baseline_installed, reason="baseline sub-module not installed"
+)
+@pytest.mark.parametrize(
+    "policy_name", ["PointNavResNetPolicy", "PointNavBaselinePolicy"]
+)
+def test_traced_policy_act(policy_name):
+    observation_space = spaces.Dict(
+        {
+            "rgb": spaces.Box(0, 255, (64, 64, 3), dtype=np.uint8),
+            "depth": spaces.Box(0.0, 1.0, (64, 64, 1), dtype=np.float32),
+            "pointgoal_with_gps_compass": spaces.Box(
+                -np.inf, np.inf, (2,), dtype=np.float32
+            ),
+        }
+    )
+    policy = baseline_registry.get_policy(policy_name)(
+        observation_space, spaces.Discrete(4)
+    )
+    policy.eval()
+    traced_policy = TracedPolicyAct(policy)
+
+    for batch_size in [4, 3, 4]:
+        observations = {
+            k: torch.as_tensor(
+                np.stack([space.sample() for _ in range(batch_size)])
+            )
+            for k, space in observation_space.spaces.items()
+        }
+        rnn_hidden_states = torch.randn(
+            batch_size,
+            policy.net.num_recurrent_layers,
+            policy.net.output_size,
+        )
+        prev_actions = torch.randint(4, (batch_size, 1))
+        masks = torch.rand(batch_size, 1) > 0.5
+
+        with torch.no_grad():
+            eager_outputs = policy.act(
+                observations,
+                rnn_hidden_states,
+                prev_actions,
+                masks,
+                deterministic=True,
+            )
+            traced_outputs = traced_policy.act(
+                observations,
+                rnn_hidden_states,
+                prev_actions,
+                masks,
+                deterministic=True,
+            )
+
+        for eager, traced in zip(eager_outputs, traced_outputs):
+            assert eager.size() == traced.size()
+            assert torch.allclose(eager, traced, atol=1e-5)
+
+    # One trace per batch size
+    assert len(traced_policy._traces) == 2
+
+    # Mixed precision inference is traced separately
+    with torch.no_grad(), inference_autocast(torch.device("cpu")):
+        traced_policy.act(observations, rnn_hidden_states, prev_actions, masks)
+    assert len(traced_policy._traces) == 3
+
+
+@pytest.mark.skipif(
+    not baseline_installed, reason="baseline sub-module not installed"
+)
+def test_static_visual_features_replace_visual_observations():
+    observation_space = spaces.Dict(
+        {
+            "rgb": spaces.Box(0, 255, (64, 64, 3), dtype=np.uint8),
+            "depth": spaces.Box(0.0, 1.0, (64, 64, 1), dtype=np.float32),
+            "pointgoal_with_gps_compass": spaces.Box(
+                -np.inf, np.inf, (2,), dtype=np.float32
+            ),
+        }
+    )
+    policy = baseline_registry.get_policy("PointNavResNetPolicy")(
+        observation_space, spaces.Discrete(4)
+    )
+    policy.eval()
+    encoder = policy.net.visual_encoder
+    assert set(encoder.visual_keys) == {"rgb", "depth"}
+
+    batch_size = 3
+    observations = {
+        k: torch.as_tensor(
+            np.stack([space.sample() for _ in range(batch_size)])
+        )
+        for k, space in observation_space.spaces.items()
+    }
+    rnn_hidden_states = torch.randn(
+        batch_size, policy.net.num_recurrent_layers, policy.net.output_size
+    )
+    prev_actions = torch.randint(4, (batch_size, 1))
+    masks = torch.ones(batch_size, 1, dtype=torch.bool)
+
+    with torch.no_grad():
+        features = {
+            k: v
+            for k, v in observations.items()
+            if k not in encoder.visual_keys
+        }
+        features["visual_features"] = encoder(observations)
+
+        expected, _ = policy.net(
+            observations, rnn_hidden_states, prev_actions, masks
+        )
+        from_features, _ = policy.net(
+            features, rnn_hidden_states, prev_actions, masks
+        )
+
+    assert torch.allclose(expected, from_features, atol=1e-6)
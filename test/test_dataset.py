@@ -353,6 +353,56 @@ def test_iterator_scene_switching_steps():
     )
 
 
+def test_iterator_peek():
+    # The iterator shuffles the episodes of the dataset in place
+    expected = list(
+        islice(
+            _construct_dataset(100).get_episode_iterator(shuffle=True, seed=1),
+            300,
+        )
+    )
+
+    dataset = _construct_dataset(100)
+    episode_iter = dataset.get_episode_iterator(shuffle=True, seed=1)
+    episodes = []
+    for _ in range(300):
+        peeked = episode_iter.peek()
+        assert episode_iter.peek() is peeked
+        episodes.append(next(episode_iter))
+        assert episodes[-1] is peeked
+    assert episodes == expected
+
+    episode_iter = dataset.get_episode_iterator(
+        shuffle=False, cycle=False, max_scene_repeat_episodes=5
+    )
+    episodes = []
+    while episode_iter.peek() is not None:
+        episodes.append(next(episode_iter))
+    # The peeked episodes are kept on forced scene switches
+    assert sorted(episodes) == sorted(dataset.episodes)
+
+
+def test_scene_prefetcher(tmp_path):
+    from habitat.core.utils import ScenePrefetcher, get_scene_files
+
+    for name in ["scene.glb", "scene.navmesh", "scene_semantic.ply"]:
+        (tmp_path / name).write_bytes(b"0" * 1000)
+    (tmp_path / "scene2.glb").write_bytes(b"0" * 1000)
+    scene_id = str(tmp_path / "scene.glb")
+    assert get_scene_files(scene_id) == [
+        str(tmp_path / name)
+        for name in ["scene.glb", "scene.navmesh", "scene_semantic.ply"]
+    ]
+
+    prefetcher = ScenePrefetcher(chunk_size=100)
+    prefetcher.prefetch(scene_id)
+    prefetcher.prefetch(scene_id)
+    prefetcher.prefetch(str(tmp_path / "missing.glb"))
+    prefetcher.join()
+    assert prefetcher.num_prefetched_files == 3
+    prefetcher.close()
+
+
 def test_preserve_order():
     dataset = _construct_dataset(100)
     episodes = sorted(dataset.episodes, reverse=True, key=lambda x: x.scene_id)
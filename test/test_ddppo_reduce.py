@@ -20,7 +20,11 @@ from torch import nn
 from habitat_baselines.common.rollout_storage import RolloutStorage
 from habitat_baselines.config.default import get_config
 from habitat_baselines.rl.ddppo.algo import DDPPO
+from habitat_baselines.rl.ddppo.policy.running_mean_and_var import (
+    RunningMeanAndVar,
+)
 from habitat_baselines.rl.ppo.policy import PointNavBaselinePolicy
+from habitat_baselines.utils.common import RunningEpisodeStats
 
 
 def _worker_fn(
@@ -124,3 +128,130 @@ def test_ddppo_reduce(unused_params: bool):
         args=(world_size, 8748 + int(unused_params), unused_params),
         nprocs=world_size,
     )
+
+
+def _running_mean_and_var_worker_fn(
+    world_rank: int, world_size: int, port: int
+):
+    tcp_store = distrib.TCPStore(  # type: ignore
+        "127.0.0.1", port, world_size, world_rank == 0
+    )
+    distrib.init_process_group(
+        "gloo", store=tcp_store, rank=world_rank, world_size=world_size
+    )
+
+    rng = torch.Generator().manual_seed(0)
+    batches = [
+        torch.randn(2 + rank, 3, 4, 4, generator=rng) * 2.0 + 1.0
+        for rank in range(world_size)
+    ]
+
+    running_mean_and_var = RunningMeanAndVar(3)
+    running_mean_and_var(batches[world_rank])
+
+    all_inputs = torch.cat(batches, 0).transpose(0, 1).reshape(3, -1)
+    assert int(running_mean_and_var._count) == sum(b.size(0) for b in batches)
+    assert torch.allclose(
+        running_mean_and_var._mean.view(-1), all_inputs.mean(-1), atol=1e-5
+    )
+    assert torch.allclose(
+        running_mean_and_var._var.view(-1),
+        all_inputs.var(-1, unbiased=False),
+        atol=1e-4,
+    )
+
+
+def test_running_mean_and_var_reduce():
+    world_size = 2
+    torch.multiprocessing.spawn(
+        _running_mean_and_var_worker_fn,
+        args=(world_size, 8750),
+        nprocs=world_size,
+    )
+
+
+def _running_episode_stats_worker_fn(
+    world_rank: int, world_size: int, port: int
+):
+    tcp_store = distrib.TCPStore(  # type: ignore
+        "127.0.0.1", port, world_size, world_rank == 0
+    )
+    distrib.init_process_group(
+        "gloo", store=tcp_store, rank=world_rank, world_size=world_size
+    )
+
+    # The workers see the metrics of their first episodes at different
+    # updates
+    episode_stats = [
+        [dict(count=1.0, reward=1.0, spl=0.5), dict(count=1.0, reward=2.0)],
+        [
+            dict(count=1.0, reward=1.0),
+            dict(count=1.0, reward=2.0, success=1.0, spl=0.25),
+        ],
+    ]
+    stats = RunningEpisodeStats(2)
+    for update, episode in enumerate(episode_stats[world_rank]):
+        stats.add([update], [episode])
+        stats.sync_keys()
+
+        stats_ordering = sorted(stats.keys())
+        reduced = stats.stack(stats_ordering)
+        distrib.all_reduce(reduced)
+
+        expected_keys = ["count", "reward", "spl"]
+        if update > 0:
+            expected_keys.append("success")
+        assert stats_ordering == sorted(expected_keys)
+        reduced = dict(zip(stats_ordering, reduced.sum(1).view(-1)))
+        assert reduced["count"].item() == 2 * (update + 1)
+        assert reduced["spl"].item() == (0.5 if update == 0 else 0.75)
+
+
+def test_running_episode_stats_sync_keys():
+    world_size = 2
+    torch.multiprocessing.spawn(
+        _running_episode_stats_worker_fn,
+        args=(world_size, 8751),
+        nprocs=world_size,
+    )
+
+
+def test_running_mean_and_var():
+    batches = [torch.randn(4, 3, 8, 8) * 3.0 + 2.0 for _ in range(3)]
+
+    running_mean_and_var = RunningMeanAndVar(3)
+    for batch in batches:
+        running_mean_and_var(batch)
+
+    all_inputs = torch.cat(batches, 0).transpose(0, 1).reshape(3, -1)
+    mean = running_mean_and_var._mean.clone()
+    var = running_mean_and_var._var.clone()
+    assert torch.allclose(mean.view(-1), all_inputs.mean(-1), atol=1e-5)
+    assert torch.allclose(
+        var.view(-1), all_inputs.var(-1, unbiased=False), atol=1e-4
+    )
+
+    # Frozen statistics are used as-is in eval mode
+    running_mean_and_var.eval()
+    x = torch.randn(2, 3, 8, 8)
+    expected = (x - mean) / torch.sqrt(torch.clamp(var, min=1e-2))
+    assert torch.allclose(running_mean_and_var(x), expected, atol=1e-5)
+    assert torch.equal(running_mean_and_var._mean, mean)
+
+    # The cached normalization parameters follow loaded statistics
+    state_dict = running_mean_and_var.state_dict()
+    state_dict["_mean"] = torch.zeros_like(mean)
+    state_dict["_var"] = torch.ones_like(var)
+    running_mean_and_var.load_state_dict(state_dict)
+    assert torch.allclose(running_mean_and_var(x), x)
+
+    # Only the first minibatch after train() updates the statistics
+    running_mean_and_var = RunningMeanAndVar(3, update_once_per_rollout=True)
+    running_mean_and_var.train()
+    running_mean_and_var(batches[0])
+    running_mean_and_var(batches[1])
+    assert int(running_mean_and_var._count) == batches[0].size(0)
+
+    running_mean_and_var.train()
+    running_mean_and_var(batches[1])
+    assert int(running_mean_and_var._count) == 2 * batches[0].size(0)
@@ -11,6 +11,7 @@ import gym.spaces as spaces
 import numpy as np
 import pytest
 
+import habitat
 import habitat_baselines.utils.env_utils
 import habitat_baselines.utils.gym_definitions
 from habitat_baselines.common.environments import get_env_class
@@ -19,6 +20,17 @@ from habitat_baselines.utils.gym_adapter import HabGymWrapper
 from habitat_baselines.utils.render_wrapper import HabRenderWrapper
 
 
+def test_action_repeat_requires_rl_env():
+    config = baselines_get_config(
+        "habitat_baselines/config/pointnav/ppo_pointnav.yaml",
+        ["ACTION_REPEAT", "2"],
+    )
+    with pytest.raises(RuntimeError, match="RLEnv"):
+        habitat_baselines.utils.env_utils.make_env_fn(
+            env_class=habitat.Env, config=config
+        )
+
+
 @pytest.mark.parametrize(
     "config_file,overrides,expected_action_dim",
     [
@@ -327,6 +327,38 @@ def test_rl_env(gpu2gpu):
         assert done is True, "done should be true after STOP action"
 
 
+def test_action_repeat_rl_env():
+    config = get_config(CFG_TEST)
+    if not os.path.exists(config.SIMULATOR.SCENE):
+        pytest.skip("Please download Habitat test data to data folder.")
+
+    num_repeats = 3
+    max_steps = config.ENVIRONMENT.MAX_EPISODE_STEPS
+    with DummyRLEnv(config=config, dataset=None) as rl_env:
+        rl_env.get_reward = lambda observations: 1.0
+        env = habitat.ActionRepeatRLEnv(rl_env, num_repeats)
+
+        env.reset()
+        observations, reward, done, info = env.step(
+            action=sample_non_stop_action(env.action_space)
+        )
+        assert reward == num_repeats
+        assert env.habitat_env._elapsed_steps == num_repeats
+        assert not done
+
+        # The repetition stops on the step the episode ends on
+        num_steps = 1
+        while not done:
+            observations, reward, done, info = env.step(
+                action=sample_non_stop_action(env.action_space)
+            )
+            num_steps += 1
+        assert num_steps == -(-max_steps // num_repeats)
+        assert env.habitat_env._elapsed_steps == max_steps
+        assert reward == max_steps - (num_steps - 1) * num_repeats
+        assert env.habitat_env.sim._render_enabled
+
+
 def _make_dummy_env_func(config, dataset, env_id):
     return DummyRLEnv(config=config, dataset=dataset, env_ind=env_id)
 
@@ -373,6 +405,76 @@ def test_vec_env_call_func():
         assert env_ids == list(range(num_envs))
 
 
+class _HeavyInfoRLEnv(DummyRLEnv):
+    def get_info(self, observations):
+        return {
+            "distance_to_goal": 1.0,
+            "top_down_map": np.zeros((256, 256), dtype=np.uint8),
+        }
+
+
+def _make_heavy_info_env_func(config, dataset, env_id):
+    return _HeavyInfoRLEnv(config=config, dataset=dataset, env_ind=env_id)
+
+
+def test_vec_env_per_step_info_keys():
+    configs, datasets = _load_test_data()
+    num_envs = len(configs)
+    env_fn_args = tuple(zip(configs, datasets, range(num_envs)))
+    with habitat.VectorEnv(
+        make_env_fn=_make_heavy_info_env_func,
+        env_fn_args=env_fn_args,
+        multiprocessing_start_method="forkserver",
+        per_step_info_keys=["distance_to_goal"],
+    ) as envs:
+        envs.reset()
+
+        for _ in range(configs[0].ENVIRONMENT.MAX_EPISODE_STEPS):
+            outputs = envs.step(
+                sample_non_stop_action(envs.action_spaces[0], num_envs)
+            )
+            _, _, dones, infos = [list(x) for x in zip(*outputs)]
+            for done, info in zip(dones, infos):
+                if done:
+                    assert set(info.keys()) == {
+                        "distance_to_goal",
+                        "top_down_map",
+                    }
+                else:
+                    assert set(info.keys()) == {"distance_to_goal"}
+
+        assert all(dones), "dones should be true after max_episode steps"
+
+
+def _drop_depth(observations):
+    observations.pop("depth", None)
+    observations["transformed"] = np.ones(1)
+    return observations
+
+
+def test_vec_env_obs_transform():
+    configs, datasets = _load_test_data()
+    num_envs = len(configs)
+    env_fn_args = tuple(zip(configs, datasets, range(num_envs)))
+    with habitat.VectorEnv(
+        make_env_fn=_make_dummy_env_func,
+        env_fn_args=env_fn_args,
+        multiprocessing_start_method="forkserver",
+        obs_transform=_drop_depth,
+    ) as envs:
+        assert "depth" in envs.observation_spaces[0].spaces
+        for observations in envs.reset():
+            assert "transformed" in observations
+            assert "depth" not in observations
+
+        outputs = envs.step(
+            sample_non_stop_action(envs.action_spaces[0], num_envs)
+        )
+        for observations, _, _, _ in outputs:
+            assert "transformed" in observations
+            assert "depth" not in observations
+
+
 def test_close_with_paused():
     configs, datasets = _load_test_data()
     num_envs = len(configs)
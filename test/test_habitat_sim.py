@@ -119,3 +119,89 @@ def test_sim_geodesic_distance():
                     ]
                 ),
             ), "Geodesic distance for multi target setup isn't equal to separate single target calls."
+
+
+def test_sim_render_on_demand_sensors():
+    config = get_config()
+    if not os.path.exists(config.SIMULATOR.SCENE):
+        pytest.skip("Please download Habitat test data to data folder.")
+    config.defrost()
+    config.SIMULATOR.AGENT_0.SENSORS = ["RGB_SENSOR", "DEPTH_SENSOR"]
+    config.SIMULATOR.RGB_SENSOR.RENDER_ON_DEMAND = True
+    config.freeze()
+    with make_sim(config.SIMULATOR.TYPE, config=config.SIMULATOR) as sim:
+        # Sensors are rendered selectively through habitat_sim's sensor
+        # objects
+        assert set(sim._sensors.keys()) == {"rgb", "depth"}
+        for sensor in sim._sensors.values():
+            assert callable(sensor.draw_observation)
+            assert callable(sensor.get_observation)
+
+        obs = sim.reset()
+        prev_rgb = obs["rgb"].copy()
+
+        # The on demand sensor keeps its last rendered observation
+        obs = sim.step(HabitatSimActions.TURN_LEFT)
+        assert np.array_equal(obs["rgb"], prev_rgb)
+
+        sim.set_render_on_demand_sensors(True)
+        obs = sim.step(HabitatSimActions.TURN_LEFT)
+        assert not np.array_equal(obs["rgb"], prev_rgb)
+
+        # Intermediate action repeat steps are not rendered
+        sim.set_render_enabled(False)
+        prev_depth = obs["depth"].copy()
+        obs = sim.step(HabitatSimActions.TURN_LEFT)
+        assert np.array_equal(obs["depth"], prev_depth)
+
+
+def test_sim_cached_agent_state():
+    config = get_config()
+    if not os.path.exists(config.SIMULATOR.SCENE):
+        pytest.skip("Please download Habitat test data to data folder.")
+    with make_sim(config.SIMULATOR.TYPE, config=config.SIMULATOR) as sim:
+        sim.reset()
+        state = sim.get_cached_agent_state()
+        assert sim.get_cached_agent_state() is state
+
+        sim.step(HabitatSimActions.MOVE_FORWARD)
+        new_state = sim.get_cached_agent_state()
+        assert new_state is not state
+        assert np.allclose(new_state.position, sim.get_agent_state().position)
+
+        position = sim.sample_navigable_point()
+        sim.set_agent_state(position, new_state.rotation)
+        assert np.allclose(sim.get_cached_agent_state().position, position)
+
+
+def test_scene_cache(tmp_path):
+    from habitat.sims.habitat_simulator.habitat_simulator import SceneCache
+
+    scenes = []
+    for name in ["a", "b", "c"]:
+        scene = tmp_path / f"{name}.glb"
+        scene.write_bytes(b"0" * 100)
+        (tmp_path / f"{name}.navmesh").write_bytes(b"0" * 10)
+        scenes.append(str(scene))
+    a, b, c = scenes
+    assert SceneCache.estimate_scene_size(a) == 110
+
+    cache = SceneCache(max_size=2)
+    assert not cache.add(a)
+    assert not cache.add(b)
+    assert not cache.add(a)
+    # c does not fit, all the other scenes are released
+    assert cache.add(c)
+    assert c in cache and a not in cache and b not in cache
+    assert (cache.num_hits, cache.num_misses, cache.num_evictions) == (1, 3, 1)
+
+    # The old behaviour, the scene is released on every switch
+    cache = SceneCache(max_size=1)
+    assert not cache.add(a)
+    assert cache.add(b)
+
+    cache = SceneCache(max_size=3, memory_budget=250)
+    assert not cache.add(a)
+    assert not cache.add(b)
+    assert cache.add(c)
+    assert cache.memory_usage == 110
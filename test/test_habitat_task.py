@@ -99,3 +99,102 @@ def test_task_actions_sampling(config_file):
             env.step(action)
             agent_state = env.sim.get_agent_state()
             habitat.logger.info(agent_state)
+
+
+class _StepMeasure(habitat.Measure):
+    def __init__(self, uuid, dependencies=()):
+        self._uuid = uuid
+        self._dependencies = list(dependencies)
+        self.num_updates = 0
+        super().__init__()
+
+    def _get_uuid(self, *args, **kwargs):
+        return self._uuid
+
+    def get_dependencies(self):
+        return self._dependencies
+
+    def reset_metric(self, *args, task, **kwargs):
+        self.num_updates = 0
+        self.update_metric(*args, task=task, **kwargs)
+
+    def update_metric(self, *args, task, step, **kwargs):
+        self.num_updates += 1
+        self._metric = step + sum(
+            task.measurements.measures[dep].get_metric()
+            for dep in self._dependencies
+        )
+
+
+def test_lazy_measures():
+    import pickle
+
+    from habitat.core.embodied_task import Measurements
+
+    class _Task:
+        pass
+
+    task = _Task()
+    task.measurements = Measurements(
+        [
+            _StepMeasure("spl", dependencies=["success"]),
+            _StepMeasure("success", dependencies=["distance"]),
+            _StepMeasure("distance"),
+            _StepMeasure("top_down_map"),
+        ],
+        lazy_measures=["distance", "top_down_map"],
+    )
+    measures = task.measurements.measures
+    # Dependencies come first, the rest keeps the given order
+    assert list(measures.keys()) == [
+        "distance",
+        "success",
+        "spl",
+        "top_down_map",
+    ]
+
+    task.measurements.reset_measures(task=task, step=0)
+    for step in range(1, 4):
+        task.measurements.update_measures(task=task, step=step)
+        metrics = task.measurements.get_metrics(compute_lazy=False)
+        assert "top_down_map" in metrics
+        assert len(metrics) == 4
+        assert metrics["distance"] == step
+        assert metrics["spl"] == 3 * step
+
+    # Updates of lazy measures that were not read are skipped
+    assert measures["distance"].num_updates == 4
+    assert measures["top_down_map"].num_updates == 1
+    # Reading a lazy metric computes it
+    assert metrics.get("top_down_map") == 3
+    assert measures["top_down_map"].num_updates == 2
+    assert task.measurements.get_metrics()["top_down_map"] == 3
+    assert measures["top_down_map"].num_updates == 2
+    assert metrics.get("collisions", 0) == 0
+
+    # Listing the metrics computes the lazy ones
+    task.measurements.update_measures(task=task, step=4)
+    metrics = task.measurements.get_metrics(compute_lazy=False)
+    assert list(metrics.keys()) == [
+        "distance",
+        "success",
+        "spl",
+        "top_down_map",
+    ]
+
+    # Pickling the metrics only sends the ones that were computed
+    task.measurements.update_measures(task=task, step=5)
+    metrics = task.measurements.get_metrics(compute_lazy=False)
+    assert pickle.loads(pickle.dumps(metrics)) == dict(
+        distance=5, success=10, spl=15
+    )
+    assert measures["top_down_map"].num_updates == 3
+    assert task.measurements.get_metrics()["top_down_map"] == 5
+
+    with pytest.raises(AssertionError):
+        Measurements(
+            [
+                _StepMeasure("a", dependencies=["b"]),
+                _StepMeasure("b", dependencies=["a"]),
+            ]
+        )
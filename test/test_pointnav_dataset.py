@@ -4,6 +4,7 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import copy
 import os
 import random
 import time
@@ -21,6 +22,11 @@ from habitat.datasets.pointnav.pointnav_dataset import (
     DEFAULT_SCENE_PATH_PREFIX,
     PointNavDatasetV1,
 )
+from habitat.datasets.utils import (
+    generate_action_shortest_paths,
+    get_action_shortest_path,
+    get_action_shortest_paths,
+)
 from habitat.utils.geometry_utils import (
     angle_between_quaternions,
     quaternion_from_coeff,
@@ -230,3 +236,63 @@ def test_pointnav_episode_generator():
         assert (
             dataset.to_json()
         ), "Generated episodes aren't json serializable."
+
+
+def test_batched_action_shortest_paths():
+    config = get_config(CFG_TEST)
+    if not PointNavDatasetV1.check_config_paths_exist(config.DATASET):
+        pytest.skip("Test skipped as dataset files are missing.")
+    with habitat.Env(config) as env:
+        episodes = env.episodes[:NUM_EPISODES]
+        kwargs = dict(
+            success_distance=config.TASK.SUCCESS_DISTANCE,
+            max_episode_steps=config.ENVIRONMENT.MAX_EPISODE_STEPS,
+        )
+        paths = get_action_shortest_paths(
+            env.sim,
+            [episode.start_position for episode in episodes],
+            [episode.start_rotation for episode in episodes],
+            [episode.goals[0].position for episode in episodes],
+            **kwargs,
+        )
+
+        assert len(paths) == len(episodes)
+        for episode, path in zip(episodes, paths):
+            assert path == get_action_shortest_path(
+                env.sim,
+                episode.start_position,
+                episode.start_rotation,
+                episode.goals[0].position,
+                **kwargs,
+            )
+
+
+def test_generate_action_shortest_paths():
+    config = get_config(CFG_TEST)
+    assert generate_action_shortest_paths(config.SIMULATOR, []) == []
+    if not PointNavDatasetV1.check_config_paths_exist(config.DATASET):
+        pytest.skip("Test skipped as dataset files are missing.")
+
+    with habitat.Env(config) as env:
+        # Every other episode refers to the scene through another path, so
+        # that the episodes are interleaved between two scene groups
+        episodes = [copy.copy(episode) for episode in env.episodes[:6]]
+        for episode in episodes[::2]:
+            episode.scene_id = os.path.abspath(episode.scene_id)
+        kwargs = dict(
+            success_distance=config.TASK.SUCCESS_DISTANCE,
+            max_episode_steps=config.ENVIRONMENT.MAX_EPISODE_STEPS,
+        )
+        paths = generate_action_shortest_paths(
+            config.SIMULATOR, episodes, num_processes=2, **kwargs
+        )
+
+        assert len(paths) == len(episodes)
+        for episode, path in zip(episodes, paths):
+            assert path == get_action_shortest_path(
+                env.sim,
+                episode.start_position,
+                episode.start_rotation,
+                episode.goals[0].position,
+                **kwargs,
+            )
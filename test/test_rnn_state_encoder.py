@@ -33,6 +33,9 @@ def test_rnn_state_encoder():
                 masks = torch.randint(
                     0, 2, size=(T, N, 1), dtype=torch.bool, device=device
                 )
+                # Also exercise the path without episode boundaries
+                if N == 3:
+                    masks[1:] = True
                 inputs = torch.randn((T, N, 32), device=device)
                 hidden_states = torch.randn(
                     rnn_state_encoder.num_recurrent_layers,
@@ -48,6 +51,14 @@ def test_rnn_state_encoder():
                 )
                 out_hiddens = out_hiddens.permute(1, 0, 2)
 
+                # The second call reuses the cached pack info
+                cached_outputs, _ = rnn_state_encoder(
+                    inputs.flatten(0, 1),
+                    hidden_states.permute(1, 0, 2),
+                    masks.flatten(0, 1),
+                )
+                assert torch.equal(cached_outputs, outputs)
+
                 reference_ouputs = []
                 reference_hiddens = hidden_states.clone()
                 for t in range(T):
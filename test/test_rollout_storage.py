@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Facebook, Inc. and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import numpy as np
+import pytest
+from gym import spaces
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+
+def _make_observation_space():
+    return spaces.Dict(
+        {
+            "rgb": spaces.Box(0.0, 255.0, (8, 8, 3), dtype=np.float32),
+            "depth": spaces.Box(0.0, 1.0, (8, 8, 1), dtype=np.float32),
+            "objectgoal": spaces.Box(0, 10, (1,), dtype=np.int64),
+        }
+    )
+
+
+def _sample_observations(num_envs, objectgoals):
+    return {
+        "rgb": torch.randint(0, 256, (num_envs, 8, 8, 3)).float(),
+        "depth": torch.rand(num_envs, 8, 8, 1),
+        "objectgoal": objectgoals.view(num_envs, 1).clone(),
+    }
+
+
+@pytest.mark.skipif(torch is None, reason="Test requires pytorch")
+@pytest.mark.parametrize("depth_codec", ["float16", "uint16"])
+def test_compressed_observation_storage(depth_codec):
+    from habitat_baselines.common.rollout_storage import (
+        RolloutStorage,
+        select_observation_codecs,
+    )
+
+    num_steps, num_envs = 6, 3
+    observation_space = _make_observation_space()
+    codecs = select_observation_codecs(
+        observation_space,
+        depth_codec=depth_codec,
+        dedup_keys=["objectgoal"],
+    )
+    assert codecs == dict(rgb="uint8", depth=depth_codec, objectgoal="dedup")
+
+    rollouts = RolloutStorage(
+        num_steps,
+        num_envs,
+        observation_space,
+        spaces.Discrete(4),
+        16,
+        observation_codecs=codecs,
+    )
+    assert rollouts.buffers["observations"]["rgb"].dtype == torch.uint8
+
+    objectgoals = torch.arange(num_envs)
+    all_observations = [_sample_observations(num_envs, objectgoals)]
+    rollouts.insert_first_observations(all_observations[0])
+    for step in range(num_steps):
+        # Start a new episode with a new goal in the first environment
+        if step % 2 == 1:
+            objectgoals[0] += 1
+        all_observations.append(_sample_observations(num_envs, objectgoals))
+        rollouts.insert(
+            next_observations=all_observations[-1],
+            actions=torch.zeros(num_envs),
+            action_log_probs=torch.zeros(num_envs, 1),
+            value_preds=torch.zeros(num_envs, 1),
+            rewards=torch.zeros(num_envs, 1),
+            next_masks=torch.ones(num_envs, 1, dtype=torch.bool),
+        )
+        rollouts.advance_rollout()
+
+    # A value is only stored again when it changes
+    assert rollouts._dedup_num_slots["objectgoal"].tolist() == [4, 1, 1]
+
+    depth_atol = 1e-3 if depth_codec == "float16" else 1e-4
+    for step, expected in enumerate(all_observations):
+        observations = rollouts.get_step(step)["observations"]
+        assert torch.equal(observations["rgb"], expected["rgb"])
+        assert observations["depth"].dtype == torch.float32
+        assert torch.allclose(
+            observations["depth"], expected["depth"], atol=depth_atol
+        )
+        assert torch.equal(observations["objectgoal"], expected["objectgoal"])
+
+    advantages = torch.zeros(num_steps + 1, num_envs, 1)
+    for batch in rollouts.recurrent_generator(advantages, 3):
+        assert batch["observations"]["objectgoal"].size() == (num_steps, 1)
+        assert batch["observations"]["rgb"].dtype == torch.float32
+
+    # Only the values of the last step are kept after the update
+    rollouts.after_update()
+    assert rollouts._dedup_num_slots["objectgoal"].tolist() == [1, 1, 1]
+    observations = rollouts.get_step(0)["observations"]
+    assert torch.equal(
+        observations["objectgoal"], all_observations[-1]["objectgoal"]
+    )
+
+
+@pytest.mark.skipif(torch is None, reason="Test requires pytorch")
+def test_prefetch_minibatches():
+    from habitat_baselines.common.rollout_storage import (
+        RolloutStorage,
+        prefetch_minibatches,
+    )
+
+    num_steps, num_envs = 4, 4
+    rollouts = RolloutStorage(
+        num_steps, num_envs, _make_observation_space(), spaces.Discrete(4), 16
+    )
+    rollouts.buffers.map_in_place(
+        lambda v: v if v.dtype == torch.bool else torch.randint_like(v, 10)
+    )
+    for _ in range(num_steps):
+        rollouts.advance_rollout()
+
+    advantages = torch.randn(num_steps + 1, num_envs, 1)
+    torch.manual_seed(0)
+    expected = list(rollouts.recurrent_generator(advantages, 2))
+    torch.manual_seed(0)
+    prefetched = list(
+        prefetch_minibatches(
+            rollouts.recurrent_generator(advantages, 2), torch.device("cpu")
+        )
+    )
+
+    assert len(prefetched) == len(expected) == 2
+    for batch, expected_batch in zip(prefetched, expected):
+        assert batch.keys() == expected_batch.keys()
+        for k in ["actions", "advantages", "masks", "recurrent_hidden_states"]:
+            assert torch.equal(batch[k], expected_batch[k])
+        assert torch.equal(
+            batch["observations"]["rgb"], expected_batch["observations"]["rgb"]
+        )
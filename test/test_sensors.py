@@ -20,7 +20,11 @@ from habitat.tasks.nav.nav import (
 )
 from habitat.utils.geometry_utils import (
     angle_between_quaternions,
+    quaternion_from_coeff,
     quaternion_rotate_vector,
+    quaternions_from_coeffs,
+    quaternions_rotate_vectors,
+    quaternions_to_coeffs,
 )
 from habitat.utils.test_utils import sample_non_stop_action
 from habitat.utils.visualizations.utils import (
@@ -51,6 +55,26 @@ def _random_episode(env, config):
     )
 
 
+def test_batched_quaternion_utils():
+    rng = np.random.RandomState(0)
+    coeffs = rng.normal(size=(16, 4))
+    vectors = rng.normal(size=(16, 3))
+    quats = [quaternion_from_coeff(c) for c in coeffs]
+
+    assert np.array_equal(quaternions_from_coeffs(coeffs), quats)
+    assert np.allclose(
+        quaternions_to_coeffs(quaternions_from_coeffs(coeffs)), coeffs
+    )
+    assert np.allclose(
+        quaternions_rotate_vectors(coeffs, vectors),
+        [quaternion_rotate_vector(q, v) for q, v in zip(quats, vectors)],
+    )
+    assert np.allclose(
+        quaternions_rotate_vectors(coeffs, vectors[0], inverse=True),
+        [quaternion_rotate_vector(q.inverse(), vectors[0]) for q in quats],
+    )
+
+
 def test_state_sensors():
     config = get_config()
     if not os.path.exists(config.SIMULATOR.SCENE):
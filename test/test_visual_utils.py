@@ -4,8 +4,15 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+from types import SimpleNamespace
+
 import numpy as np
+import pytest
+import quaternion
 
+from habitat.config.default import get_config
+from habitat.tasks.nav.nav import TopDownMap
+from habitat.utils.visualizations import fog_of_war, maps
 from habitat.utils.visualizations.utils import observations_to_image
 
 
@@ -57,3 +64,253 @@ def test_different_dim_observations_to_image():
         1570,
         3,
     ), "Resulted image resolution doesn't match."
+
+
+class _CountingPathfinder:
+    def __init__(self):
+        self.num_calls = 0
+
+    def get_bounds(self):
+        return np.array([0.0, 0.0, 0.0]), np.array([4.0, 3.0, 2.0])
+
+    def get_topdown_view(self, meters_per_pixel, height):
+        self.num_calls += 1
+        view = np.zeros((20, 40), dtype=bool)
+        view[5:15, 10:30] = True
+        return view
+
+
+def _make_fake_sim(pathfinder, height):
+    agent = SimpleNamespace(
+        state=SimpleNamespace(position=np.array([1.0, height, 1.0]))
+    )
+    return SimpleNamespace(pathfinder=pathfinder, get_agent=lambda _: agent)
+
+
+def test_topdown_map_cache(tmp_path):
+    pathfinder = _CountingPathfinder()
+    cache = maps.TopDownMapCache(max_size=2, cache_dir=str(tmp_path))
+
+    sim = _make_fake_sim(pathfinder, 0.12)
+    top_down_map = cache.get(sim, "scene_a.glb", map_resolution=40)
+    assert np.array_equal(
+        top_down_map, maps.get_topdown_map_from_sim(sim, map_resolution=40)
+    )
+    pathfinder.num_calls = 0
+
+    # Each episode gets its own copy of the map
+    top_down_map[:] = maps.MAP_SOURCE_POINT_INDICATOR
+    sim = _make_fake_sim(pathfinder, 0.15)
+    assert not np.array_equal(
+        cache.get(sim, "scene_a.glb", map_resolution=40), top_down_map
+    )
+    assert pathfinder.num_calls == 0
+    assert (cache.num_hits, cache.num_misses) == (1, 1)
+
+    # Another floor, resolution or scene is a new map
+    cache.get(_make_fake_sim(pathfinder, 3.0), "scene_a.glb", 40)
+    cache.get(sim, "scene_a.glb", map_resolution=20)
+    cache.get(sim, "scene_b.glb", map_resolution=40)
+    assert pathfinder.num_calls == 3
+    assert len(cache._maps) == 2
+
+    # Evicted maps are loaded back from disk
+    cache.get(sim, "scene_a.glb", map_resolution=40)
+    assert pathfinder.num_calls == 3
+    assert len(list(tmp_path.iterdir())) == 4
+
+
+def test_topdown_map_reconstructor():
+    rng = np.random.RandomState(0)
+    top_down_map = rng.randint(0, 3, size=(50, 60)).astype(np.uint8)
+    fog_of_war_mask = np.zeros_like(top_down_map)
+    reconstructor = maps.TopDownMapReconstructor()
+
+    # The first step of an episode has the full map
+    output = reconstructor.update(
+        {
+            "map": top_down_map,
+            "fog_of_war_mask": fog_of_war_mask,
+            "step": 1,
+            "agent_map_coord": (0, 0),
+            "agent_angle": 0.0,
+        }
+    )
+    assert np.array_equal(output["map"], top_down_map)
+    assert output["map"] is not top_down_map
+
+    prev_point = (0, 0)
+    for step in range(2, 6):
+        point = tuple(int(v) for v in rng.randint(0, 50, size=2))
+        line = (prev_point, point, 10 + step, 2)
+        maps.cv2.line(top_down_map, prev_point, point, 10 + step, 2)
+        prev_point = point
+
+        prev_fog_of_war_mask = fog_of_war_mask.copy()
+        fog_of_war_mask[rng.rand(*fog_of_war_mask.shape) < 0.1] = 1
+
+        output = reconstructor.update(
+            {
+                "map_line": line,
+                "revealed_fog_indices": np.flatnonzero(
+                    fog_of_war_mask > prev_fog_of_war_mask
+                ),
+                "step": step,
+                "agent_map_coord": point,
+                "agent_angle": 0.0,
+            }
+        )
+        assert np.array_equal(output["map"], top_down_map)
+        assert np.array_equal(output["fog_of_war_mask"], fog_of_war_mask)
+        assert output["agent_map_coord"] == point
+
+    # Missing steps can't be recovered from
+    with pytest.raises(RuntimeError):
+        reconstructor.update(
+            {
+                "map_line": None,
+                "revealed_fog_indices": None,
+                "step": 7,
+                "agent_map_coord": point,
+                "agent_angle": 0.0,
+            }
+        )
+
+
+class _TrajectorySim:
+    def __init__(self, pathfinder, positions, angles):
+        self.pathfinder = pathfinder
+        self.habitat_config = SimpleNamespace(SCENE="scene_a.glb")
+        self._positions = positions
+        self._angles = angles
+        self.step = 0
+
+    def get_agent(self, agent_id):
+        return SimpleNamespace(
+            state=SimpleNamespace(position=self._positions[self.step])
+        )
+
+    def get_cached_agent_state(self):
+        return SimpleNamespace(
+            position=self._positions[self.step],
+            rotation=quaternion.from_rotation_vector(
+                [0.0, self._angles[self.step], 0.0]
+            ),
+        )
+
+
+@pytest.mark.parametrize("draw_fog_of_war", [True, False])
+def test_topdown_map_emit_deltas(draw_fog_of_war):
+    rng = np.random.RandomState(0)
+    num_steps = 12
+    positions = np.stack(
+        [
+            rng.uniform(1.1, 2.9, size=num_steps + 1),
+            np.full(num_steps + 1, 0.5),
+            rng.uniform(0.6, 1.4, size=num_steps + 1),
+        ],
+        axis=1,
+    )
+    angles = rng.uniform(0, 2 * np.pi, size=num_steps + 1)
+    episode = SimpleNamespace(
+        start_position=positions[0],
+        goals=[SimpleNamespace(position=np.array([2.0, 1.0, 1.0]))],
+    )
+
+    def make_measure(emit_deltas):
+        config = get_config().TASK.TOP_DOWN_MAP.clone()
+        config.defrost()
+        config.MAP_RESOLUTION = 40
+        config.DRAW_SHORTEST_PATH = False
+        config.DRAW_GOAL_AABBS = False
+        config.FOG_OF_WAR.DRAW = draw_fog_of_war
+        config.EMIT_DELTAS = emit_deltas
+        config.freeze()
+        sim = _TrajectorySim(_CountingPathfinder(), positions, angles)
+        return sim, TopDownMap(sim=sim, config=config)
+
+    full_sim, full_measure = make_measure(emit_deltas=False)
+    delta_sim, delta_measure = make_measure(emit_deltas=True)
+    reconstructor = maps.TopDownMapReconstructor()
+    full_measure.reset_metric(episode)
+    delta_measure.reset_metric(episode)
+
+    num_lines = 0
+    for step in range(1, num_steps + 1):
+        full_sim.step = delta_sim.step = step
+        full_measure.update_metric(episode, action=None)
+        delta_measure.update_metric(episode, action=None)
+        expected = full_measure.get_metric()
+        reconstructed = reconstructor.update(delta_measure.get_metric())
+
+        if step > 1:
+            assert "map" not in delta_measure.get_metric()
+            num_lines += delta_measure.get_metric()["map_line"] is not None
+        assert np.array_equal(reconstructed["map"], expected["map"])
+        if draw_fog_of_war:
+            assert np.array_equal(
+                reconstructed["fog_of_war_mask"], expected["fog_of_war_mask"]
+            )
+        else:
+            assert reconstructed["fog_of_war_mask"] is None
+        assert reconstructed["agent_map_coord"] == expected["agent_map_coord"]
+        assert reconstructed["agent_angle"] == expected["agent_angle"]
+    assert num_lines > 0
+
+
+def test_reveal_fog_of_war():
+    top_down_map = np.full((100, 100), maps.MAP_VALID_POINT, dtype=np.uint8)
+    top_down_map[:, 70] = maps.MAP_INVALID_POINT
+    fog_of_war_mask = np.zeros_like(top_down_map)
+
+    for angle in np.linspace(0, 2 * np.pi, 7):
+        point = np.array([50, 40])
+        mask = fog_of_war.reveal_fog_of_war(
+            top_down_map, fog_of_war_mask, point, angle, max_line_len=50
+        )
+        expected_mask = fog_of_war.reveal_fog_of_war_by_lines(
+            top_down_map, fog_of_war_mask, point, angle, max_line_len=50
+        )
+        # The precomputed lines are at slightly different angles
+        assert np.mean(mask != expected_mask) < 1e-2
+        assert mask.sum() > 0
+        # Nothing is revealed behind the wall
+        assert not mask[:, 70:].any()
+    assert not fog_of_war_mask.any()
+
+
+def test_grid_batch_conversions():
+    pathfinder = _CountingPathfinder()
+    rng = np.random.RandomState(0)
+    points = rng.uniform(0, 4, size=(20, 3))
+    grid_resolution = (100, 200)
+
+    bounds = maps.get_bounds(pathfinder=pathfinder)
+    grid_points = maps.to_grid_batch(points, grid_resolution, bounds=bounds)
+    assert grid_points.shape == (20, 2)
+    for point, grid_point in zip(points, grid_points):
+        assert tuple(grid_point) == maps.to_grid(
+            point[2], point[0], grid_resolution, pathfinder=pathfinder
+        )
+
+    realworld_points = maps.from_grid_batch(
+        grid_points, grid_resolution, pathfinder=pathfinder
+    )
+    for grid_point, realworld_point in zip(grid_points, realworld_points):
+        assert np.allclose(
+            realworld_point,
+            maps.from_grid(*grid_point, grid_resolution, bounds=bounds),
+        )
+
+
+def test_draw_path():
+    path_points = [(10, 10), (10, 40), (30, 45), (30, 45), (5, 20)]
+    top_down_map = np.zeros((50, 50), dtype=np.uint8)
+    maps.draw_path(top_down_map, path_points, color=7, thickness=3)
+
+    expected_map = np.zeros_like(top_down_map)
+    for prev_pt, next_pt in zip(path_points[:-1], path_points[1:]):
+        maps.cv2.line(
+            expected_map, prev_pt[::-1], next_pt[::-1], 7, thickness=3
+        )
+    assert np.array_equal(top_down_map, expected_map)